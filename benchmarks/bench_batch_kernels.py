@@ -0,0 +1,63 @@
+"""
+Benchmark: Vectorized Batch Kernels vs Scalar Utilities
+Times each shapix.utils helper in a Python loop over Point objects against
+its NumPy batch variant on (N, 2) arrays.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shapix.core import Point
+from shapix import utils
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000, help="Points per kernel (default: 1e6)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    a, b, c = (rng.uniform(-100, 100, size=(args.n, 2)) for _ in range(3))
+    pa, pb, pc = ([Point(x, y) for x, y in arr.tolist()] for arr in (a, b, c))
+    center = Point(1.0, 2.0)
+
+    kernels = [
+        ("distance",
+         lambda: [utils.distance(p, q) for p, q in zip(pa, pb)],
+         lambda: utils.distances(a, b)),
+        ("angle at vertex",
+         lambda: [utils.angle_between_points(p, v, q) for p, v, q in zip(pa, pb, pc)],
+         lambda: utils.angles_between_points(a, b, c)),
+        ("rotate about center",
+         lambda: [utils.rotate_point(p, center, 30) for p in pa],
+         lambda: utils.rotate_points(a, (1.0, 2.0), 30)),
+        ("point to segment",
+         lambda: [utils.point_to_line_distance(p, s, e) for p, s, e in zip(pa, pb, pc)],
+         lambda: utils.point_to_segment_distances(a, b, c)),
+        ("midpoint",
+         lambda: [utils.midpoint(p, q) for p, q in zip(pa, pb)],
+         lambda: utils.midpoints(a, b)),
+    ]
+
+    print(f"=== Batch kernel benchmark (N = {args.n:,}) ===")
+    for name, scalar, batch in kernels:
+        scalar_time = timed(scalar)
+        batch_time = timed(batch)
+        print(f"{name:>20}: scalar {scalar_time * 1000:9.1f} ms   batch {batch_time * 1000:7.1f} ms"
+              f"   speedup {scalar_time / batch_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: Loading a Compiled Scene Instead of Parsing
+Compiles a generated syntax file to .geoc, then compares parsing the text
+with opening the compiled file, fetching one shape by name, and building
+every shape from it.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_parse import generate_syntax
+from shapix.syntax import GeometrySyntaxParser, compile_syntax, load_compiled
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Lines in the generated file (default: 1000000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "scene.geo")
+        target = os.path.join(directory, "scene.geoc")
+        with open(source, "w") as f:
+            f.write(generate_syntax(args.lines))
+
+        with open(source) as f:
+            geometry, parse = timed(lambda: GeometrySyntaxParser().parse(f))
+        del geometry
+        with open(source) as f:
+            _, compile_time = timed(lambda: compile_syntax(f, target))
+
+        compiled, open_time = timed(lambda: load_compiled(target))
+        name = f"point_P{compiled.point_count // 2}"
+        _, lookup = timed(lambda: compiled.get_shape(name))
+        _, build = timed(lambda: compiled.shapes)
+        compiled.close()
+
+        print(f"{args.lines} lines: {os.path.getsize(source) / 1e6:.1f} MB syntax, "
+              f"{os.path.getsize(target) / 1e6:.1f} MB compiled")
+        print(f"parse:          {parse:8.2f} s")
+        print(f"compile:        {compile_time:8.2f} s")
+        print(f"open compiled:  {open_time * 1e3:8.2f} ms")
+        print(f"one shape:      {lookup * 1e3:8.2f} ms")
+        print(f"build all:      {build:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
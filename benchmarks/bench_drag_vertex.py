@@ -0,0 +1,56 @@
+"""
+Benchmark: Dragging One Vertex in a Large Scene
+Moves a single shared point step by step in scenes of growing size and
+reports the time per step. Only the shapes that depend on the point are
+re-indexed and marked dirty, so the cost should not grow with the scene.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shapix.core import Point, PointStore, Scene
+from shapix.shapes import Circle, Line, PointShape, Triangle
+
+
+def build_scene(count):
+    """A grid of points with triangles, lines and circles sharing them"""
+    store = PointStore()
+    side = max(2, int((count / 4) ** 0.5) + 1)
+    grid = [[Point(x * 20, y * 20, store=store) for x in range(side)] for y in range(side)]
+    shapes = []
+    for y in range(side - 1):
+        for x in range(side - 1):
+            if len(shapes) >= count:
+                break
+            a, b, c = grid[y][x], grid[y][x + 1], grid[y + 1][x]
+            shapes += [PointShape(a), Line(a, b), Triangle(a, b, c), Circle(a, 5)]
+    scene = Scene(shapes[:count])
+    scene.spatial_index  # Build the index so moves have to keep it current
+    return scene, grid[1][1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--steps", type=int, default=2000, help="Drag steps per scene (default: 2000)")
+    args = parser.parse_args()
+
+    print(f"{'shapes':>8}  {'dependents':>10}  {'us/step':>8}")
+    for count in (1_000, 10_000, 100_000):
+        scene, vertex = build_scene(count)
+        dependents = len(vertex.store.dependents(vertex.index))
+
+        start = time.perf_counter()
+        for step in range(args.steps):
+            vertex.move(0.5 if step % 2 else -0.5, 0.25)
+            scene.take_dirty()
+        elapsed = time.perf_counter() - start
+
+        print(f"{count:>8}  {dependents:>10}  {elapsed / args.steps * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: Parallel Batch Export
+Measures export_many throughput for an increasing number of worker
+processes on the same batch of diagrams.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shapix.syntax import ExportJob, export_many
+
+DIAGRAM = '''
+POINT O 0 0 "O" show_label=true label_position=bottom_right
+POINT A 0 100 "A" show_label=true label_position=top
+POINT B -87 50 "B" show_label=true label_position=top_left
+CIRCLE O 100 color=blue
+TRIANGLE A B O color=green
+ANGLE B O A color=red arc=true show_measure=true
+'''
+
+
+def bench(count, workers, backend, out_dir):
+    """Return diagrams per second for one worker count"""
+    jobs = (ExportJob(DIAGRAM, os.path.join(out_dir, f"diagram_{i}.png"), 400, 400)
+            for i in range(count))
+    start = time.perf_counter()
+    failures = [result for result in export_many(jobs, workers=workers, backend=backend)
+                if not result.ok]
+    elapsed = time.perf_counter() - start
+    if failures:
+        raise RuntimeError(failures[0].error)
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=400, help="Diagrams per run (default: 400)")
+    parser.add_argument("--backend", choices=["tk", "raster"], default="raster",
+                        help="PNG backend (default: raster)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Worker counts to try (default: 1 2 4 8)")
+    args = parser.parse_args()
+
+    print(f"=== export_many benchmark ({args.count} diagrams, {args.backend}, "
+          f"{os.cpu_count()} CPUs) ===")
+    baseline = None
+    with tempfile.TemporaryDirectory() as out_dir:
+        for workers in args.workers:
+            try:
+                rate = bench(args.count, workers, args.backend, out_dir)
+            except Exception as e:
+                print(f"{workers:>3} workers: skipped ({e})")
+                continue
+            baseline = baseline or rate
+            print(f"{workers:>3} workers: {rate:8.1f} diagrams/s   speedup {rate / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
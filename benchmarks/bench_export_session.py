@@ -0,0 +1,67 @@
+"""
+Benchmark: Warm Export Session vs Cold Export
+Compares the per-diagram cost of export_geometry_syntax, which builds and
+tears down an exporter for every call, with one long-lived exporter that
+is reused for the whole batch.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shapix.syntax import GeometryPNGExporter, export_geometry_syntax
+
+DIAGRAM = '''
+POINT O 0 0 "O" show_label=true label_position=bottom_right
+POINT A 0 100 "A" show_label=true label_position=top
+POINT B -87 50 "B" show_label=true label_position=top_left
+CIRCLE O 100 color=blue
+TRIANGLE A B O color=green
+ANGLE B O A color=red arc=true show_measure=true
+'''
+
+
+def bench_cold(count, backend, out_dir):
+    """Time one exporter per diagram"""
+    start = time.perf_counter()
+    for i in range(count):
+        export_geometry_syntax(DIAGRAM, os.path.join(out_dir, f"cold_{i}.png"),
+                               400, 400, backend=backend)
+    return (time.perf_counter() - start) / count
+
+
+def bench_warm(count, backend, out_dir):
+    """Time one exporter reused for every diagram"""
+    start = time.perf_counter()
+    with GeometryPNGExporter(400, 400, backend=backend) as exporter:
+        for i in range(count):
+            exporter.export(DIAGRAM, os.path.join(out_dir, f"warm_{i}.png"))
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=200, help="Diagrams per run (default: 200)")
+    parser.add_argument("--backend", choices=["tk", "raster"], action="append",
+                        help="Backend(s) to benchmark (default: both)")
+    args = parser.parse_args()
+
+    print(f"=== Export session benchmark ({args.count} diagrams) ===")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for backend in args.backend or ["tk", "raster"]:
+            try:
+                cold = bench_cold(args.count, backend, out_dir)
+                warm = bench_warm(args.count, backend, out_dir)
+            except Exception as e:
+                print(f"{backend:>6}: skipped ({e})")
+                continue
+            print(f"{backend:>6}: cold {cold * 1000:8.2f} ms/diagram   "
+                  f"warm {warm * 1000:8.2f} ms/diagram   speedup {cold / warm:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
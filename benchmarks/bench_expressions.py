@@ -0,0 +1,50 @@
+"""
+Benchmark: Expressions in Coordinates
+Parses the same points written as plain numbers and as LET-based
+expressions, with the expression numbers repeating (angles in whole
+degrees) and all distinct.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shapix.syntax import GeometrySyntaxParser
+from shapix.syntax.expressions import compile_expression
+
+
+def documents(count, seed=0):
+    rng = random.Random(seed)
+    angles = [rng.uniform(0, 360) for _ in range(count)]
+    literal = "\n".join(f"POINT P{i} {100 * math.cos(math.radians(a)):.6f} {100 * math.sin(math.radians(a)):.6f}"
+                        for i, a in enumerate(angles))
+    repeated = "LET r = 100\n" + "\n".join(
+        f"POINT P{i} r*cos({round(a)}deg) r*sin({round(a)}deg)" for i, a in enumerate(angles))
+    distinct = "LET r = 100\n" + "\n".join(
+        f"POINT P{i} r*cos({a:.6f}deg) r*sin({a:.6f}deg)" for i, a in enumerate(angles))
+    return {"literal": literal, "repeated expressions": repeated, "distinct expressions": distinct}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=200_000, help="POINT lines per document (default: 200000)")
+    args = parser.parse_args()
+
+    print(f"=== expression benchmark ({args.points} points) ===")
+    baseline = None
+    for name, syntax in documents(args.points).items():
+        compile_expression.cache_clear()
+        start = time.perf_counter()
+        GeometrySyntaxParser().parse(syntax)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{name:<22}{elapsed:8.2f} s   {elapsed / baseline:5.2f}x literal")
+
+
+if __name__ == "__main__":
+    main()
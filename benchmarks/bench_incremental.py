@@ -0,0 +1,90 @@
+"""
+Benchmark: One-Line Edits in a Large Document
+Parses a generated document once with IncrementalParser, then times
+typical editor edits against re-parsing the whole document.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_parse import generate_syntax
+from shapix.syntax import GeometrySyntaxParser, IncrementalParser
+
+
+def find_line(parser, prefix, start):
+    lines = parser.text.split('\n')
+    for number in range(start, len(lines)):
+        if lines[number].startswith(prefix):
+            return number, lines[number]
+    raise LookupError(prefix)
+
+
+def bump(text, position):
+    """``text`` with the numeric token at ``position`` increased by one"""
+    tokens = text.split(' ')
+    tokens[position] = f"{float(tokens[position]) + 1:g}"
+    return ' '.join(tokens)
+
+
+def time_edit(parser, edit, undo, repeat):
+    """Median milliseconds of an edit; ``undo`` restores the document between runs"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        edit(parser)
+        samples.append(time.perf_counter() - start)
+        undo(parser)
+    return statistics.median(samples) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50_000, help="Lines in the document (default: 50000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per edit (default: 20)")
+    args = parser.parse_args()
+
+    syntax = generate_syntax(args.lines)
+    start = time.perf_counter()
+    GeometrySyntaxParser().parse(syntax)
+    full = (time.perf_counter() - start) * 1e3
+
+    geometry = IncrementalParser()
+    geometry.parse(syntax)
+    middle = args.lines // 2
+
+    point_line, point_text = find_line(geometry, "POINT", middle)
+    name = point_text.split()[1]
+    line_line, line_text = find_line(geometry, "LINE", middle)
+    color_at = line_text.index("color=") + len("color=")
+    circle_line, circle_text = find_line(geometry, "CIRCLE", middle)
+
+    def replace(number, text):
+        return lambda p: p.replace_lines(number, number + 1, [text])
+
+    edits = [
+        ("move a point", replace(point_line, bump(point_text, 2)),
+         replace(point_line, point_text)),
+        ("type in a color", lambda p: p.edit((line_line, color_at), (line_line, color_at), "x"),
+         replace(line_line, line_text)),
+        ("change a radius", replace(circle_line, bump(circle_text, 2)),
+         replace(circle_line, circle_text)),
+        ("insert a line", lambda p: p.replace_lines(middle, middle, [f"LINE {name} P0 color=red"]),
+         lambda p: p.replace_lines(middle, middle + 1, [])),
+        ("delete a line", lambda p: p.replace_lines(line_line, line_line + 1, []),
+         lambda p: p.replace_lines(line_line, line_line, [line_text])),
+        ("rename a point", replace(point_line, point_text.replace(f" {name} ", " RENAMED ", 1)),
+         replace(point_line, point_text)),
+    ]
+
+    print(f"{args.lines} lines, full parse {full:.0f} ms")
+    for label, edit, undo in edits:
+        print(f"{label:<18}{time_edit(geometry, edit, undo, args.repeat):>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: Derived Measures on Render- and Analytics-Heavy Workloads
+The render workload lays out a scene of triangles (with angle arcs and
+measures) once per frame while one vertex is dragged. The analytics
+workload reads area, perimeter, angles, centroid and bounds of every
+shape several times between occasional point edits.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shapix.core import Point, Scene
+from shapix.shapes import Angle, Circle, Triangle
+from shapix.syntax.exporter import GeometryExporter
+
+
+def build_shapes(count, seed=0):
+    rng = random.Random(seed)
+    points = [Point(rng.uniform(-400, 400), rng.uniform(-300, 300), f"P{i}") for i in range(count)]
+    triangles, angles, circles = [], [], []
+    for i in range(count):
+        a, b, c = points[i], points[(i + 1) % count], points[(i + 7) % count]
+        triangle = Triangle(a, b, c)
+        triangle.show_angles = True
+        triangle.show_angle_measures = True
+        triangles.append(triangle)
+        angles.append(Angle(a, b, c))
+        circles.append(Circle(a, 10))
+    return points, triangles, angles, circles
+
+
+def render_workload(count, frames):
+    points, triangles, angles, _ = build_shapes(count)
+    exporter = GeometryExporter(800, 600)
+    scene = Scene(triangles + angles)
+    start = time.perf_counter()
+    for frame in range(frames):
+        points[0].move(1 if frame % 2 else -1, 0)
+        exporter.layout_shapes(scene, auto_scale=False)
+    return (time.perf_counter() - start) / frames
+
+
+def analytics_workload(count, passes):
+    points, triangles, angles, circles = build_shapes(count)
+    start = time.perf_counter()
+    total = 0.0
+    for step in range(passes):
+        for triangle in triangles:
+            total += triangle.get_area() + triangle.get_perimeter()
+            total += triangle.get_angle_measure('a') + triangle.get_angle_measure('b')
+            total += triangle.get_angle_measure('c') + triangle.get_centroid().x
+            total += triangle.get_bounds()[0] + max(triangle.get_side_length(s) for s in 'abc')
+        for angle in angles:
+            total += angle.get_measure() + angle.get_bounds()[0]
+        for circle in circles:
+            total += circle.get_area() + circle.get_circumference() + circle.get_bounds()[0]
+        # Edit a few points between passes
+        for point in points[step::max(1, count // 10)]:
+            point.move(0.5, 0.5)
+    return (time.perf_counter() - start) / passes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000, help="Triangles, angles and circles (default: 5000)")
+    parser.add_argument("--frames", type=int, default=10, help="Render frames (default: 10)")
+    parser.add_argument("--passes", type=int, default=10, help="Analytics passes (default: 10)")
+    args = parser.parse_args()
+
+    print(f"render:    {render_workload(args.count, args.frames) * 1e3:8.1f} ms/frame")
+    print(f"analytics: {analytics_workload(args.count, args.passes) * 1e3:8.1f} ms/pass")
+
+
+if __name__ == "__main__":
+    main()
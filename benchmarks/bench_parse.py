@@ -0,0 +1,66 @@
+"""
+Benchmark: Parsing a Large Geometry Syntax File
+Generates a file of POINT, LINE, CIRCLE, TRIANGLE and ANGLE statements
+(with labels, properties and comments) and reports the time to parse it.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shapix.syntax import GeometrySyntaxParser
+
+
+def generate_syntax(lines, seed=0):
+    """Roughly one point per four statements, the rest connecting nearby points"""
+    rng = random.Random(seed)
+    colors = ["red", "blue", "green", "orange", "purple"]
+    out = ["# Generated benchmark scene"]
+    points = 0
+    while len(out) < lines:
+        kind = rng.random()
+        if points < 3 or kind < 0.25:
+            out.append(f'POINT P{points} {rng.uniform(-500, 500):.2f} {rng.uniform(-500, 500):.2f} '
+                       f'"P{points}" show_label=true label_position=top_right')
+            points += 1
+            continue
+        a, b, c = (f"P{rng.randrange(max(0, points - 50), points)}" for _ in range(3))
+        color = rng.choice(colors)
+        if kind < 0.45:
+            out.append(f"LINE {a} {b} color={color} line_width=2")
+        elif kind < 0.65:
+            out.append(f"CIRCLE {a} {rng.uniform(5, 50):.1f} color={color} show_center=true")
+        elif kind < 0.85:
+            out.append(f"TRIANGLE {a} {b} {c} color={color} fill_color=light{color} layer=1")
+        elif kind < 0.98:
+            out.append(f"ANGLE {a} {b} {c} color={color} arc=true show_measure=true")
+        else:
+            out.append("")
+    return "\n".join(out[:lines])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Lines in the generated file (default: 1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs; the best is reported (default: 3)")
+    args = parser.parse_args()
+
+    syntax = generate_syntax(args.lines)
+    best = float("inf")
+    for _ in range(args.repeat):
+        geometry = GeometrySyntaxParser()
+        start = time.perf_counter()
+        shapes = geometry.parse(syntax)
+        best = min(best, time.perf_counter() - start)
+        del geometry, shapes
+
+    print(f"{args.lines} lines, {len(syntax) / 1e6:.1f} MB")
+    print(f"parse: {best:8.2f} s  ({args.lines / best / 1e3:,.0f}k lines/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: Chunked Parallel Parsing
+Parses the same generated syntax file with parse_parallel for an
+increasing number of worker processes and compares it with parse.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_parse import generate_syntax
+from shapix.syntax import GeometrySyntaxParser
+
+
+def bench(syntax, workers, chunk_lines):
+    """Seconds to parse ``syntax``; None workers means the serial parser"""
+    geometry = GeometrySyntaxParser()
+    start = time.perf_counter()
+    if workers is None:
+        geometry.parse(syntax)
+    else:
+        geometry.parse_parallel(syntax, workers=workers, chunk_lines=chunk_lines)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Lines in the generated file (default: 1000000)")
+    parser.add_argument("--chunk-lines", type=int, default=20000, help="Lines per chunk (default: 20000)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Worker counts to try (default: 1 2 4 8)")
+    args = parser.parse_args()
+
+    syntax = generate_syntax(args.lines)
+    print(f"=== parse_parallel benchmark ({args.lines} lines, {args.chunk_lines}-line chunks, "
+          f"{os.cpu_count()} CPUs) ===")
+    serial = bench(syntax, None, args.chunk_lines)
+    print(f"     serial: {serial:8.2f} s")
+    for workers in args.workers:
+        elapsed = bench(syntax, workers, args.chunk_lines)
+        print(f"{workers:>3} workers: {elapsed:8.2f} s   speedup {serial / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: Memory per Shape
+Reports the bytes allocated per instance of each shape type (excluding the
+points it is built from), and per Point, measured with tracemalloc.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shapix.core import Point
+from shapix.shapes import Angle, Circle, Line, PointShape, Triangle
+
+
+def bytes_per_instance(factory, n):
+    """Average bytes still allocated per object after building n of them"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=100_000, help="Instances per type (default: 100000)")
+    args = parser.parse_args()
+
+    # Shapes share these points so only the shape objects themselves are counted
+    a, b, c = Point(0, 0, "A"), Point(10, 0, "B"), Point(0, 10, "C")
+
+    def styled(shape):
+        shape.color = "red"
+        shape.line_width = 3
+        return shape
+
+    factories = [
+        ("Point", lambda i: Point(i, i, "P")),
+        ("PointShape", lambda i: PointShape(a, f"P{i}")),
+        ("Line", lambda i: Line(a, b, f"L{i}")),
+        ("Circle", lambda i: Circle(a, 5, f"C{i}")),
+        ("Triangle", lambda i: Triangle(a, b, c, f"T{i}")),
+        ("Angle", lambda i: Angle(a, b, c, f"G{i}")),
+        ("Circle + 2 styles", lambda i: styled(Circle(a, 5, f"C{i}"))),
+    ]
+
+    # The name strings are allocated in both cases; subtract them
+    name_bytes = bytes_per_instance(lambda i: f"C{i}", args.n)
+
+    print(f"{'Type':<20}{'bytes/instance':>16}")
+    for label, factory in factories:
+        size = bytes_per_instance(factory, args.n)
+        if label != "Point":
+            size -= name_bytes
+        print(f"{label:<20}{size:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: Batched Tcl Submission vs Per-Item create_* Calls
+Lays out a scene of labelled points once, then fills a Tk canvas either with
+one create_* call per item or with a single tk.eval of the whole script.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shapix.rendering.tcl import build_tcl_script
+from shapix.syntax import GeometrySVGExporter
+
+
+def make_scene(count):
+    """Labelled points on a grid: one oval and one text item each"""
+    side = int(count ** 0.5) + 1
+    return "\n".join(
+        f'POINT P{i} {i % side} {i // side} "P{i}" show_label=true' for i in range(count)
+    )
+
+
+def stub_canvas():
+    """A real tkinter.Canvas bound to a bare Tcl interpreter (no display needed)
+
+    The widget command is a no-op proc, so item creation itself is free and
+    only the call overhead is measured.
+    """
+    import tkinter as tk
+
+    interp = tk.Tcl()
+    interp.eval("proc .stub {args} {return 1}")
+    canvas = tk.Canvas.__new__(tk.Canvas)
+    canvas.tk, canvas._w = interp.tk, ".stub"
+    return canvas
+
+
+def bench_stub(display_list):
+    """Compare the Python/Tcl round-trip overhead alone"""
+    canvas = stub_canvas()
+    start = time.perf_counter()
+    display_list.replay(canvas)
+    per_item = time.perf_counter() - start
+
+    start = time.perf_counter()
+    canvas.tk.eval(build_tcl_script(display_list, ".stub"))
+    batched = time.perf_counter() - start
+    print(f"stub widget:    per-item {per_item * 1000:8.1f} ms   single eval {batched * 1000:8.1f} ms"
+          f"   speedup {per_item / batched:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=50000, help="Points in the scene (default: 50000)")
+    args = parser.parse_args()
+
+    print(f"=== Tcl batch benchmark ({args.points} labelled points) ===")
+    display_list = GeometrySVGExporter(1600, 1200).layout(make_scene(args.points))
+    print(f"display list: {len(display_list)} items")
+
+    start = time.perf_counter()
+    script = build_tcl_script(display_list, ".c")
+    print(f"script build:   {(time.perf_counter() - start) * 1000:8.1f} ms "
+          f"({len(script) / 1e6:.1f} MB)")
+    bench_stub(display_list)
+
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception as e:
+        print(f"canvas timings: skipped ({e})")
+        return
+
+    canvas = tk.Canvas(root, width=1600, height=1200)
+    start = time.perf_counter()
+    display_list.replay(canvas)
+    per_item = time.perf_counter() - start
+
+    canvas.delete("all")
+    start = time.perf_counter()
+    canvas.tk.eval(build_tcl_script(display_list, str(canvas)))
+    batched = time.perf_counter() - start
+    root.destroy()
+
+    print(f"per-item calls: {per_item * 1000:8.1f} ms")
+    print(f"single tk.eval: {batched * 1000:8.1f} ms   speedup {per_item / batched:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: Template Compilation for Parameterized Diagrams
+Renders the shapes of many variants of one diagram template, formatting
+and parsing the text per variant versus instantiating a compiled template
+one variant at a time and in a batch.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shapix.syntax import GeometrySyntaxParser, compile_template
+
+# A worksheet-style problem: a triangle with a median, a circle and a marked angle
+TEMPLATE = """
+POINT A 0 0 "A" label_position=bottom_left
+POINT B {bx} 0 "B" label_position=bottom_right
+POINT C {cx} {cy} "C" label_position=top
+POINT M {mx} 0 "M" label_position=bottom
+TRIANGLE A B C fill_color=lightblue
+LINE C M color=red line_width=2
+CIRCLE C {r} color=green
+ANGLE B A C arc=true show_measure=true
+"""
+
+
+def per_variant(function, variants):
+    start = time.perf_counter()
+    function(variants)
+    return (time.perf_counter() - start) / len(variants) * 1e6
+
+
+def format_and_parse(variants):
+    names = ("bx", "cx", "cy", "mx", "r")
+    for row in variants.tolist():
+        GeometrySyntaxParser().parse(TEMPLATE.format(**dict(zip(names, row))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--variants", type=int, default=10000, help="Variants to build (default: 10000)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    variants = rng.uniform(20, 200, size=(args.variants, 5))
+    variants[:, 3] = variants[:, 0] / 2
+
+    start = time.perf_counter()
+    template = compile_template(TEMPLATE)
+    compile_ms = (time.perf_counter() - start) * 1e3
+
+    print(f"=== template benchmark ({args.variants} variants, {len(template)} shapes each) ===")
+    print(f"compile_template:          {compile_ms:8.2f} ms (once)")
+    baseline = per_variant(format_and_parse, variants)
+    print(f"format + parse:            {baseline:8.1f} us/variant")
+    for label, function in (
+        ("template.shapes:", lambda rows: [template.shapes(row) for row in rows]),
+        ("template.batch:", lambda rows: list(template.batch(rows))),
+    ):
+        elapsed = per_variant(function, variants)
+        print(f"{label:<26}{elapsed:8.1f} us/variant   {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
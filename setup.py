@@ -42,7 +42,8 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=[
-        "pillow>=8.0.0",  # For PNG export
+        "pillow>=8.0.0",  # For PNG export and text rendering
+        "numpy>=1.20",  # For the headless raster backend
     ],
     extras_require={
         "dev": [
@@ -6,9 +6,16 @@ and exporting them to PNG images. It includes a comprehensive set of
 geometric shapes and mathematical operations.
 """
 
-from .core import Point, GeometricShape
+from .core import Point, GeometricShape, Scene, SpatialIndex
 from .shapes import PointShape, Line, Circle, Triangle, Angle
-from .syntax import GeometrySyntaxParser, export_geometry_syntax
+from .syntax import (
+    GeometrySyntaxParser,
+    export_geometry_syntax,
+    export_geometry_svg,
+    export_many,
+    render_to_array,
+    render_to_bytes,
+)
 from .rendering import ShapeRenderer
 
 __version__ = "0.1.0"
@@ -19,6 +26,8 @@ __all__ = [
     # Core classes
     'Point',
     'GeometricShape',
+    'Scene',
+    'SpatialIndex',
     
     # Shape classes
     'PointShape',
@@ -30,6 +39,10 @@ __all__ = [
     # Syntax and export
     'GeometrySyntaxParser',
     'export_geometry_syntax',
+    'export_geometry_svg',
+    'export_many',
+    'render_to_bytes',
+    'render_to_array',
     
     # Rendering
     'ShapeRenderer',
@@ -57,6 +70,7 @@ def create_triangle(x1: float, y1: float, x2: float, y2: float, x3: float, y3: f
     vertex_c = Point(x3, y3, labels[2])
     return Triangle(vertex_a, vertex_b, vertex_c)
 
-def quick_export(syntax: str, filename: str = "output.png", width: int = 800, height: int = 600) -> None:
+def quick_export(syntax: str, filename: str = "output.png", width: int = 800, height: int = 600,
+                 backend: str = "raster") -> None:
     """Quick export function for geometry syntax"""
-    export_geometry_syntax(syntax, filename, width, height)
\ No newline at end of file
+    export_geometry_syntax(syntax, filename, width, height, backend=backend)
\ No newline at end of file
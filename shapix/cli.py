@@ -5,24 +5,77 @@ Command line interface for shapix
 import argparse
 import sys
 import os
-from .syntax import export_geometry_syntax
+from .syntax import (
+    GeometryPNGExporter,
+    GeometrySVGExporter,
+    RenderCache,
+    export_geometry_syntax,
+    export_geometry_svg,
+)
+from .syntax.compiled import compile_syntax, load_compiled
+
+
+def compile_main(argv):
+    """``shapix compile``: parse a geometry file once into a compiled scene"""
+    parser = argparse.ArgumentParser(
+        prog="shapix compile",
+        description="Compile geometry syntax into a memory-mapped scene file (.geoc)",
+    )
+    parser.add_argument("input", help="Input geometry file (.geo)")
+    parser.add_argument("output", help="Output compiled scene file (.geoc)")
+    args = parser.parse_args(argv)
+    
+    if not os.path.exists(args.input):
+        print(f"Error: Input file '{args.input}' not found", file=sys.stderr)
+        sys.exit(1)
+    
+    try:
+        print(f"Compiling {args.input} to {args.output}...")
+        with open(args.input, 'r', encoding='utf-8') as source:
+            compile_syntax(source, args.output)
+        print(f"Successfully compiled to {args.output}")
+    except Exception as e:
+        print(f"Error compiling: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def export_compiled(args):
+    """Render a compiled scene file (the render cache is not used)"""
+    with load_compiled(args.input) as compiled:
+        scene = compiled.scene
+    auto_scale = not args.no_autoscale
+    if args.output.lower().endswith(".svg"):
+        exporter = GeometrySVGExporter(args.width, args.height)
+        exporter.render(exporter.layout_shapes(scene, auto_scale), args.output)
+    else:
+        with GeometryPNGExporter(args.width, args.height, backend=args.backend) as exporter:
+            exporter.render(exporter.layout_shapes(scene, auto_scale), args.output)
 
 
 def main():
     """Main CLI entry point"""
+    if sys.argv[1:2] == ["compile"]:
+        compile_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(
-        description="Shapix - Export geometry syntax to PNG images",
+        description="Shapix - Export geometry syntax to PNG or SVG images",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   shapix input.geo output.png
   shapix input.geo output.png --width 1200 --height 800
+  shapix input.geo output.png --backend raster
+  shapix input.geo output.png --cache-dir ~/.cache/shapix
+  shapix input.geo output.svg
+  shapix compile input.geo scene.geoc
+  shapix scene.geoc output.png
   shapix --help
         """,
     )
     
-    parser.add_argument("input", help="Input geometry file (.geo)")
-    parser.add_argument("output", help="Output PNG file")
+    parser.add_argument("input", help="Input geometry file (.geo), or compiled scene file (.geoc)")
+    parser.add_argument("output", help="Output PNG file, or SVG file if it ends in .svg")
     parser.add_argument(
         "--width", "-w", 
         type=int, 
@@ -30,7 +83,7 @@ Examples:
         help="Output image width (default: 800)"
     )
     parser.add_argument(
-        "--height", "-h", 
+        "--height", "-H", 
         type=int, 
         default=600, 
         help="Output image height (default: 600)"
@@ -40,6 +93,16 @@ Examples:
         action="store_true",
         help="Disable automatic scaling to fit canvas"
     )
+    parser.add_argument(
+        "--backend",
+        choices=["tk", "raster"],
+        default="raster",
+        help="Rendering backend: raster (headless) or tk (with a hidden tkinter canvas) (default: raster)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse PNGs rendered earlier from this render cache directory"
+    )
     parser.add_argument(
         "--version", 
         action="version", 
@@ -53,23 +116,46 @@ Examples:
         print(f"Error: Input file '{args.input}' not found", file=sys.stderr)
         sys.exit(1)
     
-    # Read input file
+    # A compiled scene is memory-mapped instead of parsed
+    if args.input.lower().endswith(".geoc"):
+        try:
+            print(f"Exporting {args.input} to {args.output}...")
+            export_compiled(args)
+            print(f"Successfully exported to {args.output}")
+        except Exception as e:
+            print(f"Error exporting: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    
+    # Open input file; it is parsed as it is read
     try:
-        with open(args.input, 'r', encoding='utf-8') as f:
-            syntax = f.read()
+        source = open(args.input, 'r', encoding='utf-8')
     except Exception as e:
         print(f"Error reading input file: {e}", file=sys.stderr)
         sys.exit(1)
     
-    # Export to PNG
+    # Export to PNG or SVG
     try:
         print(f"Exporting {args.input} to {args.output}...")
-        export_geometry_syntax(
-            syntax, 
-            args.output, 
-            width=args.width, 
-            height=args.height
-        )
+        with source:
+            if args.output.lower().endswith(".svg"):
+                export_geometry_svg(
+                    source,
+                    args.output,
+                    width=args.width,
+                    height=args.height,
+                    auto_scale=not args.no_autoscale
+                )
+            else:
+                export_geometry_syntax(
+                    source, 
+                    args.output, 
+                    width=args.width, 
+                    height=args.height,
+                    auto_scale=not args.no_autoscale,
+                    backend=args.backend,
+                    cache=RenderCache(os.path.expanduser(args.cache_dir)) if args.cache_dir else None
+                )
         print(f"Successfully exported to {args.output}")
     except Exception as e:
         print(f"Error exporting: {e}", file=sys.stderr)
@@ -2,6 +2,9 @@
 Core classes for shapix geometry engine
 """
 
-from .base import Point, GeometricShape
+from .base import Flag, Point, GeometricShape
+from .store import PointStore
+from .spatial import SpatialIndex
+from .scene import Scene
 
-__all__ = ['Point', 'GeometricShape']
\ No newline at end of file
+__all__ = ['Point', 'PointStore', 'Flag', 'GeometricShape', 'Scene', 'SpatialIndex']
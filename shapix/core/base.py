@@ -2,21 +2,111 @@
 Base classes for geometric shapes in shapix
 """
 
+import itertools
 import math
 import uuid
+import weakref
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Any, Optional
+from operator import attrgetter
+from typing import Dict, List, Tuple, Any, Optional, Sequence
+
+from .store import PointStore
+
+# Source of shape handles; unique and increasing across every scene
+_handles = itertools.count(1)
 
 
-@dataclass
 class Point:
-    """A point in 2D space with label support"""
-    x: float
-    y: float
-    label: str = ""
-    show_label: bool = True
-    label_position: str = "top_right"
+    """A point in 2D space with label support
+    
+    A Point is a lightweight handle to one slot of a ``PointStore``, which
+    keeps the coordinates and label data of all its points in contiguous
+    arrays. Points use the shared default store unless ``store`` is given.
+    """
+    
+    __slots__ = ('_store', '_index', '__weakref__')
+    
+    def __init__(self, x: float, y: float, label: str = "", show_label: bool = True,
+                 label_position: str = "top_right", store: Optional[PointStore] = None):
+        if store is None:
+            store = PointStore.default()
+        self._index = store.allocate(x, y, label, show_label, label_position)
+        self._store = store
+    
+    @classmethod
+    def create_many(cls, x: Sequence[float], y: Sequence[float], labels: Sequence[str],
+                    show_label: bool = True, label_position: str = "top_right",
+                    store: Optional[PointStore] = None) -> List['Point']:
+        """Create one point per coordinate pair, filling the store in bulk"""
+        if store is None:
+            store = PointStore.default()
+        points = []
+        new = object.__new__
+        for index in store.allocate_many(x, y, labels, show_label, label_position):
+            point = new(cls)
+            point._index = index
+            point._store = store
+            points.append(point)
+        return points
+    
+    def __del__(self):
+        store = getattr(self, '_store', None)
+        if store is not None:
+            store.release(self._index)
+    
+    @property
+    def store(self) -> PointStore:
+        """The store holding this point's data"""
+        return self._store
+    
+    @property
+    def index(self) -> int:
+        """This point's slot in its store"""
+        return self._index
+    
+    @property
+    def x(self) -> float:
+        return self._store.x[self._index]
+    
+    @x.setter
+    def x(self, value: float) -> None:
+        if self._store.x[self._index] != value:
+            self._store.x[self._index] = value
+            self._store._notify_point(self._index)
+    
+    @property
+    def y(self) -> float:
+        return self._store.y[self._index]
+    
+    @y.setter
+    def y(self, value: float) -> None:
+        if self._store.y[self._index] != value:
+            self._store.y[self._index] = value
+            self._store._notify_point(self._index)
+    
+    @property
+    def label(self) -> str:
+        return self._store.labels[self._store.label_ids[self._index]]
+    
+    @label.setter
+    def label(self, value: str) -> None:
+        self._store.set_label(self._index, value)
+    
+    @property
+    def show_label(self) -> bool:
+        return bool(self._store.show_label[self._index])
+    
+    @show_label.setter
+    def show_label(self, value: bool) -> None:
+        self._store.show_label[self._index] = 1 if value else 0
+    
+    @property
+    def label_position(self) -> str:
+        return self._store.positions[self._store.position_ids[self._index]]
+    
+    @label_position.setter
+    def label_position(self, value: str) -> None:
+        self._store.set_label_position(self._index, value)
     
     def distance_to(self, other: 'Point') -> float:
         """Calculate Euclidean distance to another point"""
@@ -28,12 +118,23 @@ class Point:
     
     def move(self, dx: float, dy: float) -> None:
         """Move point by given offset"""
-        self.x += dx
-        self.y += dy
+        if dx or dy:
+            self._store.x[self._index] += dx
+            self._store.y[self._index] += dy
+            self._store._notify_point(self._index)
     
     def copy(self) -> 'Point':
-        """Create a deep copy of this point"""
-        return Point(self.x, self.y, self.label, self.show_label, self.label_position)
+        """Create a deep copy of this point (in the same store)"""
+        return Point(self.x, self.y, self.label, self.show_label, self.label_position,
+                     store=self._store)
+    
+    def __reduce__(self):
+        # Copies and unpickled points get their own slot in the default store
+        return Point, (self.x, self.y, self.label, self.show_label, self.label_position)
+    
+    def __repr__(self) -> str:
+        return (f"Point(x={self.x!r}, y={self.y!r}, label={self.label!r}, "
+                f"show_label={self.show_label!r}, label_position={self.label_position!r})")
     
     def __eq__(self, other) -> bool:
         if not isinstance(other, Point):
@@ -45,37 +146,163 @@ class Point:
         return hash((round(self.x, 10), round(self.y, 10)))
 
 
+class Flag:
+    """A shape attribute with a class-level default
+    
+    Reading returns the instance's override if it has one, else the default.
+    Only values that differ from the default are stored, in the instance's
+    ``_overrides`` dict, so shapes that keep their defaults carry no
+    per-instance storage for them. Subclasses change a default by declaring
+    the flag again.
+    
+    ``changed`` names a method of the instance to call with the old value
+    whenever the value changes.
+    """
+    
+    __slots__ = ('name', 'default', 'changed')
+    
+    def __init__(self, default: Any, changed: Optional[str] = None):
+        self.default = default
+        self.changed = changed
+        self.name = ""
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+    
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        overrides = instance._overrides
+        if overrides is not None:
+            return overrides.get(self.name, self.default)
+        return self.default
+    
+    def __set__(self, instance: Any, value: Any) -> None:
+        changed = self.changed
+        if changed is not None:
+            old = self.__get__(instance)
+        overrides = instance._overrides
+        if type(value) is type(self.default) and value == self.default:
+            if overrides is not None:
+                overrides.pop(self.name, None)
+        elif overrides is None:
+            instance._overrides = {self.name: value}
+        else:
+            overrides[self.name] = value
+        if changed is not None and old != value:
+            getattr(instance, changed)(old)
+
+
+def point_ref(name: str) -> property:
+    """A shape attribute holding a ``Point`` that the shape depends on
+    
+    The point is kept in the ``_<name>`` slot. Assigning a point registers
+    the shape as its dependent in the point's store (and unregisters it
+    from the point it replaces), so moving the point notifies the shape.
+    Constructors fill the slots directly and then call
+    ``_register_points`` once, which is much cheaper for new shapes.
+    """
+    storage = '_' + name
+    
+    def set_point(shape: 'GeometricShape', point: Point) -> None:
+        old = getattr(shape, storage, None)
+        if old is point:
+            return
+        if old is not None:
+            old._store.remove_dependent(old._index, shape)
+        setattr(shape, storage, point)
+        point._store.add_dependent(point._index, shape)
+        shape._geometry_changed()
+    
+    # attrgetter keeps reads as fast as a plain slot lookup
+    return property(attrgetter(storage), set_point, doc=f"Point the shape depends on ({name})")
+
+
 class GeometricShape(ABC):
-    """Abstract base class for all geometric shapes"""
+    """Abstract base class for all geometric shapes
+    
+    Shapes use ``__slots__``. Style and display options are ``Flag``
+    attributes whose defaults live on the class. A shape's identity is its
+    integer ``handle``; the uuid ``id`` string is only generated when read.
+    
+    Subclasses declare the points they are built from with ``point_ref``;
+    moving any of those points calls ``_geometry_changed``. Derived
+    quantities come from ``get_measures``, which subclasses implement in
+    ``_compute_measures`` and which is cached until the geometry changes.
+    """
+    
+    __slots__ = ('_handle', '_id', '_name', '_overrides', '_extra', '_measures', '_spatial_indexes',
+                 '_scenes', '__weakref__')
+    
+    visible = Flag(True)
+    selected = Flag(False)
+    color = Flag("black")
+    fill_color = Flag(None)
+    line_width = Flag(2)
+    line_style = Flag("solid")
+    layer = Flag(0, changed='_layer_changed')
+    font_size = Flag(12)
+    text_color = Flag("black")
+    
+    # Display options
+    show_labels = Flag(True)
+    vertex_labels = Flag(True)
+    center_label = Flag(True)
+    angle_labels = Flag(True)
+    angle_measures = Flag(True)
+    side_labels = Flag(False)
+    show_label = Flag(True)
+    show_endpoints = Flag(False)
+    show_length = Flag(False)
+    show_measure = Flag(True)
+    dimensions = Flag(False)
+    radius_lines = Flag(False)
     
     def __init__(self, name: str = ""):
-        self.id = str(uuid.uuid4())
-        self.name = name or f"{self.__class__.__name__}_{self.id[:8]}"
-        self.visible = True
-        self.selected = False
-        self.color = "black"
-        self.fill_color = None
-        self.line_width = 2
-        self.line_style = "solid"
-        self.layer = 0
-        self.font_size = 12
-        self.text_color = "black"
-        
-        # Display options
-        self.show_labels = True
-        self.vertex_labels = True
-        self.center_label = True
-        self.angle_labels = True
-        self.angle_measures = True
-        self.side_labels = False
-        self.show_label = True
-        self.show_endpoints = False
-        self.show_length = False
-        self.show_measure = True
-        self.dimensions = False
-        self.radius_lines = False
-        
-        self._properties = {}
+        self._handle = next(_handles)
+        self._id = None
+        self._name = name
+        self._overrides = None
+        self._extra = None
+        self._measures = None
+        self._spatial_indexes = ()
+        self._scenes = ()
+    
+    @property
+    def handle(self) -> int:
+        """Integer identity of this shape, used as the key by indexes"""
+        return self._handle
+    
+    @property
+    def id(self) -> str:
+        """Unique identifier string, generated on first access"""
+        if self._id is None:
+            self._id = str(uuid.uuid4())
+        return self._id
+    
+    @property
+    def name(self) -> str:
+        if not self._name:
+            self._name = f"{self.__class__.__name__}_{self._handle}"
+        return self._name
+    
+    @name.setter
+    def name(self, value: str) -> None:
+        old = self._name
+        self._name = value
+        for scene in self._scenes:
+            scene._shape_renamed(self, old)
+    
+    @property
+    def _properties(self) -> Dict[str, Any]:
+        """Custom properties set through ``set_property`` (created on demand)"""
+        if self._extra is None:
+            self._extra = {}
+        return self._extra
+    
+    @_properties.setter
+    def _properties(self, value: Dict[str, Any]) -> None:
+        self._extra = value
     
     @abstractmethod
     def get_points(self) -> List[Point]:
@@ -97,9 +324,24 @@ class GeometricShape(ABC):
         """Check if the given point is inside this shape"""
         pass
     
+    def get_measures(self) -> Any:
+        """Derived quantities of the shape (a NamedTuple), computed in one pass
+        
+        The result is cached until one of the shape's points moves or another
+        geometric attribute (such as a circle's radius) changes.
+        """
+        measures = self._measures
+        if measures is None:
+            measures = self._measures = self._compute_measures()
+        return measures
+    
+    def _compute_measures(self) -> Any:
+        raise NotImplementedError(f"{self.__class__.__name__} does not define measures")
+    
     def get_properties(self) -> Dict[str, Any]:
         """Get all properties of this shape"""
         base_props = {
+            'handle': self._handle,
             'id': self.id,
             'name': self.name,
             'visible': self.visible,
@@ -123,7 +365,8 @@ class GeometricShape(ABC):
             'dimensions': self.dimensions,
             'radius_lines': self.radius_lines
         }
-        base_props.update(self._properties)
+        if self._extra:
+            base_props.update(self._extra)
         return base_props
     
     def set_property(self, key: str, value: Any) -> None:
@@ -137,7 +380,9 @@ class GeometricShape(ABC):
         """Get a property value"""
         if hasattr(self, key):
             return getattr(self, key)
-        return self._properties.get(key, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
     
     def move(self, dx: float, dy: float) -> None:
         """Move shape by given offset"""
@@ -146,6 +391,77 @@ class GeometricShape(ABC):
             point.move(dx, dy)
         self.set_points(points)
     
+    def _register_points(self) -> None:
+        """Register this shape as a dependent of every point it references"""
+        # Inlined PointStore.add_dependent: this runs for every new shape
+        ref = weakref.ref(self)
+        for point in self.get_points():
+            dependents = point._store._dependents
+            refs = dependents.get(point._index)
+            if refs is None:
+                dependents[point._index] = [ref]
+            else:
+                refs.append(ref)
+    
+    def _geometry_changed(self) -> None:
+        """Called when one of this shape's points moved or was replaced"""
+        self._measures = None
+        self._bounds_changed()
+        for scene in self._scenes:
+            scene._shape_changed(self)
+    
+    def _bounds_changed(self) -> None:
+        """Re-bin this shape in every spatial index that holds it"""
+        for index in self._spatial_indexes:
+            index.update(self)
+    
+    def _layer_changed(self, old_layer: int) -> None:
+        """Move this shape to its new layer in every scene that holds it"""
+        for scene in self._scenes:
+            scene._shape_relayered(self, old_layer)
+    
+    def _assign(self, other: 'GeometricShape') -> None:
+        """Take over the points, attributes, name and options of ``other``
+        
+        ``other`` must be of the same class; it is detached from its points
+        and should be discarded. This shape keeps its handle and its place in
+        scenes and spatial indexes, which are notified of the change.
+        """
+        for point in other.get_points():
+            point._store.remove_dependent(point._index, other)
+        old_layer = self.layer
+        if other._name != self._name:
+            self.name = other._name
+        self._overrides = other._overrides
+        self._extra = other._extra
+        for cls in type(self).__mro__:
+            if cls is GeometricShape:
+                break
+            for slot in cls.__dict__.get('__slots__', ()):
+                value = getattr(other, slot)
+                if isinstance(value, Point):
+                    # Through the point_ref property, which moves the dependency
+                    setattr(self, slot[1:], value)
+                else:
+                    setattr(self, slot, value)
+        if self.layer != old_layer:
+            self._layer_changed(old_layer)
+        self._geometry_changed()
+    
+    def __setstate__(self, state: Any) -> None:
+        # copy.copy, copy.deepcopy and unpickling create a distinct shape: give
+        # it its own handle, leave it out of the original's indexes and scenes
+        # and register it with the points it references
+        dict_state, slot_state = state if isinstance(state, tuple) else (state, None)
+        for attributes in (dict_state, slot_state):
+            for key, value in (attributes or {}).items():
+                setattr(self, key, value)
+        self._handle = next(_handles)
+        self._measures = None
+        self._spatial_indexes = ()
+        self._scenes = ()
+        self._register_points()
+    
     def copy(self) -> 'GeometricShape':
         """Create a deep copy of this shape"""
         # This is a simplified copy - subclasses should override for proper copying
@@ -160,7 +476,8 @@ class GeometricShape(ABC):
         new_shape.font_size = self.font_size
         new_shape.text_color = self.text_color
         new_shape.show_labels = self.show_labels
-        new_shape._properties = self._properties.copy()
+        if self._extra:
+            new_shape._properties = self._extra.copy()
         new_shape.set_points([p.copy() for p in self.get_points()])
         return new_shape
     
@@ -0,0 +1,173 @@
+"""
+Scene container with name, type and layer indexes
+"""
+
+import bisect
+from typing import Dict, Iterable, Iterator, List, Optional, Type, TypeVar
+
+from .base import GeometricShape
+from .spatial import SpatialIndex
+
+S = TypeVar('S', bound=GeometricShape)
+
+
+class Scene:
+    """An ordered collection of shapes with incrementally maintained indexes
+
+    Shapes are keyed by ``handle`` and kept in insertion order. The scene
+    also maintains:
+
+    - a name index for O(1) ``get(name)`` (the most recently added shape
+      wins when names repeat)
+    - one bucket per shape class for ``of_type``
+    - per-layer buckets and a sorted list of layers, so ``by_layer`` yields
+      shapes in drawing order without sorting
+
+    Shapes notify their scenes when their ``name`` or ``layer`` changes, and
+    when one of their points moves. Moved shapes are collected in a dirty
+    set, so consumers such as an interactive renderer can redraw only those
+    (see ``take_dirty``).
+    """
+
+    def __init__(self, shapes: Iterable[GeometricShape] = ()):
+        self._shapes: Dict[int, GeometricShape] = {}
+        self._names: Dict[str, int] = {}
+        self._types: Dict[type, Dict[int, GeometricShape]] = {}
+        self._layers: Dict[int, Dict[int, GeometricShape]] = {}
+        self._layer_keys: List[int] = []
+        self._spatial_index: Optional[SpatialIndex] = None
+        self._dirty: Dict[int, GeometricShape] = {}
+        self.extend(shapes)
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def __iter__(self) -> Iterator[GeometricShape]:
+        """Shapes in insertion order"""
+        return iter(list(self._shapes.values()))
+
+    def __contains__(self, shape: GeometricShape) -> bool:
+        return self._shapes.get(shape.handle) is shape
+
+    @property
+    def names(self) -> Dict[str, int]:
+        """Mapping of shape names to handles (read-only view by convention)"""
+        return self._names
+
+    def add(self, shape: GeometricShape) -> None:
+        """Add a shape; adding a shape that is already in the scene does nothing"""
+        handle = shape.handle
+        if handle in self._shapes:
+            return
+        self._shapes[handle] = shape
+        self._names[shape.name] = handle
+        self._types.setdefault(type(shape), {})[handle] = shape
+        self._add_to_layer(shape, shape.layer)
+        shape._scenes += (self,)
+        if self._spatial_index is not None:
+            self._spatial_index.insert(shape)
+
+    def extend(self, shapes: Iterable[GeometricShape]) -> None:
+        """Add several shapes in order"""
+        for shape in shapes:
+            self.add(shape)
+
+    def remove(self, shape: GeometricShape) -> None:
+        """Remove a shape from the scene"""
+        handle = shape.handle
+        if self._shapes.get(handle) is not shape:
+            raise KeyError(shape)
+        del self._shapes[handle]
+        if self._names.get(shape.name) == handle:
+            del self._names[shape.name]
+        bucket = self._types[type(shape)]
+        del bucket[handle]
+        if not bucket:
+            del self._types[type(shape)]
+        self._remove_from_layer(handle, shape.layer)
+        self._dirty.pop(handle, None)
+        shape._scenes = tuple(scene for scene in shape._scenes if scene is not self)
+        if self._spatial_index is not None:
+            self._spatial_index.remove(shape)
+
+    def clear(self) -> None:
+        """Remove every shape"""
+        for shape in list(self._shapes.values()):
+            self.remove(shape)
+
+    def get(self, name: str, default: Optional[GeometricShape] = None) -> Optional[GeometricShape]:
+        """Shape with the given name"""
+        handle = self._names.get(name)
+        return default if handle is None else self._shapes[handle]
+
+    def by_handle(self, handle: int) -> Optional[GeometricShape]:
+        """Shape with the given handle"""
+        return self._shapes.get(handle)
+
+    def of_type(self, shape_type: Type[S]) -> List[S]:
+        """Shapes that are instances of ``shape_type``, in insertion order"""
+        buckets = [bucket for cls, bucket in self._types.items() if issubclass(cls, shape_type)]
+        if len(buckets) <= 1:
+            return [shape for bucket in buckets for shape in bucket.values()]
+        return [shape for shape in self._shapes.values() if isinstance(shape, shape_type)]
+
+    @property
+    def layers(self) -> List[int]:
+        """Layers that hold at least one shape, lowest first"""
+        return list(self._layer_keys)
+
+    def by_layer(self) -> Iterator[GeometricShape]:
+        """Shapes in drawing order: by layer, then in the order they joined it"""
+        for layer in list(self._layer_keys):
+            yield from list(self._layers[layer].values())
+
+    @property
+    def dirty(self) -> List[GeometricShape]:
+        """Shapes whose geometry changed since the last ``take_dirty``"""
+        return list(self._dirty.values())
+
+    def take_dirty(self) -> List[GeometricShape]:
+        """Return the changed shapes in the order they changed, and reset the set"""
+        dirty, self._dirty = self._dirty, {}
+        return list(dirty.values())
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """A SpatialIndex over the scene, built on first use and kept in sync"""
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self._shapes.values())
+        return self._spatial_index
+
+    # ------------------------------------------------------------------
+    # Notifications from shapes
+    # ------------------------------------------------------------------
+
+    def _shape_changed(self, shape: GeometricShape) -> None:
+        self._dirty[shape.handle] = shape
+
+    def _shape_renamed(self, shape: GeometricShape, old_name: str) -> None:
+        if self._names.get(old_name) == shape.handle:
+            del self._names[old_name]
+        self._names[shape.name] = shape.handle
+
+    def _shape_relayered(self, shape: GeometricShape, old_layer: int) -> None:
+        self._remove_from_layer(shape.handle, old_layer)
+        self._add_to_layer(shape, shape.layer)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _add_to_layer(self, shape: GeometricShape, layer: int) -> None:
+        bucket = self._layers.get(layer)
+        if bucket is None:
+            bucket = self._layers[layer] = {}
+            bisect.insort(self._layer_keys, layer)
+        bucket[shape.handle] = shape
+
+    def _remove_from_layer(self, handle: int, layer: int) -> None:
+        bucket = self._layers[layer]
+        del bucket[handle]
+        if not bucket:
+            del self._layers[layer]
+            self._layer_keys.remove(layer)
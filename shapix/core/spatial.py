@@ -0,0 +1,252 @@
+"""
+Spatial index over shapes for hit-testing and viewport culling
+"""
+
+import math
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .base import GeometricShape, Point
+
+Bounds = Tuple[float, float, float, float]
+CellRange = Tuple[int, int, int, int]
+
+
+def bounds_distance(bounds: Bounds, x: float, y: float) -> float:
+    """Distance from (x, y) to a bounding box (0 inside it)"""
+    min_x, min_y, max_x, max_y = bounds
+    dx = max(min_x - x, 0.0, x - max_x)
+    dy = max(min_y - y, 0.0, y - max_y)
+    return math.hypot(dx, dy)
+
+
+class SpatialIndex:
+    """Uniform grid over shape bounding boxes
+
+    Shapes are binned into square cells by ``get_bounds()``. Shapes that
+    would cover more than ``MAX_CELLS`` cells are kept in a separate list
+    that every query checks, so one huge shape cannot flood the grid.
+
+    Shapes are keyed by their ``handle``. Indexed shapes notify the index
+    whenever one of their points moves; call ``update`` after changing a
+    shape's geometry any other way (for example assigning ``radius``).
+    """
+
+    MAX_CELLS = 256
+    HIT_TOLERANCE = 5  # Matches the selection tolerance of contains_point
+
+    def __init__(self, shapes: Iterable[GeometricShape] = (), cell_size: Optional[float] = None):
+        self._shapes: Dict[int, GeometricShape] = {}
+        self._bounds: Dict[int, Bounds] = {}
+        self._ranges: Dict[int, Optional[CellRange]] = {}
+        self._order: Dict[int, int] = {}
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._large: Set[int] = set()
+        self._extent: Optional[CellRange] = None  # Occupied cell range, rebuilt lazily
+        self._next_order = 0
+
+        # Bulk load: size the cells from the data, then bin everything
+        shapes = list(shapes)
+        all_bounds = [shape.get_bounds() for shape in shapes]
+        self.cell_size = float(cell_size or self._choose_cell_size(all_bounds))
+        for shape, bounds in zip(shapes, all_bounds):
+            self._insert(shape, bounds)
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def __contains__(self, shape: GeometricShape) -> bool:
+        return shape.handle in self._shapes
+
+    def __iter__(self) -> Iterator[GeometricShape]:
+        return iter(list(self._shapes.values()))
+
+    def insert(self, shape: GeometricShape) -> None:
+        """Add a shape (or refresh it if it is already indexed)"""
+        if shape.handle in self._shapes:
+            self.update(shape)
+        else:
+            self._insert(shape, shape.get_bounds())
+
+    def remove(self, shape: GeometricShape) -> None:
+        """Remove a shape from the index"""
+        key = shape.handle
+        if key not in self._shapes:
+            raise KeyError(shape)
+        self._unbin(key)
+        del self._shapes[key], self._bounds[key], self._ranges[key], self._order[key]
+        shape._spatial_indexes = tuple(index for index in shape._spatial_indexes if index is not self)
+
+    def update(self, shape: GeometricShape) -> None:
+        """Re-bin a shape after its bounds changed"""
+        key = shape.handle
+        bounds = shape.get_bounds()
+        self._bounds[key] = bounds
+        cell_range = self._cell_range(bounds)
+        if cell_range != self._ranges[key]:
+            self._unbin(key)
+            self._bin(key, cell_range)
+
+    def query_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[GeometricShape]:
+        """Shapes whose bounding box intersects the rectangle, in insertion order"""
+        found = {
+            key for key in self._candidates(min_x, min_y, max_x, max_y)
+            if self._intersects(self._bounds[key], min_x, min_y, max_x, max_y)
+        }
+        return [self._shapes[key] for key in sorted(found, key=self._order.__getitem__)]
+
+    def query_point(self, x: float, y: float, tolerance: Optional[float] = None) -> List[GeometricShape]:
+        """Shapes whose ``contains_point`` accepts (x, y), in insertion order"""
+        if tolerance is None:
+            tolerance = self.HIT_TOLERANCE
+        point = Point(x, y)
+        candidates = self.query_rect(x - tolerance, y - tolerance, x + tolerance, y + tolerance)
+        return [shape for shape in candidates if shape.contains_point(point)]
+
+    def nearest(self, x: float, y: float,
+                distance: Optional[Callable[[GeometricShape, float, float], float]] = None
+                ) -> Optional[GeometricShape]:
+        """Shape closest to (x, y), or None if the index is empty
+
+        By default shapes are ranked by the distance to their bounding box.
+        A custom ``distance(shape, x, y)`` must never be smaller than that,
+        which holds for any distance to the shape's own geometry.
+        """
+        if not self._shapes:
+            return None
+
+        def measure(key: int) -> float:
+            if distance is None:
+                return bounds_distance(self._bounds[key], x, y)
+            return distance(self._shapes[key], x, y)
+
+        best_key, best = None, math.inf
+
+        def consider(keys: Iterable[int]) -> None:
+            nonlocal best_key, best
+            for key in keys:
+                d = measure(key)
+                if best_key is None or d < best or (
+                        d == best and self._order[key] < self._order[best_key]):
+                    best_key, best = key, d
+
+        consider(self._large)
+        if self._cells:
+            if self._extent is None:
+                self._extent = (min(ix for ix, _ in self._cells), min(iy for _, iy in self._cells),
+                                max(ix for ix, _ in self._cells), max(iy for _, iy in self._cells))
+            ix0, iy0, ix1, iy1 = self._extent
+            cx, cy = self._cell(x), self._cell(y)
+            max_ring = max(abs(cx - ix0), abs(cx - ix1), abs(cy - iy0), abs(cy - iy1))
+
+            # Search square rings of cells outwards; cells in ring r are more than
+            # (r - 1) * cell_size away from (x, y)
+            for ring in range(max_ring + 1):
+                if best <= (ring - 1) * self.cell_size:
+                    break
+                for cell in self._ring(cx, cy, ring):
+                    keys = self._cells.get(cell)
+                    if keys:
+                        consider(keys)
+
+        return self._shapes[best_key]
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _insert(self, shape: GeometricShape, bounds: Bounds) -> None:
+        key = shape.handle
+        self._shapes[key] = shape
+        self._bounds[key] = bounds
+        self._order[key] = self._next_order
+        self._next_order += 1
+        self._bin(key, self._cell_range(bounds))
+        shape._spatial_indexes += (self,)
+
+    def _bin(self, key: int, cell_range: Optional[CellRange]) -> None:
+        self._ranges[key] = cell_range
+        if cell_range is None:
+            self._large.add(key)
+            return
+        ix0, iy0, ix1, iy1 = cell_range
+        cells = self._cells
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                cell = cells.get((ix, iy))
+                if cell is None:
+                    cells[(ix, iy)] = {key}
+                    self._extent = None
+                else:
+                    cell.add(key)
+
+    def _unbin(self, key: int) -> None:
+        cell_range = self._ranges[key]
+        if cell_range is None:
+            self._large.discard(key)
+            return
+        ix0, iy0, ix1, iy1 = cell_range
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                cell = self._cells[(ix, iy)]
+                cell.discard(key)
+                if not cell:
+                    del self._cells[(ix, iy)]
+                    self._extent = None
+
+    def _cell(self, value: float) -> int:
+        return math.floor(value / self.cell_size)
+
+    def _cell_range(self, bounds: Bounds) -> Optional[CellRange]:
+        """Cells covered by a bounding box, or None if it is too large to bin"""
+        min_x, min_y, max_x, max_y = bounds
+        if not all(math.isfinite(v) for v in bounds):
+            return None
+        ix0, iy0, ix1, iy1 = self._cell(min_x), self._cell(min_y), self._cell(max_x), self._cell(max_y)
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > self.MAX_CELLS:
+            return None
+        return ix0, iy0, ix1, iy1
+
+    def _candidates(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Iterator[int]:
+        yield from self._large
+        ix0, iy0, ix1, iy1 = self._cell(min_x), self._cell(min_y), self._cell(max_x), self._cell(max_y)
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(self._cells):
+            # Query covers more cells than are occupied: scan the occupied ones
+            for (ix, iy), keys in self._cells.items():
+                if ix0 <= ix <= ix1 and iy0 <= iy <= iy1:
+                    yield from keys
+        else:
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    keys = self._cells.get((ix, iy))
+                    if keys:
+                        yield from keys
+
+    @staticmethod
+    def _intersects(bounds: Bounds, min_x: float, min_y: float, max_x: float, max_y: float) -> bool:
+        return bounds[0] <= max_x and bounds[2] >= min_x and bounds[1] <= max_y and bounds[3] >= min_y
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int) -> Iterator[Tuple[int, int]]:
+        if ring == 0:
+            yield cx, cy
+            return
+        for ix in range(cx - ring, cx + ring + 1):
+            yield ix, cy - ring
+            yield ix, cy + ring
+        for iy in range(cy - ring + 1, cy + ring):
+            yield cx - ring, iy
+            yield cx + ring, iy
+
+    @staticmethod
+    def _choose_cell_size(all_bounds: List[Bounds]) -> float:
+        """Pick a cell size near both the typical shape size and point spacing"""
+        finite = [b for b in all_bounds if all(math.isfinite(v) for v in b)]
+        if not finite:
+            return 64.0
+        extents = sorted(max(b[2] - b[0], b[3] - b[1]) for b in finite)
+        typical = extents[len(extents) // 2]
+        width = max(b[2] for b in finite) - min(b[0] for b in finite)
+        height = max(b[3] for b in finite) - min(b[1] for b in finite)
+        spacing = math.sqrt(width * height / len(finite)) if width > 0 and height > 0 else 0.0
+        size = max(typical, spacing)
+        return size if size > 0 else 1.0
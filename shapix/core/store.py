@@ -0,0 +1,321 @@
+"""
+Structure-of-arrays storage for point data
+"""
+
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence
+import threading
+import weakref
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .base import GeometricShape
+
+
+class _InternTable:
+    """Strings stored once each under a small id, and freed with their last reference
+
+    Ids of freed strings are reused, so ``values`` never holds more entries
+    than the most distinct strings ever in use at once.
+    """
+
+    __slots__ = ('values', 'ids', 'counts', 'free')
+
+    def __init__(self):
+        self.values: List[Optional[str]] = []
+        self.ids: Dict[str, int] = {}
+        self.counts: List[int] = []
+        self.free: List[int] = []
+
+    def acquire(self, value: str) -> int:
+        """The id of ``value``, taking one reference to it"""
+        value_id = self.ids.get(value)
+        if value_id is not None:
+            self.counts[value_id] += 1
+        elif self.free:
+            value_id = self.free.pop()
+            self.values[value_id] = value
+            self.counts[value_id] = 1
+            self.ids[value] = value_id
+        else:
+            value_id = len(self.values)
+            self.values.append(value)
+            self.counts.append(1)
+            self.ids[value] = value_id
+        return value_id
+
+    def release(self, value_id: int) -> None:
+        """Drop one reference to the string with id ``value_id``"""
+        self.counts[value_id] -= 1
+        if not self.counts[value_id]:
+            del self.ids[self.values[value_id]]
+            self.values[value_id] = None
+            self.free.append(value_id)
+
+
+class PointStore:
+    """Contiguous storage for the coordinates and label data of many points
+
+    Every ``Point`` is a small handle that owns one slot (an index) in a
+    store. The data lives in parallel typed arrays:
+
+    - ``x``, ``y``: coordinates (``array('d')``)
+    - ``label_ids``: index into ``labels`` (``array('I')``)
+    - ``show_label``: 0 or 1 (``array('b')``)
+    - ``position_ids``: index into ``positions`` (``array('H')``)
+
+    Labels and label positions are interned, so repeated strings are stored
+    once, and reference counted, so a string no point uses any more is
+    dropped (its entry in ``labels`` or ``positions`` becomes None until the
+    id is reused). Slots of garbage-collected points are recycled through a
+    free list. Bulk operations (``coords``, ``set_coords``, ``translate``)
+    work on the arrays directly through NumPy.
+
+    Allocating and releasing slots and changing labels are thread-safe, so
+    threads may share a store (such as the default one). Other writes are
+    not synchronized: a point's coordinates should only be changed by one
+    thread at a time.
+
+    The store is also the dependency graph from points to shapes: each slot
+    records (weakly) the shapes that reference its point. Writing a point's
+    coordinates through ``Point`` or the bulk operations notifies exactly
+    those shapes; writing to the arrays directly does not.
+    """
+
+    _default: Optional['PointStore'] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self):
+        self.x = array('d')
+        self.y = array('d')
+        self.label_ids = array('I')
+        self.show_label = array('b')
+        self.position_ids = array('H')
+        self._labels = _InternTable()
+        self._positions = _InternTable()
+        self.labels: List[Optional[str]] = self._labels.values
+        self.positions: List[Optional[str]] = self._positions.values
+        self._free: List[int] = []
+        # Slots released while another call held the lock, freed by the next caller
+        self._released: List[int] = []
+        self._lock = threading.Lock()
+        self._dependents: Dict[int, List[weakref.ref]] = {}
+
+    @classmethod
+    def default(cls) -> 'PointStore':
+        """The shared store used by points created without an explicit store"""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+
+    def __len__(self) -> int:
+        """Number of slots currently owned by points"""
+        return len(self.x) - len(self._free) - len(self._released)
+
+    @property
+    def capacity(self) -> int:
+        """Number of allocated slots, including free ones"""
+        return len(self.x)
+
+    def allocate(self, x: float, y: float, label: str = "", show_label: bool = True,
+                 label_position: str = "top_right") -> int:
+        """Reserve a slot for a new point and return its index"""
+        # Convert first so a bad value cannot leave the columns out of step
+        x, y = float(x), float(y)
+        show = 1 if show_label else 0
+
+        with self._lock:
+            if self._released:
+                self._free_released()
+            label_id = self._labels.acquire(label)
+            position_id = self._positions.acquire(label_position)
+            if self._free:
+                index = self._free.pop()
+                self.x[index] = x
+                self.y[index] = y
+                self.label_ids[index] = label_id
+                self.show_label[index] = show
+                self.position_ids[index] = position_id
+                return index
+
+            index = len(self.x)
+            self.x.append(x)
+            self.y.append(y)
+            self.label_ids.append(label_id)
+            self.show_label.append(show)
+            self.position_ids.append(position_id)
+            return index
+
+    def allocate_many(self, x: Sequence[float], y: Sequence[float], labels: Sequence[str],
+                      show_label: bool = True, label_position: str = "top_right") -> range:
+        """Reserve slots for many new points at once and return their indices
+        
+        The coordinates are appended to the columns in one copy each; the new
+        slots are always at the end, the free list is left for ``allocate``.
+        """
+        x = np.ascontiguousarray(x, dtype=np.float64).ravel()
+        y = np.ascontiguousarray(y, dtype=np.float64).ravel()
+        if not len(x) == len(y) == len(labels):
+            raise ValueError("x, y and labels must have the same length")
+        count = len(x)
+
+        with self._lock:
+            if self._released:
+                self._free_released()
+            acquire = self._labels.acquire
+            label_ids = [acquire(label) for label in labels]
+            position_id = self._positions.acquire(label_position)
+            self._positions.counts[position_id] += count - 1
+
+            start = len(self.x)
+            self.x.frombytes(x.tobytes())
+            self.y.frombytes(y.tobytes())
+            self.label_ids.extend(label_ids)
+            self.show_label.frombytes((b'\1' if show_label else b'\0') * count)
+            self.position_ids.extend([position_id] * count)
+            return range(start, start + count)
+
+    def release(self, index: int) -> None:
+        """Return a slot to the free list (called when its point is collected)
+
+        Points are collected at arbitrary moments, even inside another call
+        on this store, so this never waits for the lock: if it is held, the
+        slot is left for the holder's next call to free.
+        """
+        if not self._lock.acquire(False):
+            self._released.append(index)
+            return
+        try:
+            self._release(index)
+            if self._released:
+                self._free_released()
+        finally:
+            self._lock.release()
+
+    def set_label(self, index: int, label: str) -> None:
+        """Change the label of the point in slot ``index``"""
+        with self._lock:
+            if self._released:
+                self._free_released()
+            old = self.label_ids[index]
+            self.label_ids[index] = self._labels.acquire(label)
+            self._labels.release(old)
+
+    def set_label_position(self, index: int, position: str) -> None:
+        """Change the label position of the point in slot ``index``"""
+        with self._lock:
+            if self._released:
+                self._free_released()
+            old = self.position_ids[index]
+            self.position_ids[index] = self._positions.acquire(position)
+            self._positions.release(old)
+
+    def _release(self, index: int) -> None:
+        if self._dependents:
+            self._dependents.pop(index, None)
+        self._labels.release(self.label_ids[index])
+        self._positions.release(self.position_ids[index])
+        self._free.append(index)
+
+    def _free_released(self) -> None:
+        """Free the slots whose release was deferred (with the lock held)"""
+        released = self._released
+        while released:
+            self._release(released.pop())
+
+    # ------------------------------------------------------------------
+    # Dependency graph
+    # ------------------------------------------------------------------
+
+    def add_dependent(self, index: int, shape: 'GeometricShape') -> None:
+        """Record that ``shape`` references the point in slot ``index``"""
+        self._dependents.setdefault(index, []).append(weakref.ref(shape))
+
+    def remove_dependent(self, index: int, shape: 'GeometricShape') -> None:
+        """Forget one reference from ``shape`` to the point in slot ``index``"""
+        refs = self._dependents.get(index)
+        if refs is None:
+            return
+        for position, ref in enumerate(refs):
+            if ref() is shape:
+                del refs[position]
+                break
+        if not refs:
+            del self._dependents[index]
+
+    def dependents(self, index: int) -> List['GeometricShape']:
+        """Live shapes that reference the point in slot ``index``"""
+        shapes = []
+        for ref in self._dependents.get(index, ()):
+            shape = ref()
+            if shape is not None and shape not in shapes:
+                shapes.append(shape)
+        return shapes
+
+    def notify(self, indices: Iterable[int]) -> None:
+        """Tell the dependents of ``indices`` that their geometry changed
+        
+        Each affected shape is notified once, however many of its points moved.
+        """
+        dependents = self._dependents
+        seen = {}
+        for index in indices:
+            refs = dependents.get(index)
+            if refs:
+                for ref in refs:
+                    seen[id(ref)] = ref
+        self._notify_refs(seen.values())
+
+    def _notify_point(self, index: int) -> None:
+        refs = self._dependents.get(index)
+        if refs:
+            self._notify_refs(list(refs))
+
+    def _notify_refs(self, refs: Iterable[weakref.ref]) -> None:
+        for ref in refs:
+            shape = ref()
+            if shape is not None:
+                shape._geometry_changed()
+
+    # ------------------------------------------------------------------
+    # Bulk operations
+    # ------------------------------------------------------------------
+
+    def coords(self, indices: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Copy the coordinates of ``indices`` (default: every slot) as an (N, 2) array"""
+        x = np.frombuffer(self.x, dtype=np.float64)
+        y = np.frombuffer(self.y, dtype=np.float64)
+        if indices is not None:
+            indices = np.asarray(indices, dtype=np.intp)
+            x, y = x[indices], y[indices]
+        return np.stack((x, y), axis=1)
+
+    def set_coords(self, coords: np.ndarray, indices: Optional[Sequence[int]] = None) -> None:
+        """Write an (N, 2) array back to ``indices`` (default: every slot)"""
+        coords = np.asarray(coords, dtype=np.float64)
+        x = np.frombuffer(self.x, dtype=np.float64)
+        y = np.frombuffer(self.y, dtype=np.float64)
+        where = slice(None) if indices is None else np.asarray(indices, dtype=np.intp)
+        x[where] = coords[..., 0]
+        y[where] = coords[..., 1]
+        self._notify_bulk(indices)
+
+    def translate(self, dx: float, dy: float, indices: Optional[Sequence[int]] = None) -> None:
+        """Move the points in ``indices`` (default: every slot) by (dx, dy) in place"""
+        x = np.frombuffer(self.x, dtype=np.float64)
+        y = np.frombuffer(self.y, dtype=np.float64)
+        where = slice(None) if indices is None else np.asarray(indices, dtype=np.intp)
+        x[where] += dx
+        y[where] += dy
+        self._notify_bulk(indices)
+
+    def _notify_bulk(self, indices: Optional[Sequence[int]]) -> None:
+        if not self._dependents:
+            return
+        if indices is None:
+            self.notify(list(self._dependents))
+        else:
+            self.notify(np.asarray(indices, dtype=np.intp).ravel().tolist())
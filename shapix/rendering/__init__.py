@@ -3,5 +3,8 @@ Rendering utilities for shapix geometry engine
 """
 
 from .renderer import ShapeRenderer
+from .display_list import DisplayList
+from .raster import RasterCanvas
+from .svg import SVGCanvas
 
-__all__ = ['ShapeRenderer']
\ No newline at end of file
+__all__ = ['ShapeRenderer', 'DisplayList', 'RasterCanvas', 'SVGCanvas']
@@ -0,0 +1,208 @@
+"""
+Display list intermediate representation for shapix
+
+ShapeRenderer lowers shapes into primitive draw operations. A DisplayList
+records them into flat typed arrays instead of drawing, so the layout work
+(label offsets, bisectors, arc extents) is done once and can be replayed
+onto any canvas backend (tkinter, RasterCanvas, SVGCanvas), pickled, or
+serialized with ``to_bytes``.
+"""
+
+from array import array
+import json
+import struct
+import sys
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+OVAL, LINE, POLYGON, RECTANGLE, ARC, TEXT = range(6)
+
+_OP_METHODS = ("create_oval", "create_line", "create_polygon",
+               "create_rectangle", "create_arc", "create_text")
+
+_MAGIC = b"SHPXDL1\n"
+_HEADER_LEN = struct.Struct("<I")
+
+
+def _freeze(value: Any) -> Any:
+    """Make option values hashable (and undo JSON's tuple-to-list conversion)"""
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class DisplayList:
+    """A recorded sequence of canvas draw operations
+
+    The list implements the drawing subset of the tkinter Canvas API, so
+    ShapeRenderer can draw onto it directly. Storage is column-oriented:
+
+    - ``ops``: opcode per operation (``array('B')``)
+    - ``ends``: end offset of each operation's coordinates (``array('I')``)
+    - ``styles``: index into the interned style table (``array('I')``)
+    - ``coords``: all coordinates back to back (``array('d')``); arcs append
+      their start angle and extent after the bounding box
+    - ``texts``: the strings of the text operations, in order
+    """
+
+    def __init__(self):
+        self.ops = array("B")
+        self.ends = array("I")
+        self.styles = array("I")
+        self.coords = array("d")
+        self.texts: List[str] = []
+        self.style_table: List[Dict[str, Any]] = []
+        self._style_ids: Dict[Tuple[Any, ...], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DisplayList):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __iter__(self) -> Iterator[Tuple[str, Tuple[float, ...], Dict[str, Any]]]:
+        """Yield ``(method_name, coords, options)`` for every operation"""
+        texts = iter(self.texts)
+        start = 0
+        for op, end, style in zip(self.ops, self.ends, self.styles):
+            options = dict(self.style_table[style])
+            coords = tuple(self.coords[start:end])
+            if op == ARC:
+                coords, (options["start"], options["extent"]) = coords[:4], coords[4:]
+            elif op == TEXT:
+                options["text"] = next(texts)
+            yield _OP_METHODS[op], coords, options
+            start = end
+
+    # ------------------------------------------------------------------
+    # tkinter Canvas API (recording)
+    # ------------------------------------------------------------------
+
+    def delete(self, *tags: Any) -> None:
+        """Drop everything recorded so far"""
+        del self.ops[:], self.ends[:], self.styles[:], self.coords[:]
+        self.texts.clear()
+
+    def update(self) -> None:
+        """Nothing is drawn while recording"""
+
+    def create_oval(self, *coords: Any, **options: Any) -> int:
+        return self._record(OVAL, coords, options)
+
+    def create_line(self, *coords: Any, **options: Any) -> int:
+        return self._record(LINE, coords, options)
+
+    def create_polygon(self, *coords: Any, **options: Any) -> int:
+        return self._record(POLYGON, coords, options)
+
+    def create_rectangle(self, *coords: Any, **options: Any) -> int:
+        return self._record(RECTANGLE, coords, options)
+
+    def create_arc(self, *coords: Any, start: float = 0, extent: float = 90, **options: Any) -> int:
+        if len(coords) == 1:
+            coords = coords[0]
+        return self._record(ARC, (*coords, start, extent), options)
+
+    def create_text(self, x: float, y: float, text: str = "", **options: Any) -> int:
+        self.texts.append(str(text))
+        return self._record(TEXT, (x, y), options)
+
+    # ------------------------------------------------------------------
+    # Replay and serialization
+    # ------------------------------------------------------------------
+
+    def replay(self, canvas: Any) -> None:
+        """Issue every recorded operation on ``canvas``
+
+        The canvas is not cleared first; call ``canvas.delete("all")`` to
+        start from a blank canvas.
+        """
+        methods = [getattr(canvas, name) for name in _OP_METHODS]
+        style_table = self.style_table
+        coords = self.coords
+        texts = iter(self.texts)
+        start = 0
+        for op, end, style in zip(self.ops, self.ends, self.styles):
+            options = style_table[style]
+            if op == TEXT:
+                methods[op](coords[start], coords[start + 1], text=next(texts), **options)
+            elif op == ARC:
+                methods[op](coords[start:start + 4].tolist(), start=coords[start + 4],
+                            extent=coords[start + 5], **options)
+            else:
+                methods[op](*coords[start:end], **options)
+            start = end
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact binary blob (see ``from_bytes``)"""
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "ops": len(self.ops),
+            "coords": len(self.coords),
+            "styles": [[list(items) for items in style.items()] for style in self.style_table],
+            "texts": self.texts,
+        }).encode("utf-8")
+        return b"".join((
+            _MAGIC, _HEADER_LEN.pack(len(header)), header,
+            self.ops.tobytes(), self.ends.tobytes(), self.styles.tobytes(), self.coords.tobytes(),
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DisplayList":
+        """Rebuild a display list written by ``to_bytes``"""
+        if not data.startswith(_MAGIC):
+            raise ValueError("Not a shapix display list")
+
+        offset = len(_MAGIC)
+        (header_len,) = _HEADER_LEN.unpack_from(data, offset)
+        offset += _HEADER_LEN.size
+        header = json.loads(data[offset:offset + header_len].decode("utf-8"))
+        offset += header_len
+
+        display_list = cls()
+        count = header["ops"]
+        for column, length in ((display_list.ops, count), (display_list.ends, count),
+                               (display_list.styles, count),
+                               (display_list.coords, header["coords"])):
+            size = length * column.itemsize
+            column.frombytes(data[offset:offset + size])
+            offset += size
+            if header["byteorder"] != sys.byteorder:
+                column.byteswap()
+
+        for items in header["styles"]:
+            display_list.style_table.append({key: _freeze(value) for key, value in items})
+        display_list._style_ids = {
+            tuple(style.items()): index for index, style in enumerate(display_list.style_table)
+        }
+        display_list.texts = list(header["texts"])
+        return display_list
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _record(self, op: int, coords: Sequence[Any], options: Dict[str, Any]) -> int:
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        self.coords.extend(coords)
+        self.ops.append(op)
+        self.ends.append(len(self.coords))
+        self.styles.append(self._style_id(options))
+        return len(self.ops)
+
+    def _style_id(self, options: Dict[str, Any]) -> int:
+        """Intern an options dict in the style table"""
+        try:
+            key = tuple(options.items())
+            style_id = self._style_ids.get(key)
+        except TypeError:
+            options = {name: _freeze(value) for name, value in options.items()}
+            key = tuple(options.items())
+            style_id = self._style_ids.get(key)
+        if style_id is None:
+            style_id = len(self.style_table)
+            self.style_table.append(dict(options))
+            self._style_ids[key] = style_id
+        return style_id
@@ -0,0 +1,583 @@
+"""
+Headless NumPy raster canvas for shapix
+
+RasterCanvas implements the subset of the tkinter Canvas API that
+ShapeRenderer uses (create_oval, create_line, create_polygon, create_arc,
+create_rectangle, create_text, delete) and draws straight into an RGBA
+NumPy buffer. PNG files are encoded in-process, so no display, PostScript
+or Ghostscript is needed.
+"""
+
+import math
+import struct
+import zlib
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+RGBA = Tuple[int, int, int, int]
+
+# Tk 8.6 color names used by shapix diagrams. Anything not listed here is
+# resolved through PIL.ImageColor when Pillow is installed.
+TK_COLORS: Dict[str, Tuple[int, int, int]] = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "green": (0, 128, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "orange": (255, 165, 0),
+    "purple": (128, 0, 128),
+    "pink": (255, 192, 203),
+    "gray": (128, 128, 128),
+    "grey": (128, 128, 128),
+    "navy": (0, 0, 128),
+    "maroon": (128, 0, 0),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+    "brown": (165, 42, 42),
+    "plum": (221, 160, 221),
+    "darkblue": (0, 0, 139),
+    "darkgreen": (0, 100, 0),
+    "darkred": (139, 0, 0),
+    "lightblue": (173, 216, 230),
+    "lightgreen": (144, 238, 144),
+    "lightpink": (255, 182, 193),
+    "lightgray": (211, 211, 211),
+    "lightgrey": (211, 211, 211),
+}
+
+# Tk font sizes are in points. The PostScript export path maps one canvas
+# pixel to one point, so text is rasterized at the same 1:1 ratio.
+POINTS_TO_PIXELS = 1.0
+
+_TEXT_ANCHORS = {
+    "center": "mm", "n": "mt", "s": "mb", "e": "rm", "w": "lm",
+    "ne": "rt", "nw": "lt", "se": "rb", "sw": "lb",
+}
+
+_FONT_FILES = {
+    "arial": ("arial.ttf", "Arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf"),
+    "arial bold": ("arialbd.ttf", "Arial Bold.ttf", "DejaVuSans-Bold.ttf",
+                   "LiberationSans-Bold.ttf"),
+}
+
+_color_cache: Dict[str, Optional[RGBA]] = {}
+_font_cache: Dict[Tuple[str, int, bool], Any] = {}
+
+
+def parse_color(color: Optional[str]) -> Optional[RGBA]:
+    """Convert a Tk color spec to an RGBA tuple, or None for no color"""
+    if not color:
+        return None
+    if color in _color_cache:
+        return _color_cache[color]
+
+    key = color.lower().replace(" ", "")
+    rgba: Optional[RGBA] = None
+    if key.startswith("#") and len(key) in (4, 7, 13):
+        digits = (len(key) - 1) // 3
+        channels = [int(key[1 + i * digits:1 + (i + 1) * digits], 16) for i in range(3)]
+        scale = 255 / (16 ** digits - 1)
+        rgba = (*(int(round(c * scale)) for c in channels), 255)  # type: ignore[assignment]
+    elif key in TK_COLORS:
+        rgba = (*TK_COLORS[key], 255)  # type: ignore[assignment]
+    else:
+        try:
+            from PIL import ImageColor
+            rgba = (*ImageColor.getrgb(key)[:3], 255)  # type: ignore[assignment]
+        except (ImportError, ValueError):
+            rgba = (0, 0, 0, 255)
+
+    _color_cache[color] = rgba
+    return rgba
+
+
+def encode_png(rgba: np.ndarray, compress_level: int = 6) -> bytes:
+    """Encode an (H, W, 4) uint8 array as PNG bytes
+
+    Fully opaque images are written as RGB, which is smaller and faster
+    to compress.
+    """
+    height, width = rgba.shape[:2]
+    if (rgba[..., 3] == 255).all():
+        pixels, color_type, channels = rgba[..., :3], 2, 3
+    else:
+        pixels, color_type, channels = rgba, 6, 4
+    raw = np.empty((height, width * channels + 1), dtype=np.uint8)
+    raw[:, 0] = 0  # filter type: None
+    raw[:, 1:] = pixels.reshape(height, width * channels)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        crc = zlib.crc32(tag + data) & 0xFFFFFFFF
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), compress_level))
+            + chunk(b"IEND", b""))
+
+
+def _fill_solid(region: np.ndarray, rgba: RGBA) -> None:
+    """Fill an (H, W, 4) buffer slice with one color, one 32-bit word per pixel"""
+    region.view(np.uint32).fill(np.array(rgba, dtype=np.uint8).view(np.uint32)[0])
+
+
+def _load_font(font: Any) -> Any:
+    """Resolve a Tk font spec such as ("Arial", 12, "bold") to a PIL font"""
+    family, size, bold = "Arial", 12, False
+    if isinstance(font, (tuple, list)):
+        if len(font) > 0:
+            family = str(font[0])
+        if len(font) > 1:
+            size = int(font[1])
+        bold = any("bold" in str(style) for style in font[2:])
+    elif isinstance(font, str) and font:
+        parts = font.split()
+        family = parts[0]
+        if len(parts) > 1 and parts[1].lstrip("-").isdigit():
+            size = int(parts[1])
+        bold = "bold" in parts[2:]
+
+    key = (family.lower(), size, bold)
+    if key in _font_cache:
+        return _font_cache[key]
+
+    from PIL import ImageFont
+
+    # Negative Tk sizes are already in pixels
+    pixel_size = max(1, round(-size if size < 0 else size * POINTS_TO_PIXELS))
+    loaded = None
+    candidates = _FONT_FILES.get(family.lower() + (" bold" if bold else ""), ())
+    for candidate in candidates:
+        try:
+            loaded = ImageFont.truetype(candidate, pixel_size)
+            break
+        except OSError:
+            continue
+    if loaded is None:
+        try:
+            loaded = ImageFont.load_default(pixel_size)
+        except TypeError:  # Pillow < 10.1 has a fixed-size default font
+            loaded = ImageFont.load_default()
+
+    _font_cache[key] = loaded
+    return loaded
+
+
+class RasterCanvas:
+    """A headless, tkinter-compatible canvas backed by an RGBA NumPy buffer"""
+
+    # Thin primitives (lines, outlines, arcs) larger than this many pixels are
+    # rasterized tile by tile, skipping tiles the stroke cannot reach.
+    DENSE_LIMIT = 64 * 64
+    TILE = 16
+
+    def __init__(self, width: int = 800, height: int = 600, bg: str = "white"):
+        self.width = width
+        self.height = height
+        self.bg = bg
+        self.buffer = np.empty((height, width, 4), dtype=np.uint8)
+        self._next_item = 1
+        self.delete("all")
+
+    def delete(self, *tags: Any) -> None:
+        """Clear the canvas (only the "all" tag is supported)"""
+        _fill_solid(self.buffer, parse_color(self.bg) or (255, 255, 255, 0))
+
+    def update(self) -> None:
+        """Drawing is immediate, so there is nothing to flush"""
+
+    # ------------------------------------------------------------------
+    # tkinter Canvas API
+    # ------------------------------------------------------------------
+
+    def create_oval(self, *coords: Any, fill: str = "", outline: str = "black",
+                    width: float = 1, **options: Any) -> int:
+        """Draw an ellipse inscribed in the bounding box x1, y1, x2, y2"""
+        x1, y1, x2, y2 = self._flatten(coords)
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        rx, ry = abs(x2 - x1) / 2, abs(y2 - y1) / 2
+
+        fill_rgba = parse_color(fill)
+        if fill_rgba:
+            self._fill_ellipse(cx, cy, rx, ry, fill_rgba)
+        outline_rgba = parse_color(outline)
+        if outline_rgba and width > 0:
+            self._stroke_arc(cx, cy, rx, ry, 0.0, 360.0, float(width), outline_rgba)
+        return self._new_item()
+
+    def create_line(self, *coords: Any, fill: str = "black", width: float = 1,
+                    dash: Optional[Sequence[int]] = None, **options: Any) -> int:
+        """Draw a polyline through the given coordinates"""
+        points = self._pairs(self._flatten(coords))
+        rgba = parse_color(fill)
+        if rgba and len(points) >= 2:
+            self._stroke_polyline(points, float(width), rgba, dash, closed=False)
+        return self._new_item()
+
+    def create_polygon(self, *coords: Any, fill: str = "black", outline: str = "",
+                       width: float = 1, **options: Any) -> int:
+        """Draw a closed polygon with optional fill and outline"""
+        points = self._pairs(self._flatten(coords))
+        fill_rgba = parse_color(fill)
+        if fill_rgba and len(points) >= 3:
+            self._fill_polygon(points, fill_rgba)
+        outline_rgba = parse_color(outline)
+        if outline_rgba and width > 0 and len(points) >= 2:
+            self._stroke_polyline(points, float(width), outline_rgba, None, closed=True)
+        return self._new_item()
+
+    def create_rectangle(self, *coords: Any, fill: str = "", outline: str = "black",
+                         width: float = 1, **options: Any) -> int:
+        """Draw an axis-aligned rectangle"""
+        x1, y1, x2, y2 = self._flatten(coords)
+        fill_rgba = parse_color(fill)
+        if fill_rgba:
+            self._fill_rect(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2), fill_rgba)
+        outline_rgba = parse_color(outline)
+        if outline_rgba and width > 0:
+            corners = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+            self._stroke_polyline(corners, float(width), outline_rgba, None, closed=True)
+        return self._new_item()
+
+    def create_arc(self, *coords: Any, start: float = 0, extent: float = 90,
+                   outline: str = "black", width: float = 1, style: str = "pieslice",
+                   fill: str = "", **options: Any) -> int:
+        """Draw the outline of an elliptical arc (angles in degrees, counter-clockwise)"""
+        x1, y1, x2, y2 = self._flatten(coords)
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        rx, ry = abs(x2 - x1) / 2, abs(y2 - y1) / 2
+        rgba = parse_color(outline)
+        if rgba and width > 0 and extent != 0:
+            self._stroke_arc(cx, cy, rx, ry, float(start), float(extent), float(width), rgba)
+            if style in ("pieslice", "chord"):
+                p1 = self._arc_point(cx, cy, rx, ry, start)
+                p2 = self._arc_point(cx, cy, rx, ry, start + extent)
+                edges = [p1, (cx, cy), p2] if style == "pieslice" else [p1, p2]
+                self._stroke_polyline(edges, float(width), rgba, None, closed=False)
+        return self._new_item()
+
+    def create_text(self, x: float, y: float, text: str = "", fill: str = "black",
+                    font: Any = None, anchor: str = "center", **options: Any) -> int:
+        """Draw anti-aliased text anchored at (x, y)"""
+        rgba = parse_color(fill)
+        if rgba and text:
+            self._draw_text(float(x), float(y), str(text), rgba, font, anchor)
+        return self._new_item()
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def to_png_bytes(self) -> bytes:
+        """Encode the current buffer as PNG"""
+        return encode_png(self.buffer)
+
+    def save_png(self, filename: str) -> None:
+        """Write the current buffer to a PNG file"""
+        with open(filename, "wb") as f:
+            f.write(self.to_png_bytes())
+
+    # ------------------------------------------------------------------
+    # Pixel selection and compositing
+    # ------------------------------------------------------------------
+
+    def _new_item(self) -> int:
+        item = self._next_item
+        self._next_item += 1
+        return item
+
+    @staticmethod
+    def _flatten(coords: Sequence[Any]) -> list:
+        flat = []
+        for value in coords:
+            if isinstance(value, (list, tuple)):
+                flat.extend(float(v) for v in value)
+            else:
+                flat.append(float(value))
+        return flat
+
+    @staticmethod
+    def _pairs(flat: list) -> list:
+        return [(flat[i], flat[i + 1]) for i in range(0, len(flat) - 1, 2)]
+
+    @staticmethod
+    def _arc_point(cx: float, cy: float, rx: float, ry: float,
+                   angle: float) -> Tuple[float, float]:
+        rad = math.radians(angle)
+        return cx + rx * math.cos(rad), cy - ry * math.sin(rad)
+
+    def _bounds(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                pad: float = 1.0) -> Optional[Tuple[int, int, int, int]]:
+        """Integer pixel bounds of a box, clipped to the canvas"""
+        x0 = max(0, int(math.floor(min_x - pad)))
+        y0 = max(0, int(math.floor(min_y - pad)))
+        x1 = min(self.width, int(math.ceil(max_x + pad)) + 1)
+        y1 = min(self.height, int(math.ceil(max_y + pad)) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return x0, y0, x1, y1
+
+    def _pixels(self, bounds: Tuple[int, int, int, int],
+                distance: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None,
+                reach: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Pixel coordinates to shade inside ``bounds``
+
+        Small areas are returned as a dense broadcastable grid. For large
+        areas, when a ``distance`` function to the primitive is given, only
+        the tiles within ``reach`` of it are returned as flat arrays.
+        """
+        x0, y0, x1, y1 = bounds
+        if distance is None or (x1 - x0) * (y1 - y0) <= self.DENSE_LIMIT:
+            xs = np.arange(x0, x1, dtype=np.float32)[None, :]
+            ys = np.arange(y0, y1, dtype=np.float32)[:, None]
+            return xs, ys
+
+        tile = self.TILE
+        tile_xs = np.arange(x0, x1, tile, dtype=np.float32)
+        tile_ys = np.arange(y0, y1, tile, dtype=np.float32)
+        centers_x = (tile_xs + (tile - 1) / 2)[None, :]
+        centers_y = (tile_ys + (tile - 1) / 2)[:, None]
+        near = distance(centers_x, centers_y) <= reach + tile * 0.75 + 1.0
+        ty, tx = np.nonzero(near)
+        if ty.size == 0:
+            empty = np.empty(0, dtype=np.float32)
+            return empty, empty
+
+        offsets = np.arange(tile, dtype=np.float32)
+        xs = (tile_xs[tx][:, None, None] + offsets[None, None, :])
+        ys = (tile_ys[ty][:, None, None] + offsets[None, :, None])
+        xs, ys = np.broadcast_arrays(xs, ys)
+        keep = (xs < x1) & (ys < y1)
+        return xs[keep], ys[keep]
+
+    def _shade(self, xs: np.ndarray, ys: np.ndarray, coverage: np.ndarray, rgba: RGBA) -> None:
+        """Composite a solid color over the pixels at (xs, ys) by coverage"""
+        coverage = np.broadcast_to(coverage, np.broadcast(xs, ys).shape)
+        if coverage.ndim == 2:
+            x0, y0 = int(xs[0, 0]), int(ys[0, 0])
+            h, w = coverage.shape
+            mask = coverage > 0.0
+            if not mask.any():
+                return
+            rows, cols = np.nonzero(mask)
+            alpha = coverage[rows, cols]
+            rows = rows + y0
+            cols = cols + x0
+        else:
+            mask = coverage > 0.0
+            alpha = coverage[mask]
+            if alpha.size == 0:
+                return
+            rows = ys[mask].astype(np.intp)
+            cols = xs[mask].astype(np.intp)
+        self._composite(rows, cols, np.minimum(alpha, 1.0), rgba)
+
+    def _composite(self, rows: np.ndarray, cols: np.ndarray, alpha: np.ndarray,
+                   rgba: RGBA) -> None:
+        alpha = (alpha * (rgba[3] / 255.0))[:, None]
+        pixels = self.buffer[rows, cols].astype(np.float32)
+        color = np.array(rgba, dtype=np.float32)
+        color[3] = 255.0
+        pixels += (color - pixels) * alpha
+        self.buffer[rows, cols] = np.rint(pixels).astype(np.uint8)
+
+    # ------------------------------------------------------------------
+    # Primitives
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _ellipse_distance(dx: np.ndarray, dy: np.ndarray, rx: float, ry: float) -> np.ndarray:
+        """Approximate signed distance to an ellipse outline"""
+        if rx == ry:
+            return np.sqrt(dx * dx + dy * dy) - rx
+        rx, ry = max(rx, 1e-6), max(ry, 1e-6)
+        k = np.sqrt((dx / rx) ** 2 + (dy / ry) ** 2)
+        return (k - 1.0) * min(rx, ry)
+
+    def _fill_rect(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                   rgba: RGBA) -> None:
+        x0 = max(0, int(round(min_x)))
+        y0 = max(0, int(round(min_y)))
+        x1 = min(self.width, int(round(max_x)) + 1)
+        y1 = min(self.height, int(round(max_y)) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        region = self.buffer[y0:y1, x0:x1]
+        if rgba[3] == 255:
+            _fill_solid(region, rgba)
+            return
+        alpha = rgba[3] / 255.0
+        pixels = region.astype(np.float32)
+        pixels += (np.array(rgba[:3] + (255,), dtype=np.float32) - pixels) * alpha
+        region[...] = np.rint(pixels).astype(np.uint8)
+
+    def _fill_ellipse(self, cx: float, cy: float, rx: float, ry: float, rgba: RGBA) -> None:
+        bounds = self._bounds(cx - rx, cy - ry, cx + rx, cy + ry)
+        if bounds is None:
+            return
+        xs, ys = self._pixels(bounds)
+        dist = self._ellipse_distance(xs - cx, ys - cy, rx, ry)
+        self._shade(xs, ys, 0.5 - dist, rgba)
+
+    def _stroke_arc(self, cx: float, cy: float, rx: float, ry: float, start: float,
+                    extent: float, width: float, rgba: RGBA) -> None:
+        half = width / 2
+        bounds = self._bounds(cx - rx - half, cy - ry - half, cx + rx + half, cy + ry + half)
+        if bounds is None:
+            return
+
+        def ring_distance(px: np.ndarray, py: np.ndarray) -> np.ndarray:
+            return np.abs(self._ellipse_distance(px - cx, py - cy, rx, ry))
+
+        xs, ys = self._pixels(bounds, ring_distance, half)
+        dx, dy = xs - cx, ys - cy
+        coverage = half + 0.5 - np.abs(self._ellipse_distance(dx, dy, rx, ry))
+
+        sweep = min(abs(extent), 360.0)
+        if sweep < 360.0:
+            # Canvas y grows downwards while Tk arc angles grow counter-clockwise
+            angles = np.degrees(np.arctan2(-dy, dx))
+            if extent >= 0:
+                relative = np.mod(angles - start, 360.0)
+            else:
+                relative = np.mod(start - angles, 360.0)
+            coverage = np.where(relative <= sweep, coverage, 0.0)
+        self._shade(xs, ys, coverage, rgba)
+
+    @staticmethod
+    def _segment_distance(xs: np.ndarray, ys: np.ndarray, p1: Tuple[float, float],
+                          p2: Tuple[float, float]) -> np.ndarray:
+        ax, ay = p1
+        ex, ey = p2[0] - ax, p2[1] - ay
+        length_sq = ex * ex + ey * ey
+        px, py = xs - ax, ys - ay
+        if length_sq == 0:
+            return np.sqrt(px * px + py * py)
+        t = np.clip((px * ex + py * ey) / length_sq, 0.0, 1.0)
+        qx, qy = px - t * ex, py - t * ey
+        return np.sqrt(qx * qx + qy * qy)
+
+    @staticmethod
+    def _segment_coverage(xs: np.ndarray, ys: np.ndarray, p1: Tuple[float, float],
+                          p2: Tuple[float, float], half: float,
+                          dash: Optional[Sequence[int]]) -> np.ndarray:
+        """Coverage of a butt-capped segment of the given half width"""
+        ax, ay = p1
+        dx, dy = p2[0] - ax, p2[1] - ay
+        length = math.hypot(dx, dy)
+        px, py = xs - ax, ys - ay
+        if length == 0:
+            return half + 0.5 - np.sqrt(px * px + py * py)
+
+        ux, uy = dx / length, dy / length
+        along = px * ux + py * uy
+        across = np.abs(px * uy - py * ux)
+        coverage = np.minimum(half + 0.5 - across, 1.0)
+        coverage = coverage * np.clip(along + 0.5, 0.0, 1.0) * np.clip(length - along + 0.5, 0.0, 1.0)
+
+        if dash:
+            pattern = [float(v) for v in dash]
+            if len(pattern) % 2:
+                pattern = pattern * 2
+            period = sum(pattern)
+            if period > 0:
+                phase = np.mod(along, period)
+                on = np.zeros(phase.shape, dtype=bool)
+                offset = 0.0
+                for i in range(0, len(pattern), 2):
+                    on |= (phase >= offset) & (phase < offset + pattern[i])
+                    offset += pattern[i] + pattern[i + 1]
+                coverage = np.where(on, coverage, 0.0)
+        return coverage
+
+    def _stroke_polyline(self, points: list, width: float, rgba: RGBA,
+                         dash: Optional[Sequence[int]], closed: bool) -> None:
+        half = max(width, 1.0) / 2
+        bounds = self._bounds(min(p[0] for p in points) - half, min(p[1] for p in points) - half,
+                              max(p[0] for p in points) + half, max(p[1] for p in points) + half)
+        if bounds is None:
+            return
+
+        segments = list(zip(points, points[1:]))
+        if closed and len(points) > 2:
+            segments.append((points[-1], points[0]))
+
+        def polyline_distance(px: np.ndarray, py: np.ndarray) -> np.ndarray:
+            result = None
+            for p1, p2 in segments:
+                d = self._segment_distance(px, py, p1, p2)
+                result = d if result is None else np.minimum(result, d)
+            return result
+
+        xs, ys = self._pixels(bounds, polyline_distance, half)
+        coverage = None
+        for p1, p2 in segments:
+            segment = self._segment_coverage(xs, ys, p1, p2, half, dash)
+            coverage = segment if coverage is None else np.maximum(coverage, segment)
+        self._shade(xs, ys, coverage, rgba)
+
+    def _fill_polygon(self, points: list, rgba: RGBA) -> None:
+        bounds = self._bounds(min(p[0] for p in points), min(p[1] for p in points),
+                              max(p[0] for p in points), max(p[1] for p in points))
+        if bounds is None:
+            return
+        xs, ys = self._pixels(bounds)
+
+        shape = np.broadcast(xs, ys).shape
+        inside = np.zeros(shape, dtype=bool)
+        nearest = np.full(shape, np.inf, dtype=np.float32)
+        for p1, p2 in zip(points, points[1:] + points[:1]):
+            (ax, ay), (bx, by) = p1, p2
+            # Even-odd crossing test
+            if ay != by:
+                crosses = (ay > ys) != (by > ys)
+                x_cross = ax + (ys - ay) * (bx - ax) / (by - ay)
+                inside ^= crosses & (xs < x_cross)
+            # Distance to the edge for anti-aliasing
+            np.minimum(nearest, self._segment_distance(xs, ys, p1, p2), out=nearest)
+
+        signed = np.where(inside, -nearest, nearest)
+        self._shade(xs, ys, 0.5 - signed, rgba)
+
+    def _draw_text(self, x: float, y: float, text: str, rgba: RGBA, font: Any,
+                   anchor: str) -> None:
+        try:
+            from PIL import Image, ImageDraw
+            pil_font = _load_font(font)
+        except ImportError:
+            return
+
+        pil_anchor = _TEXT_ANCHORS.get(anchor, "mm")
+        try:
+            left, top, right, bottom = pil_font.getbbox(text, anchor=pil_anchor)
+        except (TypeError, ValueError):  # bitmap fonts do not support anchors
+            pil_anchor = None
+            left, top, right, bottom = pil_font.getbbox(text)
+            left, right = left - (right - left) / 2, right - (right - left) / 2
+            top, bottom = top - (bottom - top) / 2, bottom - (bottom - top) / 2
+        left, top = int(math.floor(left)), int(math.floor(top))
+        w, h = int(math.ceil(right)) - left, int(math.ceil(bottom)) - top
+        if w <= 0 or h <= 0:
+            return
+
+        mask_image = Image.new("L", (w, h), 0)
+        draw = ImageDraw.Draw(mask_image)
+        if pil_anchor:
+            draw.text((-left, -top), text, fill=255, font=pil_font, anchor=pil_anchor)
+        else:
+            draw.text((0, 0), text, fill=255, font=pil_font)
+        mask = np.asarray(mask_image, dtype=np.float32) / 255.0
+
+        # Clip the glyph mask against the canvas
+        dest_x, dest_y = int(round(x)) + left, int(round(y)) + top
+        sx0, sy0 = max(0, -dest_x), max(0, -dest_y)
+        sx1 = min(w, self.width - dest_x)
+        sy1 = min(h, self.height - dest_y)
+        if sx0 >= sx1 or sy0 >= sy1:
+            return
+        xs = np.arange(dest_x + sx0, dest_x + sx1, dtype=np.float32)[None, :]
+        ys = np.arange(dest_y + sy0, dest_y + sy1, dtype=np.float32)[:, None]
+        self._shade(xs, ys, mask[sy0:sy1, sx0:sx1], rgba)
@@ -2,11 +2,12 @@
 Shape rendering utilities for shapix
 """
 
-import tkinter as tk
 import math
-from typing import TYPE_CHECKING, Tuple, Callable
+from typing import TYPE_CHECKING, Any, Callable, Container, Dict, Optional, Tuple
 
 if TYPE_CHECKING:
+    from ..core.base import GeometricShape
+    from ..core.scene import Scene
     from ..shapes.triangle import Triangle
     from ..shapes.circle import Circle
     from ..shapes.line import Line
@@ -15,11 +16,49 @@ if TYPE_CHECKING:
 
 
 class ShapeRenderer:
-    """Handles rendering of shapes on tkinter canvas"""
+    """Handles rendering of shapes on a tkinter canvas or any canvas with the same API"""
     
-    def __init__(self, canvas: tk.Canvas, world_to_canvas_func: Callable[[float, float], Tuple[int, int]]):
+    def __init__(self, canvas: Any, world_to_canvas_func: Callable[[float, float], Tuple[int, int]]):
         self.canvas = canvas
         self.world_to_canvas = world_to_canvas_func
+        self._draw_methods: Dict[type, Optional[str]] = {}
+    
+    def draw_scene(self, scene: 'Scene', handles: Optional[Container[int]] = None) -> None:
+        """Draw the visible shapes of a scene in layer order
+        
+        If ``handles`` is given, only shapes whose handle it contains are drawn.
+        """
+        for shape in scene.by_layer():
+            if shape.visible and (handles is None or shape.handle in handles):
+                self.draw_shape(shape)
+    
+    def draw_shape(self, shape: 'GeometricShape') -> None:
+        """Draw a shape with the draw_* method for its class"""
+        method_name = self._draw_methods.get(shape.__class__, "")
+        if method_name == "":
+            method_name = self._draw_method_name(shape.__class__.__name__)
+            self._draw_methods[shape.__class__] = method_name
+        if method_name:
+            getattr(self, method_name)(shape)
+    
+    def _draw_method_name(self, shape_type: str) -> Optional[str]:
+        """Find the draw_* method for a shape class name"""
+        # Use dynamic method lookup first
+        method_name = f'draw_{shape_type.lower()}'
+        if hasattr(self, method_name):
+            return method_name
+        # Handle specific shape types
+        elif 'PointShape' in shape_type:
+            return 'draw_point'
+        elif 'Triangle' in shape_type:
+            return 'draw_triangle'
+        elif 'Circle' in shape_type:
+            return 'draw_circle'
+        elif 'Line' in shape_type:
+            return 'draw_line'
+        elif 'Angle' in shape_type:
+            return 'draw_angle'
+        return None
     
     def draw_point(self, shape: 'PointShape') -> None:
         """Draw point with configurable label positioning"""
@@ -167,8 +206,7 @@ class ShapeRenderer:
                 # Draw vertex label
                 if shape.vertex_labels and vertex.label:
                     # Position label outside triangle using centroid
-                    centroid_x = (shape.vertex_a.x + shape.vertex_b.x + shape.vertex_c.x) / 3
-                    centroid_y = (shape.vertex_a.y + shape.vertex_b.y + shape.vertex_c.y) / 3
+                    centroid_x, centroid_y = shape.get_measures().centroid
                     
                     # Calculate outward direction
                     dx = vertex.x - centroid_x
@@ -309,8 +347,10 @@ class ShapeRenderer:
             (shape.vertex_b, shape.vertex_a, shape.vertex_c, shape.angle_b_label),
             (shape.vertex_c, shape.vertex_a, shape.vertex_b, shape.angle_c_label)
         ]
+        # All three angles come from one cached computation
+        angle_measures = shape.get_measures().angles
         
-        for vertex, p1, p2, label in angles_data:
+        for (vertex, p1, p2, label), angle_measure in zip(angles_data, angle_measures):
             vertex_x, vertex_y = self.world_to_canvas(vertex.x, vertex.y)
             
             # Calculate bisector direction
@@ -379,12 +419,6 @@ class ShapeRenderer:
             if shape.angle_labels and label:
                 text_parts.append(label)
             if shape.show_angle_measures:
-                if vertex == shape.vertex_a:
-                    angle_measure = shape.get_angle_measure('a')
-                elif vertex == shape.vertex_b:
-                    angle_measure = shape.get_angle_measure('b')
-                else:
-                    angle_measure = shape.get_angle_measure('c')
                 text_parts.append(f"{angle_measure:.0f}°")
             
             if text_parts:
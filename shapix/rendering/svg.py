@@ -0,0 +1,215 @@
+"""
+Streaming SVG canvas for shapix
+
+SVGCanvas implements the same subset of the tkinter Canvas API as
+RasterCanvas, but writes each item as an SVG element to a text stream as
+soon as it is created. It has no dependency on tkinter or NumPy.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, TextIO, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+_TEXT_ANCHORS = {
+    "center": ("middle", "central"), "n": ("middle", "text-before-edge"),
+    "s": ("middle", "text-after-edge"), "e": ("end", "central"), "w": ("start", "central"),
+    "ne": ("end", "text-before-edge"), "nw": ("start", "text-before-edge"),
+    "se": ("end", "text-after-edge"), "sw": ("start", "text-after-edge"),
+}
+
+
+def _num(value: float) -> str:
+    """Format a coordinate compactly"""
+    if type(value) is int:
+        return str(value)
+    if value.is_integer():
+        return str(int(value))
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _paint(color: Optional[str]) -> str:
+    """A color as a quoted attribute value"""
+    return quoteattr(color) if color else '"none"'
+
+
+class SVGCanvas:
+    """A tkinter-compatible canvas that streams SVG elements to a text file"""
+
+    def __init__(self, stream: TextIO, width: int = 800, height: int = 600, bg: str = "white"):
+        self.stream = stream
+        self.width = width
+        self.height = height
+        self.bg = bg
+        self._next_item = 1
+        self._closed = False
+        self._stroke_cache: Dict[Tuple[Any, ...], str] = {}
+        stream.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">\n'
+        )
+
+    def delete(self, *tags: Any) -> None:
+        """Streamed elements cannot be removed, so this is a no-op"""
+
+    def update(self) -> None:
+        """Elements are written immediately, so there is nothing to flush"""
+
+    def close(self) -> None:
+        """Write the closing tag; the stream itself is left open"""
+        if not self._closed:
+            self.stream.write("</svg>\n")
+            self._closed = True
+
+    # ------------------------------------------------------------------
+    # tkinter Canvas API
+    # ------------------------------------------------------------------
+
+    def create_oval(self, *coords: Any, fill: str = "", outline: str = "black",
+                    width: float = 1, **options: Any) -> int:
+        """Write an ellipse inscribed in the bounding box x1, y1, x2, y2"""
+        x1, y1, x2, y2 = self._flatten(coords)
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        rx, ry = abs(x2 - x1) / 2, abs(y2 - y1) / 2
+        stroke = self._stroke(outline, width)
+        if rx == ry:
+            self.stream.write(
+                f'<circle cx="{_num(cx)}" cy="{_num(cy)}" r="{_num(rx)}" '
+                f'fill={_paint(fill)}{stroke}/>\n'
+            )
+        else:
+            self.stream.write(
+                f'<ellipse cx="{_num(cx)}" cy="{_num(cy)}" rx="{_num(rx)}" ry="{_num(ry)}" '
+                f'fill={_paint(fill)}{stroke}/>\n'
+            )
+        return self._new_item()
+
+    def create_line(self, *coords: Any, fill: str = "black", width: float = 1,
+                    dash: Optional[Sequence[int]] = None, **options: Any) -> int:
+        """Write a line or polyline through the given coordinates"""
+        flat = self._flatten(coords)
+        stroke = self._stroke(fill, width, dash)
+        if len(flat) == 4:
+            x1, y1, x2, y2 = flat
+            self.stream.write(
+                f'<line x1="{_num(x1)}" y1="{_num(y1)}" x2="{_num(x2)}" y2="{_num(y2)}"{stroke}/>\n'
+            )
+        else:
+            self.stream.write(f'<polyline points="{self._points(flat)}" fill="none"{stroke}/>\n')
+        return self._new_item()
+
+    def create_polygon(self, *coords: Any, fill: str = "black", outline: str = "",
+                       width: float = 1, **options: Any) -> int:
+        """Write a closed polygon"""
+        flat = self._flatten(coords)
+        stroke = self._stroke(outline, width)
+        self.stream.write(f'<polygon points="{self._points(flat)}" fill={_paint(fill)}{stroke}/>\n')
+        return self._new_item()
+
+    def create_rectangle(self, *coords: Any, fill: str = "", outline: str = "black",
+                         width: float = 1, **options: Any) -> int:
+        """Write an axis-aligned rectangle"""
+        x1, y1, x2, y2 = self._flatten(coords)
+        stroke = self._stroke(outline, width)
+        self.stream.write(
+            f'<rect x="{_num(min(x1, x2))}" y="{_num(min(y1, y2))}" '
+            f'width="{_num(abs(x2 - x1))}" height="{_num(abs(y2 - y1))}" '
+            f'fill={_paint(fill)}{stroke}/>\n'
+        )
+        return self._new_item()
+
+    def create_arc(self, *coords: Any, start: float = 0, extent: float = 90,
+                   outline: str = "black", width: float = 1, style: str = "pieslice",
+                   fill: str = "", **options: Any) -> int:
+        """Write an elliptical arc (angles in degrees, counter-clockwise)"""
+        x1, y1, x2, y2 = self._flatten(coords)
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        rx, ry = abs(x2 - x1) / 2, abs(y2 - y1) / 2
+        start, extent = float(start), max(-359.99, min(359.99, float(extent)))
+
+        sx, sy = self._arc_point(cx, cy, rx, ry, start)
+        ex, ey = self._arc_point(cx, cy, rx, ry, start + extent)
+        large = 1 if abs(extent) > 180 else 0
+        # Tk angles grow counter-clockwise on screen, which is SVG's negative sweep
+        sweep = 0 if extent > 0 else 1
+        path = (f"M{_num(sx)} {_num(sy)} A{_num(rx)} {_num(ry)} 0 {large} {sweep} "
+                f"{_num(ex)} {_num(ey)}")
+        if style == "pieslice":
+            path += f" L{_num(cx)} {_num(cy)} Z"
+        elif style == "chord":
+            path += " Z"
+        area_fill = fill if style != "arc" else ""
+        self.stream.write(
+            f'<path d="{path}" fill={_paint(area_fill)}{self._stroke(outline, width)}/>\n'
+        )
+        return self._new_item()
+
+    def create_text(self, x: float, y: float, text: str = "", fill: str = "black",
+                    font: Any = None, anchor: str = "center", **options: Any) -> int:
+        """Write a text element anchored at (x, y)"""
+        family, size, weight = self._font(font)
+        text_anchor, baseline = _TEXT_ANCHORS.get(anchor, _TEXT_ANCHORS["center"])
+        weight_attr = ' font-weight="bold"' if weight else ""
+        self.stream.write(
+            f'<text x="{_num(x)}" y="{_num(y)}" fill={_paint(fill)} '
+            f'font-family={quoteattr(family)} font-size="{size}"{weight_attr} '
+            f'text-anchor="{text_anchor}" dominant-baseline="{baseline}">'
+            f'{escape(str(text))}</text>\n'
+        )
+        return self._new_item()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _new_item(self) -> int:
+        item = self._next_item
+        self._next_item += 1
+        return item
+
+    @staticmethod
+    def _flatten(coords: Sequence[Any]) -> List[float]:
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        return [v if type(v) is int else float(v) for v in coords]
+
+    @staticmethod
+    def _points(flat: List[float]) -> str:
+        return " ".join(f"{_num(flat[i])},{_num(flat[i + 1])}" for i in range(0, len(flat) - 1, 2))
+
+    @staticmethod
+    def _arc_point(cx: float, cy: float, rx: float, ry: float,
+                   angle: float) -> Tuple[float, float]:
+        rad = math.radians(angle)
+        return cx + rx * math.cos(rad), cy - ry * math.sin(rad)
+
+    def _stroke(self, color: Optional[str], width: float,
+                dash: Optional[Sequence[int]] = None) -> str:
+        key = (color, width, tuple(dash) if dash else None)
+        attrs = self._stroke_cache.get(key)
+        if attrs is None:
+            if not color or width <= 0:
+                attrs = ' stroke="none"'
+            else:
+                attrs = f' stroke={quoteattr(color)} stroke-width="{_num(float(width))}"'
+                if dash:
+                    attrs += f' stroke-dasharray="{",".join(str(v) for v in dash)}"'
+            self._stroke_cache[key] = attrs
+        return attrs
+
+    @staticmethod
+    def _font(font: Any) -> Tuple[str, int, bool]:
+        """Split a Tk font spec into family, size and bold flag"""
+        family, size, bold = "Arial", 12, False
+        if isinstance(font, (tuple, list)):
+            if len(font) > 0:
+                family = str(font[0])
+            if len(font) > 1:
+                size = abs(int(font[1]))
+            bold = any("bold" in str(style) for style in font[2:])
+        elif isinstance(font, str) and font:
+            parts = font.split()
+            family = parts[0]
+            if len(parts) > 1 and parts[1].lstrip("-").isdigit():
+                size = abs(int(parts[1]))
+            bold = "bold" in parts[2:]
+        return family, size, bold
@@ -0,0 +1,56 @@
+"""
+Tcl script generation for the tkinter canvas backend
+
+Creating canvas items one ``create_*`` call at a time costs a Python to Tcl
+round trip per item. ``build_tcl_script`` turns a whole DisplayList into a
+single Tcl script, so the canvas can be filled with one ``tk.eval`` call.
+"""
+
+import re
+from typing import Any, List
+
+from .display_list import ARC, TEXT, DisplayList
+
+_ITEM_TYPES = ("oval", "line", "polygon", "rectangle", "arc", "text")
+_TCL_SPECIAL = re.compile(r'([\\{}\[\]$";\s])')
+_TCL_CONTROL = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def tcl_quote(value: Any) -> str:
+    """Quote a Python value as a single Tcl word (tuples become Tcl lists)"""
+    if isinstance(value, (tuple, list)):
+        value = " ".join(tcl_quote(item) for item in value)
+    elif isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value)
+    if not text:
+        return "{}"
+    return _TCL_SPECIAL.sub(
+        lambda match: _TCL_CONTROL.get(match.group(1), "\\" + match.group(1)), text
+    )
+
+
+def build_tcl_script(display_list: DisplayList, widget: str) -> str:
+    """Return a Tcl script that draws ``display_list`` on the canvas ``widget``"""
+    options = [
+        "".join(f" -{name} {tcl_quote(value)}" for name, value in style.items())
+        for style in display_list.style_table
+    ]
+    prefix = [f"{widget} create {item_type} " for item_type in _ITEM_TYPES]
+
+    lines: List[str] = []
+    append = lines.append
+    coords = display_list.coords
+    texts = iter(display_list.texts)
+    start = 0
+    for op, end, style in zip(display_list.ops, display_list.ends, display_list.styles):
+        if op == ARC:
+            append(f"{prefix[op]}{' '.join(map(repr, coords[start:start + 4]))}"
+                   f" -start {coords[start + 4]!r} -extent {coords[start + 5]!r}{options[style]}")
+        elif op == TEXT:
+            append(f"{prefix[op]}{coords[start]!r} {coords[start + 1]!r}"
+                   f" -text {tcl_quote(next(texts))}{options[style]}")
+        else:
+            append(f"{prefix[op]}{' '.join(map(repr, coords[start:end]))}{options[style]}")
+        start = end
+    return "\n".join(lines)
@@ -3,22 +3,35 @@ Angle shape implementation for shapix
 """
 
 import math
-from typing import List, Tuple, Any
-from ..core.base import GeometricShape, Point
+from typing import List, NamedTuple, Tuple, Any
+from ..core.base import Flag, GeometricShape, Point, point_ref
+
+
+class AngleMeasures(NamedTuple):
+    """Derived quantities of an angle (``measure`` in degrees)"""
+    measure: float
+    bounds: Tuple[float, float, float, float]
 
 
 class Angle(GeometricShape):
     """An angle defined by three points: point1-vertex-point2"""
     
+    __slots__ = ('_point1', '_vertex', '_point2')
+    
+    point1 = point_ref('point1')
+    vertex = point_ref('vertex')
+    point2 = point_ref('point2')
+    
+    label = Flag("")
+    show_arc = Flag(True)
+    arc_radius = Flag(30, changed='_arc_radius_changed')
+    
     def __init__(self, point1: Point = None, vertex: Point = None, point2: Point = None, name: str = ""):
         super().__init__(name)
-        self.point1 = point1 or Point(-50, 0)
-        self.vertex = vertex or Point(0, 0, "O")
-        self.point2 = point2 or Point(50, 50)
-        self.label = ""
-        self.show_arc = True
-        self.arc_radius = 30
-        self.show_measure = True
+        self._point1 = point1 or Point(-50, 0)
+        self._vertex = vertex or Point(0, 0, "O")
+        self._point2 = point2 or Point(50, 50)
+        self._register_points()
     
     def get_points(self) -> List[Point]:
         """Get the three points that define the angle"""
@@ -29,11 +42,17 @@ class Angle(GeometricShape):
         if len(points) >= 3:
             self.point1, self.vertex, self.point2 = points[0], points[1], points[2]
     
-    def get_measure(self) -> float:
-        """Get the angle measure in degrees"""
+    def _arc_radius_changed(self, old_radius: float) -> None:
+        self._geometry_changed()  # The arc radius pads the bounds
+    
+    def _compute_measures(self) -> AngleMeasures:
+        p1x, p1y = self.point1.x, self.point1.y
+        vx, vy = self.vertex.x, self.vertex.y
+        p2x, p2y = self.point2.x, self.point2.y
+        
         # Calculate vectors from vertex to each point
-        v1x, v1y = self.point1.x - self.vertex.x, self.point1.y - self.vertex.y
-        v2x, v2y = self.point2.x - self.vertex.x, self.point2.y - self.vertex.y
+        v1x, v1y = p1x - vx, p1y - vy
+        v2x, v2y = p2x - vx, p2y - vy
         
         # Calculate dot product and magnitudes
         dot_product = v1x * v2x + v1y * v2y
@@ -41,14 +60,24 @@ class Angle(GeometricShape):
         mag2 = math.sqrt(v2x * v2x + v2y * v2y)
         
         if mag1 == 0 or mag2 == 0:
-            return 0
+            measure = 0
+        else:
+            # Calculate angle using dot product
+            cos_angle = dot_product / (mag1 * mag2)
+            cos_angle = max(-1, min(1, cos_angle))  # Clamp to valid range
+            measure = math.degrees(math.acos(cos_angle))
         
-        # Calculate angle using dot product
-        cos_angle = dot_product / (mag1 * mag2)
-        cos_angle = max(-1, min(1, cos_angle))  # Clamp to valid range
-        angle_rad = math.acos(cos_angle)
-        
-        return math.degrees(angle_rad)
+        # Expand bounds to include arc radius
+        padding = self.arc_radius
+        return AngleMeasures(
+            measure=measure,
+            bounds=(min(p1x, vx, p2x) - padding, min(p1y, vy, p2y) - padding,
+                    max(p1x, vx, p2x) + padding, max(p1y, vy, p2y) + padding),
+        )
+    
+    def get_measure(self) -> float:
+        """Get the angle measure in degrees"""
+        return self.get_measures().measure
     
     def set_measure(self, degrees: float) -> None:
         """Set the angle measure by rotating point2"""
@@ -125,15 +154,7 @@ class Angle(GeometricShape):
     
     def get_bounds(self) -> Tuple[float, float, float, float]:
         """Get bounding box of the angle"""
-        all_x = [self.point1.x, self.vertex.x, self.point2.x]
-        all_y = [self.point1.y, self.vertex.y, self.point2.y]
-        
-        # Expand bounds to include arc radius
-        padding = self.arc_radius
-        return (
-            min(all_x) - padding, min(all_y) - padding,
-            max(all_x) + padding, max(all_y) + padding
-        )
+        return self.get_measures().bounds
     
     def contains_point(self, point: Point) -> bool:
         """Check if point is near the angle rays or arc"""
@@ -174,5 +195,6 @@ class Angle(GeometricShape):
         new_angle.layer = self.layer
         new_angle.font_size = self.font_size
         new_angle.text_color = self.text_color
-        new_angle._properties = self._properties.copy()
+        if self._extra:
+            new_angle._properties = self._extra.copy()
         return new_angle
\ No newline at end of file
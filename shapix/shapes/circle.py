@@ -3,33 +3,63 @@ Circle shape implementation for shapix
 """
 
 import math
-from typing import List, Tuple, Any
-from ..core.base import GeometricShape, Point
+from operator import attrgetter
+from typing import List, NamedTuple, Tuple, Any
+from ..core.base import Flag, GeometricShape, Point, point_ref
+
+
+class CircleMeasures(NamedTuple):
+    """Derived quantities of a circle"""
+    area: float
+    circumference: float
+    diameter: float
+    bounds: Tuple[float, float, float, float]
 
 
 class Circle(GeometricShape):
     """A circle with center and radius"""
     
+    __slots__ = ('_center', '_radius')
+    
+    center = point_ref('center')
+    
+    label = Flag("")
+    show_center = Flag(True)
+    show_radius_line = Flag(False)
+    show_diameter = Flag(False)
+    
     def __init__(self, center: Point = None, radius: float = 50, name: str = ""):
         super().__init__(name)
-        self.center = center or Point(0, 0, "O")
-        self.radius = max(1, radius)
-        self.label = ""
-        self.show_center = True
-        self.show_radius_line = False
-        self.show_diameter = False
+        self._center = center or Point(0, 0, "O")
+        self._radius = max(1, radius)
+        self._register_points()
+    
+    def _set_radius(self, radius: float) -> None:
+        self._radius = radius
+        self._geometry_changed()
+    
+    radius = property(attrgetter('_radius'), _set_radius, doc="Radius of the circle")
+    
+    def _compute_measures(self) -> CircleMeasures:
+        cx, cy, radius = self.center.x, self.center.y, self._radius
+        return CircleMeasures(
+            area=math.pi * radius * radius,
+            circumference=2 * math.pi * radius,
+            diameter=radius * 2,
+            bounds=(cx - radius, cy - radius, cx + radius, cy + radius),
+        )
     
     def get_area(self) -> float:
         """Calculate the area of the circle"""
-        return math.pi * self.radius * self.radius
+        return self.get_measures().area
     
     def get_circumference(self) -> float:
         """Calculate the circumference of the circle"""
-        return 2 * math.pi * self.radius
+        return self.get_measures().circumference
     
     def get_diameter(self) -> float:
         """Get the diameter of the circle"""
-        return self.radius * 2
+        return self.get_measures().diameter
     
     def set_diameter(self, diameter: float) -> None:
         """Set the diameter (updates radius)"""
@@ -46,12 +76,7 @@ class Circle(GeometricShape):
     
     def get_bounds(self) -> Tuple[float, float, float, float]:
         """Get bounding box of the circle"""
-        return (
-            self.center.x - self.radius, 
-            self.center.y - self.radius,
-            self.center.x + self.radius, 
-            self.center.y + self.radius
-        )
+        return self.get_measures().bounds
     
     def contains_point(self, point: Point) -> bool:
         """Check if point is inside the circle"""
@@ -124,5 +149,6 @@ class Circle(GeometricShape):
         new_circle.layer = self.layer
         new_circle.font_size = self.font_size
         new_circle.text_color = self.text_color
-        new_circle._properties = self._properties.copy()
+        if self._extra:
+            new_circle._properties = self._extra.copy()
         return new_circle
\ No newline at end of file
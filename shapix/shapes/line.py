@@ -3,20 +3,34 @@ Line and segment implementation for shapix
 """
 
 import math
-from typing import List, Tuple, Any
-from ..core.base import GeometricShape, Point
+from typing import List, NamedTuple, Tuple, Any
+from ..core.base import Flag, GeometricShape, Point, point_ref
+
+
+class LineMeasures(NamedTuple):
+    """Derived quantities of a line segment"""
+    length: float
+    angle: float
+    midpoint: Tuple[float, float]
+    bounds: Tuple[float, float, float, float]
 
 
 class Line(GeometricShape):
     """A line segment between two points"""
     
+    __slots__ = ('_start', '_end')
+    
+    start = point_ref('start')
+    end = point_ref('end')
+    
+    label = Flag("")
+    show_endpoints = Flag(True)
+    
     def __init__(self, start: Point = None, end: Point = None, name: str = ""):
         super().__init__(name)
-        self.start = start or Point(0, 0)
-        self.end = end or Point(100, 0)
-        self.label = ""
-        self.show_length = False
-        self.show_endpoints = True
+        self._start = start or Point(0, 0)
+        self._end = end or Point(100, 0)
+        self._register_points()
     
     def get_points(self) -> List[Point]:
         """Get the start and end points of the line"""
@@ -27,13 +41,22 @@ class Line(GeometricShape):
         if len(points) >= 2:
             self.start, self.end = points[0], points[1]
     
+    def _compute_measures(self) -> LineMeasures:
+        sx, sy, ex, ey = self.start.x, self.start.y, self.end.x, self.end.y
+        return LineMeasures(
+            length=math.sqrt((sx - ex)**2 + (sy - ey)**2),
+            angle=math.degrees(math.atan2(ey - sy, ex - sx)),
+            midpoint=((sx + ex) / 2, (sy + ey) / 2),
+            bounds=(min(sx, ex), min(sy, ey), max(sx, ex), max(sy, ey)),
+        )
+    
     def get_length(self) -> float:
         """Calculate the length of the line segment"""
-        return self.start.distance_to(self.end)
+        return self.get_measures().length
     
     def get_angle(self) -> float:
         """Get the angle of the line in degrees"""
-        return self.start.angle_to(self.end)
+        return self.get_measures().angle
     
     def set_length(self, length: float) -> None:
         """Set the length while maintaining the angle"""
@@ -52,19 +75,11 @@ class Line(GeometricShape):
     
     def get_midpoint(self) -> Point:
         """Get the midpoint of the line segment"""
-        return Point(
-            (self.start.x + self.end.x) / 2,
-            (self.start.y + self.end.y) / 2
-        )
+        return Point(*self.get_measures().midpoint)
     
     def get_bounds(self) -> Tuple[float, float, float, float]:
         """Get bounding box of the line"""
-        return (
-            min(self.start.x, self.end.x), 
-            min(self.start.y, self.end.y),
-            max(self.start.x, self.end.x), 
-            max(self.start.y, self.end.y)
-        )
+        return self.get_measures().bounds
     
     def contains_point(self, point: Point) -> bool:
         """Check if point is close to the line segment"""
@@ -146,5 +161,6 @@ class Line(GeometricShape):
         new_line.layer = self.layer
         new_line.font_size = self.font_size
         new_line.text_color = self.text_color
-        new_line._properties = self._properties.copy()
+        if self._extra:
+            new_line._properties = self._extra.copy()
         return new_line
\ No newline at end of file
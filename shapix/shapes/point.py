@@ -2,17 +2,28 @@
 Point shape implementation for shapix
 """
 
-from typing import List, Tuple, Any
-from ..core.base import GeometricShape, Point
+from typing import List, NamedTuple, Tuple, Any
+from ..core.base import Flag, GeometricShape, Point, point_ref
+
+
+class PointMeasures(NamedTuple):
+    """Derived quantities of a point shape"""
+    bounds: Tuple[float, float, float, float]
 
 
 class PointShape(GeometricShape):
     """A drawable point shape with label support"""
     
+    __slots__ = ('_point',)
+    
+    point = point_ref('point')
+    
+    point_size = Flag(4, changed='_point_size_changed')
+    
     def __init__(self, point: Point = None, name: str = ""):
         super().__init__(name)
-        self.point = point or Point(0, 0, "P")
-        self.point_size = 4
+        self._point = point or Point(0, 0, "P")
+        self._register_points()
         
     def get_points(self) -> List[Point]:
         """Get the point that defines this shape"""
@@ -23,14 +34,16 @@ class PointShape(GeometricShape):
         if points:
             self.point = points[0]
     
+    def _point_size_changed(self, old_size: float) -> None:
+        self._geometry_changed()
+    
+    def _compute_measures(self) -> PointMeasures:
+        x, y, size = self.point.x, self.point.y, self.point_size
+        return PointMeasures(bounds=(x - size, y - size, x + size, y + size))
+    
     def get_bounds(self) -> Tuple[float, float, float, float]:
         """Get bounding box around the point"""
-        return (
-            self.point.x - self.point_size, 
-            self.point.y - self.point_size,
-            self.point.x + self.point_size, 
-            self.point.y + self.point_size
-        )
+        return self.get_measures().bounds
     
     def contains_point(self, point: Point) -> bool:
         """Check if the given point is within the point's selection area"""
@@ -83,5 +96,6 @@ class PointShape(GeometricShape):
         new_shape.layer = self.layer
         new_shape.font_size = self.font_size
         new_shape.text_color = self.text_color
-        new_shape._properties = self._properties.copy()
+        if self._extra:
+            new_shape._properties = self._extra.copy()
         return new_shape
\ No newline at end of file
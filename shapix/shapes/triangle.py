@@ -3,32 +3,69 @@ Triangle shape implementation for shapix
 """
 
 import math
-from typing import List, Tuple, Any
-from ..core.base import GeometricShape, Point
+from typing import List, NamedTuple, Tuple, Any
+from ..core.base import Flag, GeometricShape, Point, point_ref
+
+_SIDES = {'a': 0, 'b': 1, 'c': 2}
+
+
+def _vertex_angle(v1x: float, v1y: float, v2x: float, v2y: float) -> float:
+    """Angle in degrees between two vectors from a vertex (0 if either is zero)"""
+    dot_product = v1x * v2x + v1y * v2y
+    mag1 = math.sqrt(v1x * v1x + v1y * v1y)
+    mag2 = math.sqrt(v2x * v2x + v2y * v2y)
+    
+    if mag1 == 0 or mag2 == 0:
+        return 0
+    
+    cos_angle = dot_product / (mag1 * mag2)
+    cos_angle = max(-1, min(1, cos_angle))
+    return math.degrees(math.acos(cos_angle))
+
+
+class TriangleMeasures(NamedTuple):
+    """Derived quantities of a triangle
+    
+    ``sides`` are the lengths opposite A, B and C (BC, AC, AB); ``angles``
+    are the angles at A, B and C in degrees.
+    """
+    sides: Tuple[float, float, float]
+    angles: Tuple[float, float, float]
+    area: float
+    perimeter: float
+    centroid: Tuple[float, float]
+    bounds: Tuple[float, float, float, float]
 
 
 class Triangle(GeometricShape):
     """A triangle defined by three vertices"""
     
+    __slots__ = ('_vertex_a', '_vertex_b', '_vertex_c')
+    
+    vertex_a = point_ref('vertex_a')
+    vertex_b = point_ref('vertex_b')
+    vertex_c = point_ref('vertex_c')
+    
+    # Display properties
+    show_vertices = Flag(True)
+    show_side_labels = Flag(False)
+    show_angles = Flag(False)
+    show_angle_measures = Flag(False)
+    
+    # Labels
+    side_a_label = Flag("")  # BC
+    side_b_label = Flag("")  # AC
+    side_c_label = Flag("")  # AB
+    angle_a_label = Flag("")  # at A
+    angle_b_label = Flag("")  # at B
+    angle_c_label = Flag("")  # at C
+    
     def __init__(self, vertex_a: Point = None, vertex_b: Point = None, vertex_c: Point = None, name: str = ""):
         super().__init__(name)
-        self.vertex_a = vertex_a or Point(-50, 50, "A")
-        self.vertex_b = vertex_b or Point(50, 50, "B")
-        self.vertex_c = vertex_c or Point(0, -50, "C")
-        
-        # Display properties
-        self.show_vertices = True
-        self.show_side_labels = False
-        self.show_angles = False
-        self.show_angle_measures = False
-        
-        # Labels
-        self.side_a_label = ""  # BC
-        self.side_b_label = ""  # AC
-        self.side_c_label = ""  # AB
-        self.angle_a_label = ""  # at A
-        self.angle_b_label = ""  # at B
-        self.angle_c_label = ""  # at C
+        self._vertex_a = vertex_a or Point(-50, 50, "A")
+        self._vertex_b = vertex_b or Point(50, 50, "B")
+        self._vertex_c = vertex_c or Point(0, -50, "C")
+        self._register_points()
     
     def get_points(self) -> List[Point]:
         """Get the three vertices of the triangle"""
@@ -39,72 +76,63 @@ class Triangle(GeometricShape):
         if len(points) >= 3:
             self.vertex_a, self.vertex_b, self.vertex_c = points[0], points[1], points[2]
     
+    def _compute_measures(self) -> TriangleMeasures:
+        """Compute every derived quantity from one read of the vertices"""
+        ax, ay = self.vertex_a.x, self.vertex_a.y
+        bx, by = self.vertex_b.x, self.vertex_b.y
+        cx, cy = self.vertex_c.x, self.vertex_c.y
+        
+        # Same expressions as Point.distance_to, so results are unchanged
+        side_a = math.sqrt((bx - cx)**2 + (by - cy)**2)
+        side_b = math.sqrt((ax - cx)**2 + (ay - cy)**2)
+        side_c = math.sqrt((ax - bx)**2 + (ay - by)**2)
+        
+        return TriangleMeasures(
+            sides=(side_a, side_b, side_c),
+            angles=(_vertex_angle(bx - ax, by - ay, cx - ax, cy - ay),
+                    _vertex_angle(ax - bx, ay - by, cx - bx, cy - by),
+                    _vertex_angle(ax - cx, ay - cy, bx - cx, by - cy)),
+            area=abs((ax * (by - cy) + bx * (cy - ay) + cx * (ay - by)) / 2.0),
+            perimeter=side_a + side_b + side_c,
+            centroid=((ax + bx + cx) / 3, (ay + by + cy) / 3),
+            bounds=(min(ax, bx, cx), min(ay, by, cy), max(ax, bx, cx), max(ay, by, cy)),
+        )
+    
     def get_side_length(self, side: str) -> float:
         """Get the length of a side ('a', 'b', or 'c')"""
-        if side.lower() == 'a':
-            return self.vertex_b.distance_to(self.vertex_c)
-        elif side.lower() == 'b':
-            return self.vertex_a.distance_to(self.vertex_c)
-        elif side.lower() == 'c':
-            return self.vertex_a.distance_to(self.vertex_b)
-        return 0
+        index = _SIDES.get(side.lower())
+        return 0 if index is None else self.get_measures().sides[index]
     
     def get_angle_measure(self, vertex: str) -> float:
         """Get angle measure at vertex ('a', 'b', or 'c') in degrees"""
-        if vertex.lower() == 'a':
-            return self._calculate_angle(self.vertex_b, self.vertex_a, self.vertex_c)
-        elif vertex.lower() == 'b':
-            return self._calculate_angle(self.vertex_a, self.vertex_b, self.vertex_c)
-        elif vertex.lower() == 'c':
-            return self._calculate_angle(self.vertex_a, self.vertex_c, self.vertex_b)
-        return 0
+        index = _SIDES.get(vertex.lower())
+        return 0 if index is None else self.get_measures().angles[index]
     
     def _calculate_angle(self, p1: Point, vertex: Point, p2: Point) -> float:
         """Calculate angle at vertex between two points"""
-        v1x, v1y = p1.x - vertex.x, p1.y - vertex.y
-        v2x, v2y = p2.x - vertex.x, p2.y - vertex.y
-        
-        dot_product = v1x * v2x + v1y * v2y
-        mag1 = math.sqrt(v1x * v1x + v1y * v1y)
-        mag2 = math.sqrt(v2x * v2x + v2y * v2y)
-        
-        if mag1 == 0 or mag2 == 0:
-            return 0
-        
-        cos_angle = dot_product / (mag1 * mag2)
-        cos_angle = max(-1, min(1, cos_angle))
-        return math.degrees(math.acos(cos_angle))
+        return _vertex_angle(p1.x - vertex.x, p1.y - vertex.y, p2.x - vertex.x, p2.y - vertex.y)
     
     def get_area(self) -> float:
         """Calculate the area of the triangle using the cross product"""
-        ax, ay = self.vertex_a.x, self.vertex_a.y
-        bx, by = self.vertex_b.x, self.vertex_b.y
-        cx, cy = self.vertex_c.x, self.vertex_c.y
-        return abs((ax * (by - cy) + bx * (cy - ay) + cx * (ay - by)) / 2.0)
+        return self.get_measures().area
     
     def get_perimeter(self) -> float:
         """Calculate the perimeter of the triangle"""
-        return (self.get_side_length('a') + 
-                self.get_side_length('b') + 
-                self.get_side_length('c'))
+        return self.get_measures().perimeter
     
     def get_centroid(self) -> Point:
         """Get the centroid of the triangle"""
-        x = (self.vertex_a.x + self.vertex_b.x + self.vertex_c.x) / 3
-        y = (self.vertex_a.y + self.vertex_b.y + self.vertex_c.y) / 3
+        x, y = self.get_measures().centroid
         return Point(x, y, "centroid")
     
     def is_right_triangle(self, tolerance: float = 1e-6) -> bool:
         """Check if the triangle is a right triangle"""
-        sides = [self.get_side_length('a'), self.get_side_length('b'), self.get_side_length('c')]
-        sides.sort()
+        sides = sorted(self.get_measures().sides)
         return abs(sides[0]**2 + sides[1]**2 - sides[2]**2) < tolerance
     
     def get_bounds(self) -> Tuple[float, float, float, float]:
         """Get bounding box of the triangle"""
-        all_x = [self.vertex_a.x, self.vertex_b.x, self.vertex_c.x]
-        all_y = [self.vertex_a.y, self.vertex_b.y, self.vertex_c.y]
-        return (min(all_x), min(all_y), max(all_x), max(all_y))
+        return self.get_measures().bounds
     
     def contains_point(self, point: Point) -> bool:
         """Check if point is inside the triangle using barycentric coordinates"""
@@ -146,5 +174,6 @@ class Triangle(GeometricShape):
         new_triangle.layer = self.layer
         new_triangle.font_size = self.font_size
         new_triangle.text_color = self.text_color
-        new_triangle._properties = self._properties.copy()
+        if self._extra:
+            new_triangle._properties = self._extra.copy()
         return new_triangle
\ No newline at end of file
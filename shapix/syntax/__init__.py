@@ -2,7 +2,48 @@
 Syntax parsing and export utilities for shapix
 """
 
-from .parser import GeometrySyntaxParser
-from .exporter import GeometryPNGExporter, export_geometry_syntax
+from .parser import GeometrySyntaxParser, Statement, tokenize
+from .pointfile import PointTable, read_points
+from .cache import RenderCache
+from .incremental import IncrementalParser, ParseDelta
+from .compiled import CompiledScene, compile_syntax, load_compiled, write_compiled
+from .template import DiagramTemplate, compile_template
+from .exporter import (
+    ExportJob,
+    ExportResult,
+    GeometryExporter,
+    GeometryPNGExporter,
+    GeometrySVGExporter,
+    export_geometry_syntax,
+    export_geometry_svg,
+    export_many,
+    render_to_array,
+    render_to_bytes,
+)
 
-__all__ = ['GeometrySyntaxParser', 'GeometryPNGExporter', 'export_geometry_syntax']
\ No newline at end of file
+__all__ = [
+    'GeometrySyntaxParser',
+    'IncrementalParser',
+    'ParseDelta',
+    'CompiledScene',
+    'compile_syntax',
+    'load_compiled',
+    'write_compiled',
+    'DiagramTemplate',
+    'compile_template',
+    'Statement',
+    'tokenize',
+    'PointTable',
+    'read_points',
+    'GeometryExporter',
+    'GeometryPNGExporter',
+    'GeometrySVGExporter',
+    'export_geometry_syntax',
+    'export_geometry_svg',
+    'export_many',
+    'render_to_bytes',
+    'render_to_array',
+    'ExportJob',
+    'ExportResult',
+    'RenderCache',
+]
\ No newline at end of file
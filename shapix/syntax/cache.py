@@ -0,0 +1,213 @@
+"""
+Content-addressed on-disk cache for rendered PNG files
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, Optional, Union
+import hashlib
+import os
+import shutil
+import tempfile
+
+from .parser import tokenize
+
+
+def normalized_lines(syntax: Union[str, Iterable[str]]) -> Iterator[str]:
+    """The lines of ``syntax`` that ``GeometrySyntaxParser.parse`` does not ignore, stripped"""
+    if isinstance(syntax, str):
+        syntax = syntax.split('\n')
+    for line in syntax:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+def normalize_syntax(syntax: str) -> str:
+    """Strip the lines that ``GeometrySyntaxParser.parse`` ignores"""
+    return '\n'.join(normalized_lines(syntax))
+
+
+def _hash_point_file(digest, line: str) -> None:
+    """Add the contents of the file a ``POINTS FROM`` line loads to ``digest``"""
+    statement = tokenize(line)
+    if statement.keyword != 'POINTS' or statement.args[:1] != ['FROM']:
+        return
+    path = statement.label or (statement.args[1] if len(statement.args) > 1 else None)
+    try:
+        with open(path, 'rb') as stream:
+            for block in iter(lambda: stream.read(1 << 20), b''):
+                digest.update(block)
+    except (OSError, TypeError):
+        # Parsing reports the missing file
+        pass
+
+
+class RenderCache:
+    """LRU cache of rendered PNG files, keyed by the hash of their inputs
+
+    Entries live in ``directory`` as ``<key>.png``. The total size is kept
+    under ``max_bytes`` by evicting the least recently used entries; recency
+    is stored in the file modification time, so it survives restarts and is
+    shared by processes using the same directory.
+
+    With ``hardlink=True`` hits are hard-linked to the destination instead of
+    copied. The output then shares storage with the cache entry and must not
+    be modified in place.
+    """
+
+    SUFFIX = '.png'
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, hardlink: bool = False):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hardlink = hardlink
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        self._size = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(syntax: Union[str, Iterable[str]], width: int, height: int, auto_scale: bool,
+                 backend: str = 'raster') -> str:
+        """Hash the normalized syntax and every parameter that affects the image
+
+        ``syntax`` may also be an iterable of lines (which is consumed); the
+        key is the same as for the equivalent string. Point files loaded with
+        ``POINTS FROM`` are hashed by content, so editing one changes the key.
+        """
+        from .. import __version__
+
+        header = f"shapix {__version__}\n{backend} {width}x{height} auto_scale={bool(auto_scale)}\n"
+        digest = hashlib.sha256(header.encode('utf-8'))
+        separator = ''
+        for line in normalized_lines(syntax):
+            digest.update((separator + line).encode('utf-8'))
+            separator = '\n'
+            if line.startswith('POINTS'):
+                _hash_point_file(digest, line)
+        return digest.hexdigest()
+
+    def fetch(self, key: str, filename: str) -> bool:
+        """Write the cached image for ``key`` to ``filename``; False on a miss"""
+        path = self._path(key)
+        try:
+            self._materialize(path, filename)
+            os.utime(path)
+        except FileNotFoundError:
+            # Never stored, or evicted by another process sharing the directory
+            self._forget(key)
+            self.misses += 1
+            return False
+
+        if key not in self._entries:
+            # Stored by another process sharing the directory
+            self._entries[key] = os.path.getsize(path)
+            self._size += self._entries[key]
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True
+
+    def store(self, key: str, filename: str) -> None:
+        """Copy a freshly rendered image into the cache and evict down to the cap"""
+        size = os.path.getsize(filename)
+        if size > self.max_bytes:
+            return
+
+        # Copy under a temporary name so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        os.close(fd)
+        try:
+            shutil.copyfile(filename, tmp_path)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self._forget(key)
+        self._entries[key] = size
+        self._size += size
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove every cache entry and reset the counters"""
+        for key in list(self._entries):
+            self._remove(key)
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached images in bytes"""
+        return self._size
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current occupancy"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._size,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU order from the files already in the directory"""
+        found = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(self.SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, entry.name[:-len(self.SUFFIX)], stat.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._size += size
+        self._evict()
+
+    def _materialize(self, path: str, filename: str) -> None:
+        if self.hardlink:
+            if not os.path.exists(path):
+                raise FileNotFoundError(path)
+            if os.path.lexists(filename):
+                os.unlink(filename)
+            try:
+                os.link(path, filename)
+                return
+            except OSError:
+                # Different filesystem or no link support: fall back to a copy
+                pass
+        shutil.copyfile(path, filename)
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        self._forget(key)
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, key: str) -> Optional[int]:
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._size -= size
+        return size
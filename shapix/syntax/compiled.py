@@ -0,0 +1,412 @@
+"""
+Compiled scene files (.geoc) for shapix
+
+A compiled scene holds the output of ``GeometrySyntaxParser`` in a binary
+layout that is memory-mapped instead of parsed:
+
+- a 32-byte header: magic, format version, point, shape and string counts
+- point columns: ``x`` and ``y`` as float64; label, label position and
+  name as uint32 ids into the string table; ``show_label`` as uint8
+- one 32-byte record per shape: type code, name and style ids, up to
+  three point indices and a scalar (the radius of a circle)
+- the string table: uint64 offsets followed by the UTF-8 data
+
+Labels, names and styles are interned, so a string shared by many points
+or shapes is stored once. A style is a shape's option overrides and custom
+properties encoded as JSON. Values are little-endian and every section
+starts on an 8-byte boundary.
+"""
+
+import io
+import json
+import mmap
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..core.base import GeometricShape, Point
+from ..core.scene import Scene
+from ..core.store import PointStore
+from ..shapes.angle import Angle
+from ..shapes.circle import Circle
+from ..shapes.line import Line
+from ..shapes.point import PointShape
+from ..shapes.triangle import Triangle
+from .parser import GeometrySyntaxParser, SyntaxSource, _gc_paused
+
+MAGIC = b'GEOC'
+FORMAT_VERSION = 1
+
+#: Shape classes in the order of their type codes
+SHAPE_TYPES: Tuple[type, ...] = (PointShape, Line, Circle, Triangle, Angle)
+_SHAPE_CODES = {cls: code for code, cls in enumerate(SHAPE_TYPES)}
+
+# String id of a missing name or style, and point index of an unused slot
+NO_STRING = 0xFFFFFFFF
+NO_POINT = 0xFFFFFFFF
+
+_HEADER = struct.Struct('<4sIQQQ')
+_RECORD = np.dtype({
+    'names': ['kind', 'name', 'style', 'points', 'scalar'],
+    'formats': ['u1', '<u4', '<u4', ('<u4', 3), '<f8'],
+    'offsets': [0, 4, 8, 12, 24],
+    'itemsize': 32,
+})
+
+
+def _layout(point_count: int, shape_count: int, string_count: int) -> Dict[str, Tuple[int, np.dtype, int]]:
+    """Offset, dtype and length of every section, in file order"""
+    sections = [
+        ('x', np.dtype('<f8'), point_count),
+        ('y', np.dtype('<f8'), point_count),
+        ('label', np.dtype('<u4'), point_count),
+        ('position', np.dtype('<u4'), point_count),
+        ('point_name', np.dtype('<u4'), point_count),
+        ('show_label', np.dtype('u1'), point_count),
+        ('records', _RECORD, shape_count),
+        ('string_offsets', np.dtype('<u8'), string_count + 1),
+    ]
+    layout = {}
+    offset = _HEADER.size
+    for name, dtype, count in sections:
+        layout[name] = (offset, dtype, count)
+        offset += dtype.itemsize * count
+        offset += -offset % 8
+    layout['string_data'] = (offset, np.dtype('u1'), 0)
+    return layout
+
+
+def write_compiled(shapes: Iterable[GeometricShape], path: str,
+                   points: Optional[Dict[str, Point]] = None) -> None:
+    """Write shapes (and optionally the named points) to a compiled scene file
+
+    Points shared by several shapes are written once and stay shared when
+    the file is loaded. ``points`` maps names to points, like
+    ``GeometrySyntaxParser.points``; named points that no shape uses are
+    written too. Raises ValueError for shape types the format does not
+    know and for properties that cannot be encoded as JSON.
+    """
+    data, _ = encode_compiled(shapes, points)
+    with open(path, 'wb') as stream:
+        stream.write(data)
+
+
+def encode_compiled(shapes: Iterable[GeometricShape],
+                    points: Optional[Dict[str, Point]] = None) -> Tuple[bytes, Dict[int, int]]:
+    """The contents of a compiled scene file (see ``write_compiled``) as bytes
+
+    Also returns the index each point was written at, keyed by ``id(point)``.
+    """
+    with _gc_paused():
+        strings: Dict[str, int] = {}
+
+        def intern(text: str) -> int:
+            string_id = strings.get(text)
+            if string_id is None:
+                string_id = strings[text] = len(strings)
+            return string_id
+
+        point_ids: Dict[int, int] = {}
+        point_list: List[Point] = []
+
+        def point_id(point: Point) -> int:
+            index = point_ids.get(id(point))
+            if index is None:
+                index = point_ids[id(point)] = len(point_list)
+                point_list.append(point)
+            return index
+
+        # Shapes with equal options share one encoded style
+        styles: Dict[Tuple, int] = {}
+        records = []
+        for shape in shapes:
+            code = _SHAPE_CODES.get(type(shape))
+            if code is None:
+                raise ValueError(f"Cannot compile shapes of type {type(shape).__name__}")
+            refs = [NO_POINT, NO_POINT, NO_POINT]
+            for slot, point in enumerate(shape.get_points()):
+                refs[slot] = point_id(point)
+            style = NO_STRING
+            if shape._overrides or shape._extra:
+                overrides, extra = shape._overrides or {}, shape._extra or {}
+                key = (tuple(overrides.items()), tuple(extra.items()))
+                try:
+                    style = styles.get(key)
+                except TypeError:  # unhashable values are encoded every time
+                    key = None
+                if style is None:
+                    try:
+                        style = intern(json.dumps([overrides, extra], separators=(',', ':')))
+                    except TypeError as e:
+                        raise ValueError(f"Cannot compile the properties of {shape.name}: {e}") from None
+                    if key is not None:
+                        styles[key] = style
+            scalar = shape._radius if code == _SHAPE_CODES[Circle] else 0.0
+            records.append((code, intern(shape._name), style, refs, scalar))
+
+        point_names: Dict[int, int] = {}
+        for name, point in (points or {}).items():
+            point_names[point_id(point)] = intern(name)
+
+        point_count = len(point_list)
+        columns = {
+            'x': [point.x for point in point_list],
+            'y': [point.y for point in point_list],
+            'label': [intern(point.label) for point in point_list],
+            'position': [intern(point.label_position) for point in point_list],
+            'point_name': [point_names.get(index, NO_STRING) for index in range(point_count)],
+            'show_label': [point.show_label for point in point_list],
+            'records': records,
+        }
+        encoded_strings = [text.encode('utf-8') for text in strings]
+        columns['string_offsets'] = np.cumsum([0] + [len(data) for data in encoded_strings])
+
+        layout = _layout(point_count, len(records), len(strings))
+        stream = io.BytesIO()
+        stream.write(_HEADER.pack(MAGIC, FORMAT_VERSION, point_count, len(records), len(strings)))
+        for name, (offset, dtype, count) in layout.items():
+            stream.write(b'\0' * (offset - stream.tell()))
+            if name == 'string_data':
+                stream.write(b''.join(encoded_strings))
+            else:
+                stream.write(np.array(columns[name], dtype=dtype).reshape(count).tobytes())
+        return stream.getvalue(), point_ids
+
+
+def build_shape(cls: type, points: List[Point], name: str, scalar: float,
+                style: Optional[List[Dict[str, Any]]] = None) -> GeometricShape:
+    """Make one shape from the fields of its record; ``style`` is its decoded style"""
+    if cls is Circle:
+        shape = Circle(points[0], scalar, name)
+        shape._radius = float(scalar)
+    else:
+        shape = cls(*points, name=name)
+    if style is not None:
+        overrides, extra = style
+        # Each shape gets its own dicts, which it may change later
+        shape._overrides = dict(overrides) if overrides else None
+        shape._extra = dict(extra) if extra else None
+    return shape
+
+
+def compile_syntax(source: SyntaxSource, path: str) -> None:
+    """Parse geometry syntax (a string or an iterable of lines) into a compiled scene file"""
+    parser = GeometrySyntaxParser()
+    parser.parse(source)
+    write_compiled(parser.shapes, path, parser.points)
+
+
+class CompiledScene:
+    """A compiled scene file, memory-mapped and turned into shapes on demand
+
+    ``source`` is a path, or the contents of a file as bytes. Opening only
+    reads the header, so it takes the same time for any file size; the
+    sections are NumPy views of the mapping. A shape (and its
+    points) is built the first time it is read, by index, by name or by
+    iterating, and the same object is returned afterwards. Iterating, or
+    reading ``shapes`` or ``scene``, builds everything.
+
+    The shapes are ordinary live shapes with points in ``store`` (the
+    default store if None); editing them does not change the file.
+    """
+
+    def __init__(self, source: Union[str, bytes], store: Optional[PointStore] = None):
+        self.store = store
+        self._mmap: Optional[mmap.mmap] = None
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.path = "<bytes>"
+            self._buffer = source
+        else:
+            self.path = source
+            with open(source, 'rb') as stream:
+                self._mmap = self._buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._map_sections()
+        except ValueError:
+            self.close()
+            raise
+        self._strings: Dict[int, str] = {}
+        self._styles: Dict[int, Any] = {}
+        self._points: Dict[int, Point] = {}
+        self._shapes: Dict[int, GeometricShape] = {}
+        self._scene: Optional[Scene] = None
+
+    def _map_sections(self) -> None:
+        buffer = self._buffer
+        if len(buffer) < _HEADER.size:
+            raise ValueError(f"{self.path} is not a compiled scene file")
+        magic, version, point_count, shape_count, string_count = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a compiled scene file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{self.path} has compiled format version {version}, "
+                             f"expected {FORMAT_VERSION}")
+        layout = _layout(point_count, shape_count, string_count)
+        data_offset = layout.pop('string_data')[0]
+        if data_offset > len(buffer):
+            raise ValueError(f"{self.path} is truncated")
+        for name, (offset, dtype, count) in layout.items():
+            setattr(self, f'_{name}', np.frombuffer(buffer, dtype, count, offset))
+        self._string_data = memoryview(buffer)[data_offset:]
+        if int(self._string_offsets[-1]) > len(self._string_data):
+            raise ValueError(f"{self.path} is truncated")
+
+    def close(self) -> None:
+        """Unmap the file; shapes already built stay usable"""
+        if self._buffer is None:
+            return
+        # The mapping cannot be closed while NumPy views export its buffer
+        for name in ('x', 'y', 'label', 'position', 'point_name', 'show_label', 'records',
+                     'string_offsets'):
+            setattr(self, f'_{name}', None)
+        if getattr(self, '_string_data', None) is not None:
+            self._string_data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._buffer = None
+
+    def __enter__(self) -> 'CompiledScene':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def point_count(self) -> int:
+        return len(self._x)
+
+    @property
+    def shape_count(self) -> int:
+        return len(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def string(self, string_id: int) -> str:
+        """Entry ``string_id`` of the string table"""
+        text = self._strings.get(string_id)
+        if text is None:
+            start, end = self._string_offsets[string_id:string_id + 2]
+            text = self._strings[string_id] = str(self._string_data[start:end], 'utf-8')
+        return text
+
+    def _string_id(self, text: str) -> Optional[int]:
+        """Id of ``text`` in the string table, found without decoding the table"""
+        encoded = np.frombuffer(text.encode('utf-8'), np.uint8)
+        offsets = self._string_offsets
+        candidates = np.flatnonzero(np.diff(offsets) == len(encoded))
+        if len(encoded) and len(candidates):
+            data = np.frombuffer(self._string_data, np.uint8)
+            windows = data[offsets[candidates].astype(np.intp)[:, None] + np.arange(len(encoded))]
+            candidates = candidates[(windows == encoded).all(axis=1)]
+        return int(candidates[0]) if len(candidates) else None
+
+    def point(self, index: int) -> Point:
+        """The point stored at ``index``"""
+        point = self._points.get(index)
+        if point is None:
+            point = self._points[index] = Point(
+                self._x[index], self._y[index], self.string(self._label[index]),
+                bool(self._show_label[index]), self.string(self._position[index]),
+                store=self.store,
+            )
+        return point
+
+    def __getitem__(self, index: int) -> GeometricShape:
+        """The shape stored at ``index`` (negative indexes count from the end)"""
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("compiled scene index out of range")
+        shape = self._shapes.get(index)
+        if shape is None:
+            shape = self._build_shape(index, self._records[index:index + 1].tolist()[0])
+        return shape
+
+    def __iter__(self) -> Iterator[GeometricShape]:
+        if len(self._shapes) < len(self):
+            self._load_strings()
+            self._load_points()
+        records = self._records
+        # Reading the records in blocks avoids a NumPy scalar per field
+        for start in range(0, len(records), 65536):
+            block = records[start:start + 65536].tolist()
+            for offset, record in enumerate(block, start):
+                shape = self._shapes.get(offset)
+                if shape is None:
+                    shape = self._build_shape(offset, record)
+                yield shape
+
+    def _load_strings(self) -> None:
+        """Decode the whole string table at once"""
+        offsets = self._string_offsets.tolist()
+        data = bytes(self._string_data[:offsets[-1]])
+        self._strings = {string_id: str(data[start:end], 'utf-8')
+                         for string_id, (start, end) in enumerate(zip(offsets, offsets[1:]))}
+
+    def _load_points(self) -> None:
+        """Build every point not built yet, reading each column once"""
+        built = self._points
+        strings = self._strings
+        store = self.store
+        columns = zip(self._x.tolist(), self._y.tolist(), self._label.tolist(),
+                      self._show_label.tolist(), self._position.tolist())
+        for index, (x, y, label, show, position) in enumerate(columns):
+            if index not in built:
+                built[index] = Point(x, y, strings[label], bool(show), strings[position], store=store)
+
+    def _build_shape(self, index: int, record: Tuple) -> GeometricShape:
+        kind, name_id, style_id, refs, scalar = record
+        built = self._points
+        points = [built.get(ref) or self.point(ref) for ref in refs if ref != NO_POINT]
+        style = None
+        if style_id != NO_STRING:
+            style = self._styles.get(style_id)
+            if style is None:
+                style = self._styles[style_id] = json.loads(self.string(style_id))
+        shape = self._shapes[index] = build_shape(SHAPE_TYPES[kind], points, self.string(name_id), scalar, style)
+        return shape
+
+    @property
+    def shapes(self) -> List[GeometricShape]:
+        """All shapes, in the order they were written"""
+        with _gc_paused():
+            return list(self)
+
+    @property
+    def points(self) -> Dict[str, Point]:
+        """The named points, like ``GeometrySyntaxParser.points``"""
+        names = self._point_name
+        return {self.string(names[index]): self.point(index)
+                for index in np.flatnonzero(names != NO_STRING).tolist()}
+
+    @property
+    def scene(self) -> Scene:
+        """A Scene with every shape (built on first access)"""
+        if self._scene is None:
+            with _gc_paused():
+                self._scene = Scene(self)
+        return self._scene
+
+    def get_point(self, name: str) -> Optional[Point]:
+        """Get a named point without building the others"""
+        string_id = self._string_id(name)
+        if string_id is None:
+            return None
+        matches = np.flatnonzero(self._point_name == string_id)
+        return self.point(int(matches[-1])) if len(matches) else None
+
+    def get_shape(self, name: str) -> Optional[GeometricShape]:
+        """Get a shape by name without building the others (the last one wins)"""
+        string_id = self._string_id(name)
+        if string_id is None:
+            return None
+        matches = np.flatnonzero(self._records['name'] == string_id)
+        return self[int(matches[-1])] if len(matches) else None
+
+
+def load_compiled(path: str, store: Optional[PointStore] = None) -> CompiledScene:
+    """Open a compiled scene file; shapes are built as they are read"""
+    return CompiledScene(path, store)
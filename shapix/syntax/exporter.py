@@ -1,21 +1,43 @@
 """
-PNG exporter for shapix geometry engine
+PNG and SVG exporters for shapix geometry engine
 """
 
-import tkinter as tk
-from tkinter import Canvas
-from typing import List, Tuple
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set,
+                    TextIO, Tuple, Union)
 import io
-import platform
-import subprocess
+import os
 
 from ..core.base import GeometricShape
+from ..core.scene import Scene
+from ..core.spatial import SpatialIndex
+from ..rendering.display_list import DisplayList
 from ..rendering.renderer import ShapeRenderer
-from .parser import GeometrySyntaxParser
+from .parser import GeometrySyntaxParser, SyntaxSource
+from .cache import RenderCache
 
+if TYPE_CHECKING:
+    import numpy as np
 
-class GeometryPNGExporter:
-    """Export geometry syntax to PNG images"""
+BACKENDS = ('tk', 'raster')
+
+
+def _seekable(stream: Any) -> bool:
+    seekable = getattr(stream, 'seekable', None)
+    return seekable is not None and seekable()
+
+
+class GeometryExporter:
+    """Shared coordinate mapping and layout logic for all exporters
+    
+    ``layout`` lowers a diagram into a ``DisplayList`` once; subclasses
+    replay it onto their backend canvas in ``render``.
+    """
+    
+    # Canvas pixels kept around the viewport when culling, so labels and
+    # angle arcs of shapes just outside the edge are still drawn
+    CULL_MARGIN = 100
     
     def __init__(self, width: int = 800, height: int = 600):
         self.width = width
@@ -23,32 +45,56 @@ class GeometryPNGExporter:
         self.origin_x = width // 2
         self.origin_y = height // 2
         self.scale = 1.0
-        
-        # Create hidden tkinter canvas for rendering
-        self.root = tk.Tk()
-        self.root.withdraw()  # Hide the window
-        self.canvas = Canvas(self.root, width=width, height=height, bg='white')
-        
-        # Create renderer
-        self.renderer = ShapeRenderer(self.canvas, self.world_to_canvas)
+        self.renderer = ShapeRenderer(None, self.world_to_canvas)
     
     def world_to_canvas(self, x: float, y: float) -> Tuple[int, int]:
         """Convert world coordinates to canvas coordinates"""
         return int(self.origin_x + x * self.scale), int(self.origin_y - y * self.scale)
     
-    def export_syntax_to_png(self, syntax: str, filename: str, auto_scale: bool = True) -> None:
-        """Export geometry syntax to PNG file"""
-        try:
-            parser = GeometrySyntaxParser()
-            shapes = parser.parse(syntax)
-            
-            if auto_scale:
-                self._auto_scale_shapes(shapes)
-            
-            self._draw_shapes(shapes)
-            self._save_canvas_as_png(filename)
-        finally:
-            self._cleanup()
+    def visible_bounds(self) -> Tuple[float, float, float, float]:
+        """World-space (min_x, min_y, max_x, max_y) of the canvas, with a margin for labels"""
+        margin = self.CULL_MARGIN
+        return ((-margin - self.origin_x) / self.scale,
+                (self.origin_y - self.height - margin) / self.scale,
+                (self.width + margin - self.origin_x) / self.scale,
+                (self.origin_y + margin) / self.scale)
+    
+    def reset_view(self) -> None:
+        """Restore the default scale and origin before laying out a new diagram"""
+        self.origin_x = self.width // 2
+        self.origin_y = self.height // 2
+        self.scale = 1.0
+    
+    def layout(self, syntax: SyntaxSource, auto_scale: bool = True) -> DisplayList:
+        """Parse geometry syntax and lower it into a display list
+        
+        ``syntax`` is a string or any iterable of lines; an open file is
+        parsed as it is read.
+        """
+        parser = GeometrySyntaxParser()
+        return self.layout_shapes(parser.parse_scene(syntax), auto_scale)
+    
+    def layout_shapes(self, shapes: Union[Scene, Iterable[GeometricShape]], auto_scale: bool = True,
+                      index: Optional[SpatialIndex] = None) -> DisplayList:
+        """Lower a scene (or any shapes) into a display list that any backend can replay
+        
+        Without auto-scaling, shapes outside the visible canvas are culled
+        with a spatial index: ``index`` if given, else the scene's own.
+        """
+        scene = shapes if isinstance(shapes, Scene) else Scene(shapes)
+        self.reset_view()
+        visible = None
+        if auto_scale:
+            self._auto_scale_shapes(scene)
+        else:
+            if index is None:
+                index = scene.spatial_index
+            visible = {shape.handle for shape in index.query_rect(*self.visible_bounds())}
+        
+        display_list = DisplayList()
+        self.renderer.canvas = display_list
+        self._draw_shapes(scene, visible)
+        return display_list
     
     def _auto_scale_shapes(self, shapes: List[GeometricShape]) -> None:
         """Automatically scale shapes to fit canvas"""
@@ -87,112 +133,390 @@ class GeometryPNGExporter:
         self.origin_x = self.width // 2 - center_x * self.scale
         self.origin_y = self.height // 2 + center_y * self.scale
     
-    def _draw_shapes(self, shapes: List[GeometricShape]) -> None:
-        """Draw all shapes on canvas"""
-        self.canvas.delete("all")
+    def _draw_shapes(self, scene: Scene, handles: Optional[Set[int]] = None) -> None:
+        """Draw the scene (or just the shapes in ``handles``) on the renderer's canvas"""
+        canvas = self.renderer.canvas
+        canvas.delete("all")
         
         # Draw background
-        self.canvas.create_rectangle(0, 0, self.width, self.height, fill='white', outline='white')
-        
-        # Draw shapes sorted by layer
-        for shape in sorted(shapes, key=lambda s: s.layer):
-            if shape.visible:
-                self._draw_shape(shape)
-    
-    def _draw_shape(self, shape: GeometricShape) -> None:
-        """Draw individual shape using renderer"""
-        shape_type = shape.__class__.__name__
-        
-        # Use dynamic method lookup first
-        method_name = f'draw_{shape_type.lower()}'
-        if hasattr(self.renderer, method_name):
-            getattr(self.renderer, method_name)(shape)
-        # Handle specific shape types
-        elif 'PointShape' in shape_type:
-            self.renderer.draw_point(shape)
-        elif 'Triangle' in shape_type:
-            self.renderer.draw_triangle(shape)
-        elif 'Circle' in shape_type:
-            self.renderer.draw_circle(shape)
-        elif 'Line' in shape_type:
-            self.renderer.draw_line(shape)
-        elif 'Angle' in shape_type:
-            self.renderer.draw_angle(shape)
-    
-    def _save_canvas_as_png(self, filename: str) -> None:
-        """Save canvas to PNG file"""
-        try:
-            # Update canvas to ensure all drawing is complete
-            self.canvas.update()
-            
-            # Try PostScript method first
-            ps_data = self.canvas.postscript(colormode='color', width=self.width, height=self.height)
-            
-            # Try to convert PostScript to PNG using PIL
-            try:
-                from PIL import Image
-                img = Image.open(io.BytesIO(ps_data.encode('latin-1')))
-                img.save(filename, 'PNG')
+        canvas.create_rectangle(0, 0, self.width, self.height, fill='white', outline='white')
+        
+        # Shapes come out of the scene already ordered by layer
+        self.renderer.draw_scene(scene, handles)
+
+
+class GeometryPNGExporter(GeometryExporter):
+    """Export geometry syntax to PNG images
+    
+    Every PNG is rasterized and encoded in-process from the display list,
+    without a display or Ghostscript, so both backends write the same
+    files. The ``tk`` backend additionally offers a hidden tkinter canvas
+    as ``canvas`` for callers that display or inspect it; it is created on
+    first access and kept in sync with each diagram from then on.
+    
+    With a ``RenderCache``, diagrams that were rendered before are copied
+    from the cache without being parsed or drawn again.
+    """
+    
+    def __init__(self, width: int = 800, height: int = 600, backend: str = 'raster',
+                 cache: Optional[RenderCache] = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+        
+        super().__init__(width, height)
+        self.backend = backend
+        self.cache = cache
+        self.root = None
+        self._tk_canvas = None
+        self._raster = None
+        self._display_list: Optional[DisplayList] = None
+    
+    @property
+    def canvas(self):
+        """The hidden tkinter canvas (``tk`` backend) or the raster canvas"""
+        if self.backend != 'tk':
+            return self._raster_canvas()
+        if self._tk_canvas is None:
+            import tkinter as tk
+            self.root = tk.Tk()
+            self.root.withdraw()  # Hide the window
+            self._tk_canvas = tk.Canvas(self.root, width=self.width, height=self.height, bg='white')
+            if self._display_list is not None:
+                self._draw_tk(self._display_list)
+        return self._tk_canvas
+    
+    def __enter__(self) -> 'GeometryPNGExporter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def export(self, syntax: SyntaxSource, filename: str, auto_scale: bool = True) -> None:
+        """Export geometry syntax to PNG file, keeping the canvas alive for reuse
+        
+        Use the exporter as a context manager (or call ``close``) to release
+        the tkinter root, if ``canvas`` created one, once all diagrams have
+        been exported. The cache is
+        only consulted for strings and seekable files.
+        """
+        key = None
+        if self.cache is not None and (isinstance(syntax, str) or _seekable(syntax)):
+            # A file is hashed as it is read, then rewound for parsing
+            start = None if isinstance(syntax, str) else syntax.tell()
+            key = self.cache.make_key(syntax, self.width, self.height, auto_scale, self.backend)
+            if self.cache.fetch(key, filename):
                 return
-            except ImportError:
-                print("PIL not available, trying alternative method...")
-            except Exception:
-                print("PIL conversion failed, trying alternative method...")
-            
-            # Fallback: Use platform-specific screenshot
-            self._save_canvas_screenshot(filename)
-            
-        except Exception as e:
-            print(f"Error saving PNG: {e}")
-            # Save as PostScript if all else fails
-            ps_filename = filename.replace('.png', '.ps')
-            with open(ps_filename, 'w') as f:
-                f.write(self.canvas.postscript(colormode='color', width=self.width, height=self.height))
-            print(f"Saved as PostScript: {ps_filename}")
-    
-    def _save_canvas_screenshot(self, filename: str) -> None:
-        """Alternative method to save canvas using screenshot"""
+            if start is not None:
+                syntax.seek(start)
+        
+        self.render(self.layout(syntax, auto_scale), filename)
+        
+        if key is not None and os.path.exists(filename):
+            self.cache.store(key, filename)
+    
+    def render(self, display_list: DisplayList, filename: str) -> None:
+        """Replay a laid-out display list onto the canvas and save it as PNG"""
+        self._rasterize(display_list).save_png(filename)
+    
+    def png_bytes(self, syntax: SyntaxSource, auto_scale: bool = True) -> bytes:
+        """Render geometry syntax to PNG file contents without touching the disk"""
+        return self._rasterize(self.layout(syntax, auto_scale)).to_png_bytes()
+    
+    def array(self, syntax: SyntaxSource, auto_scale: bool = True) -> 'np.ndarray':
+        """Render geometry syntax to an RGBA array of shape (height, width, 4)
+        
+        The array is the exporter's raster buffer itself, not a copy, so it
+        is overwritten by the next diagram this exporter renders.
+        """
+        return self._rasterize(self.layout(syntax, auto_scale)).buffer
+    
+    def export_syntax_to_png(self, syntax: SyntaxSource, filename: str, auto_scale: bool = True) -> None:
+        """Export geometry syntax to PNG file and release the canvas"""
         try:
-            # Make window visible temporarily
-            self.root.deiconify()
-            self.root.update()
-            
-            # Get window position
-            x = self.root.winfo_rootx() + self.canvas.winfo_x()
-            y = self.root.winfo_rooty() + self.canvas.winfo_y()
-            
-            # Take screenshot based on platform
-            if platform.system() == "Darwin":  # macOS
-                subprocess.run([
-                    'screencapture', '-R', f'{x},{y},{self.width},{self.height}', filename
-                ])
-                print(f"Screenshot saved: {filename}")
-            elif platform.system() == "Linux":
-                subprocess.run([
-                    'import', '-window', 'root', '-crop', f'{self.width}x{self.height}+{x}+{y}', filename
-                ])
-                print(f"Screenshot saved: {filename}")
-            elif platform.system() == "Windows":
-                print("Windows screenshot method not implemented")
-                print(f"Please implement platform-specific screenshot for Windows")
-            else:
-                print(f"Screenshot method not implemented for {platform.system()}")
-            
-            self.root.withdraw()
-            
-        except Exception as e:
-            print(f"Error taking screenshot: {e}")
+            self.export(syntax, filename, auto_scale)
+        finally:
+            self._cleanup()
+    
+    def close(self) -> None:
+        """Release the canvas and tkinter root"""
+        self._cleanup()
+    
+    def _rasterize(self, display_list: DisplayList):
+        """Draw a display list on the raster canvas (and the Tk canvas, if any)"""
+        self._display_list = display_list
+        if self._tk_canvas is not None:
+            self._draw_tk(display_list)
+        
+        raster = self._raster_canvas()
+        raster.delete("all")
+        display_list.replay(raster)
+        return raster
+    
+    def _draw_tk(self, display_list: DisplayList) -> None:
+        # One Tcl round trip for the whole diagram instead of one per item
+        from ..rendering.tcl import build_tcl_script
+        self._tk_canvas.delete("all")
+        self._tk_canvas.tk.eval(build_tcl_script(display_list, str(self._tk_canvas)))
+    
+    def _raster_canvas(self):
+        """The in-process raster canvas that every PNG is encoded from"""
+        if self._raster is None:
+            from ..rendering.raster import RasterCanvas
+            self._raster = RasterCanvas(self.width, self.height, bg='white')
+        return self._raster
     
     def _cleanup(self) -> None:
         """Clean up resources"""
+        if self.root is None:
+            return
         try:
-            self.canvas.destroy()
+            self._tk_canvas.destroy()
             self.root.destroy()
         except Exception:
             pass
+        self.root = None
+        self._tk_canvas = None
+
+
+class GeometrySVGExporter(GeometryExporter):
+    """Export geometry syntax to SVG documents
+    
+    Shapes are laid out into the same display list as the PNG exporter, and
+    each draw operation is streamed out as an SVG element. tkinter is never
+    imported.
+    """
+    
+    def __init__(self, width: int = 800, height: int = 600):
+        super().__init__(width, height)
+        self.canvas = None
+    
+    def export_syntax_to_svg(self, syntax: SyntaxSource, filename: str, auto_scale: bool = True) -> None:
+        """Export geometry syntax to SVG file"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            self.write_svg(syntax, f, auto_scale)
+    
+    def write_svg(self, syntax: SyntaxSource, stream: TextIO, auto_scale: bool = True) -> None:
+        """Parse geometry syntax and stream it as SVG to a text stream"""
+        self.write_display_list(self.layout(syntax, auto_scale), stream)
+    
+    def render(self, display_list: DisplayList, filename: str) -> None:
+        """Write a laid-out display list to an SVG file"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            self.write_display_list(display_list, f)
+    
+    def write_display_list(self, display_list: DisplayList, stream: TextIO) -> None:
+        """Stream a laid-out display list as SVG to a text stream"""
+        from ..rendering.svg import SVGCanvas
+        
+        self.canvas = SVGCanvas(stream, self.width, self.height, bg='white')
+        try:
+            display_list.replay(self.canvas)
+        finally:
+            self.canvas.close()
 
 
-def export_geometry_syntax(syntax: str, filename: str, width: int = 800, height: int = 600) -> None:
+def export_geometry_syntax(syntax: SyntaxSource, filename: str, width: int = 800, height: int = 600,
+                           auto_scale: bool = True, backend: str = 'raster',
+                           cache: Optional[RenderCache] = None) -> None:
     """Convenience function to export geometry syntax to PNG"""
-    exporter = GeometryPNGExporter(width, height)
-    exporter.export_syntax_to_png(syntax, filename)
\ No newline at end of file
+    exporter = GeometryPNGExporter(width, height, backend=backend, cache=cache)
+    exporter.export_syntax_to_png(syntax, filename, auto_scale=auto_scale)
+
+
+def export_geometry_svg(syntax: SyntaxSource, filename: str, width: int = 800, height: int = 600,
+                        auto_scale: bool = True) -> None:
+    """Convenience function to export geometry syntax to SVG"""
+    exporter = GeometrySVGExporter(width, height)
+    exporter.export_syntax_to_svg(syntax, filename, auto_scale=auto_scale)
+
+
+def render_to_bytes(syntax: SyntaxSource, fmt: str = 'png', width: int = 800, height: int = 600,
+                    auto_scale: bool = True) -> bytes:
+    """Render geometry syntax to PNG or SVG file contents in memory"""
+    if fmt == 'png':
+        return GeometryPNGExporter(width, height, backend='raster').png_bytes(syntax, auto_scale)
+    if fmt == 'svg':
+        stream = io.StringIO()
+        GeometrySVGExporter(width, height).write_svg(syntax, stream, auto_scale)
+        return stream.getvalue().encode('utf-8')
+    raise ValueError(f"Unknown format '{fmt}', expected 'png' or 'svg'")
+
+
+def render_to_array(syntax: SyntaxSource, width: int = 800, height: int = 600,
+                    auto_scale: bool = True) -> 'np.ndarray':
+    """Render geometry syntax to an RGBA uint8 array of shape (height, width, 4)
+    
+    The array is the raster buffer the diagram was drawn into; no copy is made.
+    """
+    return GeometryPNGExporter(width, height, backend='raster').array(syntax, auto_scale)
+
+
+class ExportJob(NamedTuple):
+    """A single diagram to export with ``export_many``"""
+    syntax: str
+    filename: str
+    width: int = 800
+    height: int = 600
+    auto_scale: bool = True
+
+
+class ExportResult(NamedTuple):
+    """Outcome of one ``export_many`` job; ``error`` is None on success"""
+    index: int
+    filename: str
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _ExportWorker:
+    """Warm exporters for one ``export_many`` call, keyed by canvas setup"""
+    
+    def __init__(self, backend: str, cache_dir: Optional[str] = None):
+        self.backend = backend
+        self.cache = RenderCache(cache_dir) if cache_dir else None
+        self.exporters: Dict[Tuple[Any, ...], GeometryExporter] = {}
+    
+    def exporter(self, job: ExportJob, svg: bool) -> GeometryExporter:
+        """Get (or create) the warm exporter for a job's canvas size"""
+        key = ('svg' if svg else self.backend, job.width, job.height)
+        exporter = self.exporters.get(key)
+        if exporter is None:
+            if svg:
+                exporter = GeometrySVGExporter(job.width, job.height)
+            else:
+                exporter = GeometryPNGExporter(job.width, job.height, backend=self.backend,
+                                               cache=self.cache)
+            self.exporters[key] = exporter
+        return exporter
+    
+    def run(self, index: int, job: ExportJob) -> ExportResult:
+        """Export one job with a warm exporter, capturing any failure"""
+        try:
+            svg = job.filename.lower().endswith('.svg')
+            exporter = self.exporter(job, svg)
+            if svg:
+                exporter.export_syntax_to_svg(job.syntax, job.filename, job.auto_scale)
+            else:
+                exporter.export(job.syntax, job.filename, job.auto_scale)
+            return ExportResult(index, job.filename)
+        except Exception as e:
+            return ExportResult(index, job.filename, f"{type(e).__name__}: {e}")
+    
+    def close(self) -> None:
+        for exporter in self.exporters.values():
+            if isinstance(exporter, GeometryPNGExporter):
+                exporter.close()
+        self.exporters.clear()
+
+
+# The worker of the current pool process; each process serves one export_many call
+_pool_worker: Optional[_ExportWorker] = None
+
+
+def _init_export_worker(backend: str, cache_dir: Optional[str] = None) -> None:
+    """Process pool initializer: set up this process's worker"""
+    global _pool_worker
+    _pool_worker = _ExportWorker(backend, cache_dir)
+
+
+def _run_export_job(index: int, job: ExportJob) -> ExportResult:
+    """Export one job in a pool process"""
+    return _pool_worker.run(index, job)
+
+
+def _lost_result(index: int, job: ExportJob, error: BaseException) -> ExportResult:
+    return ExportResult(index, job.filename, f"{type(error).__name__}: {error}")
+
+
+def _finished(pending: Dict[Future, Tuple[int, ExportJob]], done: Iterable[Future]) -> Iterator[ExportResult]:
+    """Results of the ``done`` futures, removing them from ``pending``"""
+    for future in done:
+        index, job = pending.pop(future)
+        try:
+            yield future.result()
+        except BrokenProcessPool as e:
+            # A worker died (crash or out of memory) and took its pool's jobs with it
+            yield _lost_result(index, job, e)
+
+
+def _export_in_pool(indexed_jobs: Iterable[Tuple[int, ExportJob]], workers: int, backend: str,
+                    cache_dir: Optional[str]) -> Iterator[ExportResult]:
+    """Run jobs in a process pool, replacing the pool if a worker dies"""
+    # Keep a bounded window of jobs in flight so huge batches stream lazily
+    max_pending = workers * 4
+    pending: Dict[Future, Tuple[int, ExportJob]] = {}
+    pool: Optional[ProcessPoolExecutor] = None
+    try:
+        for index, job in indexed_jobs:
+            while True:
+                fresh = pool is None
+                if fresh:
+                    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_export_worker,
+                                               initargs=(backend, cache_dir))
+                try:
+                    pending[pool.submit(_run_export_job, index, job)] = (index, job)
+                    break
+                except BrokenProcessPool as e:
+                    yield from _finished(pending, list(pending))
+                    pool.shutdown(wait=False)
+                    pool = None
+                    if fresh:
+                        # Even a new pool cannot take work; report the job rather than retry forever
+                        yield _lost_result(index, job, e)
+                        break
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from _finished(pending, done)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from _finished(pending, done)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _as_export_job(job: Any) -> ExportJob:
+    if isinstance(job, ExportJob):
+        return job
+    if isinstance(job, dict):
+        return ExportJob(**job)
+    return ExportJob(*job)
+
+
+def export_many(jobs: Iterable[Any], workers: Optional[int] = None, backend: str = 'raster',
+                cache_dir: Optional[str] = None) -> Iterator[ExportResult]:
+    """Export many diagrams in parallel, yielding results as jobs complete
+    
+    Each job is an ``ExportJob``, a ``(syntax, filename[, width, height,
+    auto_scale])`` tuple or a dict with the same keys. Filenames ending in
+    ``.svg`` are exported as SVG, everything else as PNG with ``backend``.
+    
+    Jobs are fanned out to ``workers`` processes (default: one per CPU).
+    Every worker keeps its exporters alive between jobs. Failures do not stop
+    the batch; they are reported through ``ExportResult.error``. If a worker
+    process dies, the jobs still in flight are reported as failed and the
+    rest run in a new pool. With ``workers=1`` the jobs run in the calling
+    process.
+    
+    ``cache_dir`` enables a ``RenderCache`` in that directory, shared by all
+    workers, for the PNG jobs.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    
+    workers = workers or os.cpu_count() or 1
+    indexed_jobs = ((index, _as_export_job(job)) for index, job in enumerate(jobs))
+    
+    if workers == 1:
+        worker = _ExportWorker(backend, cache_dir)
+        try:
+            for index, job in indexed_jobs:
+                yield worker.run(index, job)
+        finally:
+            worker.close()
+        return
+    
+    yield from _export_in_pool(indexed_jobs, workers, backend, cache_dir)
@@ -0,0 +1,131 @@
+"""
+Arithmetic expressions in geometry syntax
+
+Coordinates and radii may be expressions instead of plain numbers, such
+as ``r*cos(150deg)``. An expression is a single token (no spaces) made of
+numbers, ``+ - * / // % **``, parentheses, constants (``pi``, ``tau``,
+``e`` and names defined with ``LET``) and the functions in ``FUNCTIONS``.
+A number directly followed by ``deg`` is in degrees and converted to
+radians, which the trigonometric functions take. All arithmetic is done
+in floating point.
+
+An expression is split into its numbers and a template in which each
+number is a parameter: ``r*cos(150deg)`` becomes ``r*cos(__n0)`` with
+``__n0`` the radians of 150. Each template is checked and compiled into a
+Python function once, so generated documents whose expressions differ
+only in their numbers compile a handful of templates, and evaluating an
+expression is a single function call.
+"""
+
+import ast
+import functools
+import math
+import re
+from typing import Callable, Dict, Mapping, Tuple
+
+#: Functions expressions may call
+FUNCTIONS: Dict[str, Callable[..., float]] = {
+    'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
+    'asin': math.asin, 'acos': math.acos, 'atan': math.atan, 'atan2': math.atan2,
+    'sqrt': math.sqrt, 'hypot': math.hypot, 'exp': math.exp, 'log': math.log,
+    'radians': math.radians, 'degrees': math.degrees,
+    'abs': abs, 'min': min, 'max': max,
+    # Kept as floats so that ** can never build a huge integer
+    'round': lambda x: float(round(x)),
+    'floor': lambda x: float(math.floor(x)),
+    'ceil': lambda x: float(math.ceil(x)),
+}
+
+#: Constants every expression can use; ``LET`` cannot redefine these or the functions
+CONSTANTS: Dict[str, float] = {'pi': math.pi, 'tau': math.tau, 'e': math.e}
+
+_GLOBALS = dict(FUNCTIONS, **CONSTANTS, __builtins__={})
+
+# A number, with an optional degree suffix; not part of a name like x1
+_NUMBER = re.compile(r'(?<![\w.])((?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(deg\b)?')
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+_SLOT = re.compile(r'__n\d+\Z')
+_NAME = re.compile(r'(?!__)[A-Za-z_][A-Za-z0-9_]*\Z')
+
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub)
+
+
+def _check(node: ast.AST) -> None:
+    """Reject anything but arithmetic on parameters, names and allowed function calls"""
+    if isinstance(node, ast.Expression):
+        _check(node.body)
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, _OPERATORS):
+        _check(node.left)
+        _check(node.right)
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, _OPERATORS):
+        _check(node.operand)
+    elif isinstance(node, ast.Name):
+        if node.id in FUNCTIONS:
+            raise ValueError(f"Function {node.id} must be called")
+        if node.id.startswith('__') and not _SLOT.match(node.id):
+            raise ValueError(f"Invalid name {node.id}")
+    elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+          and node.func.id in FUNCTIONS and not node.keywords):
+        for argument in node.args:
+            _check(argument)
+    else:
+        raise ValueError("Unsupported syntax")
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_template(template: str, slots: int) -> Callable[..., float]:
+    """A function of (constants, *numbers) computing ``template``"""
+    try:
+        tree = ast.parse(template, mode='eval')
+    except SyntaxError:
+        raise ValueError("Invalid syntax") from None
+    _check(tree)
+
+    def name(match: 're.Match') -> str:
+        identifier = match.group()
+        if identifier in _GLOBALS or _SLOT.match(identifier):
+            return identifier
+        return f"__c[{identifier!r}]"
+
+    parameters = ''.join(f", __n{slot}" for slot in range(slots))
+    return eval(f"lambda __c{parameters}: {_IDENTIFIER.sub(name, template)}", _GLOBALS)
+
+
+@functools.lru_cache(maxsize=65536)
+def compile_expression(text: str) -> Tuple[Callable[..., float], Tuple[float, ...]]:
+    """The compiled template of an expression and its numbers; raises ValueError if invalid
+
+    The value is ``function(constants, *numbers)``.
+    """
+    # split() gives text, number, degree suffix, text, number, ...
+    pieces = _NUMBER.split(text)
+    numbers = []
+    for slot in range(len(pieces) // 3):
+        value = float(pieces[3 * slot + 1])
+        numbers.append(math.radians(value) if pieces[3 * slot + 2] else value)
+        pieces[3 * slot + 1] = f"__n{slot}"
+        pieces[3 * slot + 2] = ''
+    try:
+        function = _compile_template(''.join(pieces), len(numbers))
+    except ValueError as e:
+        raise ValueError(f"{e} in expression {text!r}") from None
+    return function, tuple(numbers)
+
+
+def evaluate(text: str, constants: Mapping[str, float]) -> float:
+    """The value of expression ``text`` with the ``LET`` constants in ``constants``"""
+    function, numbers = compile_expression(text)
+    try:
+        return float(function(constants, *numbers))
+    except KeyError as e:
+        raise ValueError(f"Unknown name {e.args[0]} in expression {text!r}") from None
+    except (ArithmeticError, TypeError) as e:
+        raise ValueError(f"Cannot evaluate expression {text!r}: {e}") from None
+
+
+def check_name(name: str) -> None:
+    """Raise ValueError unless ``name`` can be defined with ``LET``"""
+    if not _NAME.match(name):
+        raise ValueError(f"Invalid constant name {name!r}")
+    if name in FUNCTIONS or name in CONSTANTS:
+        raise ValueError(f"Cannot redefine {name} with LET")
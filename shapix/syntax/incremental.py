@@ -0,0 +1,362 @@
+"""
+Incremental re-parsing of geometry syntax for editors
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from ..core.base import GeometricShape, Point
+from ..core.store import PointStore
+from .parser import GeometrySyntaxParser, Statement, SyntaxSource, tokenize
+
+
+class ParseDelta(NamedTuple):
+    """Shapes affected by an edit
+
+    ``changed`` lists shapes that were updated in place or whose points
+    moved; they keep their handles.
+    """
+    added: List[GeometricShape]
+    removed: List[GeometricShape]
+    changed: List[GeometricShape]
+
+
+class _Line:
+    """Parse state of one document line
+
+    ``uses`` maps the point names the statement refers to onto the points
+    they resolved to (None when undefined); ``defines`` holds the points it
+    bound to names, which later lines then resolve to.
+    """
+
+    __slots__ = ('text', 'statement', 'shapes', 'uses', 'defines', 'error')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.statement = tokenize(text)
+        self.shapes: List[GeometricShape] = []
+        self.uses: Dict[str, Optional[Point]] = {}
+        self.defines: Dict[str, Point] = {}
+        self.error: Optional[str] = None
+
+
+class IncrementalParser(GeometrySyntaxParser):
+    """A parser that re-parses only the lines an edit touches
+
+    ``parse`` works as usual but also records, for every line, the shapes it
+    produced, the point names it used and the points it defined. ``edit``
+    and ``replace_lines`` then change the document and re-run just the
+    changed lines, plus the lines whose point references resolve
+    differently afterwards (for example after a point is renamed).
+
+    Shapes and points keep their identity across edits: a line that still
+    produces shapes of the same classes updates them in place, and a
+    redefined point keeps its ``Point`` object and takes the new values, so
+    the shapes that reference it are notified through the point store.
+    Shapes created by an edit are inserted into ``shapes`` in document
+    order but join the end of their layer in ``scene``.
+
+    Lines that fail to parse (for instance a half-typed number) produce no
+    shapes; their messages are listed in ``errors``. Bulk ``POINTS``
+    statements define names that no single argument gives, and ``LET``
+    constants are not tracked per line, so both are reported as errors
+    here too; expressions using the built-in constants work.
+    """
+
+    #: Statement keyword -> number of leading arguments that name points
+    point_args: Dict[str, int] = {
+        'POINT': 1,
+        'TRIANGLE': 3,
+        'CIRCLE': 1,
+        'LINE': 2,
+        'ANGLE': 3,
+    }
+
+    # Positions looked up individually per edit before every line is numbered
+    POSITION_LOOKUPS = 16
+
+    def __init__(self, store: Optional[PointStore] = None):
+        super().__init__(store)
+        self._lines: List[_Line] = [_Line('')]
+        self._definers: Dict[str, List[_Line]] = {}
+        self._readers: Dict[str, List[_Line]] = {}
+        self._positions: Dict[int, int] = {}
+        self._emitted: List[GeometricShape] = []
+
+    @property
+    def text(self) -> str:
+        """The current document"""
+        return '\n'.join(line.text for line in self._lines)
+
+    @property
+    def line_count(self) -> int:
+        return len(self._lines)
+
+    @property
+    def errors(self) -> List[Tuple[int, str]]:
+        """(line number, message) for every line that failed to parse"""
+        return [(number, line.error) for number, line in enumerate(self._lines) if line.error]
+
+    def parse_iter(self, source: SyntaxSource) -> Iterator[GeometricShape]:
+        self._reset()
+        self._lines = []
+        self._definers = {}
+        self._readers = {}
+        if isinstance(source, str):
+            source = source.split('\n')
+        dispatch = self._dispatch()
+        ends_with_newline = True
+        for text in source:
+            ends_with_newline = text.endswith('\n')
+            line = _Line(text[:-1] if ends_with_newline else text)
+            self._lines.append(line)
+            line.shapes = self._evaluate(line, self.points, dispatch)
+            self._link(line)
+            for shape in line.shapes:
+                self.shapes.append(shape)
+                self.scene.add(shape)
+                yield shape
+        if ends_with_newline:
+            # A file ending in a newline (or an empty one) ends with an empty line
+            self._lines.append(_Line(''))
+
+    def edit(self, start: Tuple[int, int], end: Tuple[int, int], text: str) -> ParseDelta:
+        """Replace the text between two (line, column) positions, zero-based as in editor change events"""
+        (start_line, start_column), (end_line, end_column) = start, end
+        if not 0 <= start_line <= end_line < len(self._lines):
+            raise ValueError(f"Edit range {start}-{end} is outside the document ({len(self._lines)} lines)")
+        replaced = (self._lines[start_line].text[:start_column] + text +
+                    self._lines[end_line].text[end_column:])
+        return self.replace_lines(start_line, end_line + 1, replaced.split('\n'))
+
+    def replace_lines(self, start: int, stop: int, texts: Sequence[str]) -> ParseDelta:
+        """Replace lines ``start`` to ``stop`` (exclusive) with ``texts`` and re-parse what changed"""
+        if not 0 <= start <= stop <= len(self._lines):
+            raise ValueError(f"Line range {start}:{stop} is outside the document ({len(self._lines)} lines)")
+        dispatch = self._dispatch()
+        added: List[GeometricShape] = []
+        removed: List[GeometricShape] = []
+        changed: List[GeometricShape] = []
+        dirty: Set[str] = set()
+
+        # Lines beyond the replacement are dropped; the rest are reused in order
+        old = self._lines[start:stop]
+        kept = old[:len(texts)]
+        for line in old[len(texts):]:
+            self._unlink(line)
+            dirty.update(line.defines)
+            if line.shapes:
+                self._replace_shapes(line, 0, [], removed, added)
+        lines = kept + [_Line(text) for text in texts[len(kept):]]
+        self._lines[start:stop] = lines
+        self._positions = {id(line): start + offset for offset, line in enumerate(lines)}
+
+        for offset, (line, text) in enumerate(zip(lines, texts)):
+            if offset < len(kept):
+                line.text = text
+                statement = tokenize(text)
+                if statement == line.statement:
+                    continue
+                line.statement = statement
+            dirty |= self._reparse(line, start + offset, dirty, dispatch, added, removed, changed)
+
+        self._propagate(dirty, dispatch, added, removed, changed)
+        self._rebind(dirty)
+        self._positions = {}
+
+        # Report each updated shape once, and not at all if it was added or removed
+        unique: Dict[int, GeometricShape] = {}
+        for shape in changed:
+            unique.setdefault(shape.handle, shape)
+        for shape in added + removed:
+            unique.pop(shape.handle, None)
+        return ParseDelta(added, removed, list(unique.values()))
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def _add_shape(self, shape: GeometricShape) -> None:
+        # Collected per line; the caller decides where the shapes go
+        self._emitted.append(shape)
+
+    def _parse_points(self, statement: Statement) -> None:
+        raise ValueError("POINTS is not supported by IncrementalParser; use one POINT per line")
+
+    def _parse_let(self, statement: Statement) -> None:
+        raise ValueError("LET is not supported by IncrementalParser")
+
+    def _point_names(self, statement: Optional[Statement]) -> List[str]:
+        if statement is None:
+            return []
+        return statement.args[:self.point_args.get(statement.keyword, 0)]
+
+    def _evaluate(self, line: _Line, points: Dict[str, Point], dispatch) -> List[GeometricShape]:
+        """Run the handler for ``line`` with ``points`` as the visible names; return its shapes"""
+        line.error = None
+        statement = line.statement
+        handler = None if statement is None else dispatch.get(statement.keyword)
+        if handler is None:
+            line.uses = {}
+            line.defines = {}
+            return []
+
+        names = self._point_names(statement)
+        uses = {name: points.get(name) for name in names}
+        final_points, self.points = self.points, points
+        self._emitted = []
+        try:
+            handler(statement)
+        except ValueError as exc:
+            line.error = str(exc)
+            self._emitted = []
+            for name, point in uses.items():
+                if point is None:
+                    points.pop(name, None)
+                else:
+                    points[name] = point
+        finally:
+            self.points = final_points
+        line.uses = uses
+        line.defines = {name: points[name] for name in names
+                        if name in points and points[name] is not uses[name]}
+        return self._emitted
+
+    def _reparse(self, line: _Line, position: int, dirty: Set[str], dispatch,
+                 added: List[GeometricShape], removed: List[GeometricShape],
+                 changed: List[GeometricShape]) -> Set[str]:
+        """Re-run one line in place; return the names whose definition changed"""
+        old_uses, old_defines = line.uses, line.defines
+        self._unlink(line)
+
+        points: Dict[str, Point] = {}
+        for name in self._point_names(line.statement):
+            if name in old_uses and name not in dirty:
+                point = old_uses[name]
+            else:
+                point = self._binding(name, position)
+            if point is not None:
+                points[name] = point
+        shapes = self._evaluate(line, points, dispatch)
+
+        # A name the line defined before keeps its Point object
+        merged: Dict[int, Point] = {}
+        for name, point in line.defines.items():
+            previous = old_defines.get(name)
+            if previous is not None and previous is not point:
+                self._merge_point(previous, point, changed)
+                merged[id(point)] = previous
+                line.defines[name] = previous
+        if merged:
+            for shape in shapes:
+                shape.set_points([merged.get(id(point), point) for point in shape.get_points()])
+
+        self._link(line)
+        self._replace_shapes(line, position, shapes, removed, added, changed)
+        return {name for name in old_defines.keys() | line.defines.keys()
+                if old_defines.get(name) is not line.defines.get(name)}
+
+    def _merge_point(self, target: Point, source: Point, changed: List[GeometricShape]) -> None:
+        """Copy a redefined point's values into the Point that shapes already use"""
+        modified = False
+        for attribute in ('x', 'y', 'label', 'show_label', 'label_position'):
+            value = getattr(source, attribute)
+            if getattr(target, attribute) != value:
+                setattr(target, attribute, value)
+                modified = True
+        if modified:
+            changed.extend(target.store.dependents(target.index))
+
+    def _replace_shapes(self, line: _Line, position: int, shapes: List[GeometricShape],
+                        removed: List[GeometricShape], added: List[GeometricShape],
+                        changed: Optional[List[GeometricShape]] = None) -> None:
+        old_shapes = line.shapes
+        if not old_shapes and not shapes:
+            return
+        if changed is not None and len(old_shapes) == len(shapes) and shapes and \
+                all(type(old) is type(new) for old, new in zip(old_shapes, shapes)):
+            for old, new in zip(old_shapes, shapes):
+                old._assign(new)
+            changed.extend(old_shapes)
+            return
+
+        if old_shapes:
+            index = self.shapes.index(old_shapes[0])
+        else:
+            index = self._shape_index(position)
+        self.shapes[index:index + len(old_shapes)] = shapes
+        for shape in old_shapes:
+            self.scene.remove(shape)
+        for shape in shapes:
+            self.scene.add(shape)
+        removed.extend(old_shapes)
+        added.extend(shapes)
+        line.shapes = shapes
+
+    def _shape_index(self, position: int) -> int:
+        """Index in ``shapes`` where the shapes of the line at ``position`` belong"""
+        for line in reversed(self._lines[:position]):
+            if line.shapes:
+                return self.shapes.index(line.shapes[-1]) + 1
+        return 0
+
+    # ------------------------------------------------------------------
+    # Name resolution
+    # ------------------------------------------------------------------
+
+    def _link(self, line: _Line) -> None:
+        for name in line.uses:
+            self._readers.setdefault(name, []).append(line)
+        for name in line.defines:
+            self._definers.setdefault(name, []).append(line)
+
+    def _unlink(self, line: _Line) -> None:
+        for index, names in ((self._readers, line.uses), (self._definers, line.defines)):
+            for name in names:
+                lines = index[name]
+                lines.remove(line)
+                if not lines:
+                    del index[name]
+
+    def _position(self, line: _Line) -> int:
+        position = self._positions.get(id(line))
+        if position is None:
+            if len(self._positions) < self.POSITION_LOOKUPS:
+                position = self._positions[id(line)] = self._lines.index(line)
+            else:
+                # Many lookups in one edit: number every line once instead
+                self._positions = {id(line): index for index, line in enumerate(self._lines)}
+                position = self._positions[id(line)]
+        return position
+
+    def _binding(self, name: str, position: int) -> Optional[Point]:
+        """The point ``name`` refers to on the line at ``position``: the last definition above it"""
+        best, best_position = None, -1
+        for line in self._definers.get(name, ()):
+            line_position = self._position(line)
+            if best_position < line_position < position:
+                best, best_position = line, line_position
+        return None if best is None else best.defines[name]
+
+    def _propagate(self, dirty: Set[str], dispatch, added: List[GeometricShape],
+                   removed: List[GeometricShape], changed: List[GeometricShape]) -> None:
+        """Re-run the lines whose references to redefined names now resolve differently"""
+        pending = set(dirty)
+        while pending:
+            name = pending.pop()
+            readers = sorted(self._readers.get(name, ()), key=self._position)
+            for line in readers:
+                position = self._position(line)
+                if line.uses.get(name) is not self._binding(name, position):
+                    redefined = self._reparse(line, position, dirty, dispatch, added, removed, changed)
+                    pending |= redefined - dirty
+                    dirty |= redefined
+
+    def _rebind(self, names: Set[str]) -> None:
+        """Point ``points`` at the last definition of each name"""
+        for name in names:
+            definers = self._definers.get(name)
+            if not definers:
+                self.points.pop(name, None)
+            else:
+                last = definers[0] if len(definers) == 1 else max(definers, key=self._position)
+                self.points[name] = last.defines[name]
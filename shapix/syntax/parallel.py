@@ -0,0 +1,140 @@
+"""
+Chunked parallel parsing for shapix
+
+``GeometrySyntaxParser.parse_parallel`` splits the text at line boundaries
+into chunks that worker processes parse on their own; a ``POINTS`` block
+is never split. A worker cannot see the points defined in earlier chunks,
+so a name its chunk uses before defining it resolves to a placeholder
+point. The chunk comes back in the compiled scene format (see
+``compiled``), which is much cheaper to turn into shapes than the text is
+to parse.
+
+The merge step takes the chunks in file order. It binds every placeholder
+to the point that name has after the earlier chunks, builds the shapes and
+records the chunk's own definitions. A name that no earlier chunk defines
+gets a default point in a serial parse, so such a chunk (like one whose
+worker failed) is parsed again serially instead.
+
+``LET`` lines are also evaluated while chunking, so every worker starts
+with the constants defined before its chunk.
+"""
+
+import itertools
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from ..core.base import Point
+from .compiled import CompiledScene, encode_compiled
+from .parser import SyntaxSource, _gc_paused, tokenize
+
+if TYPE_CHECKING:
+    from .parser import GeometrySyntaxParser
+
+# (compiled chunk, (name, point index) defined by the chunk, (name, point index) it uses from earlier chunks)
+ParsedChunk = Tuple[bytes, List[Tuple[str, int]], List[Tuple[str, int]]]
+
+
+class _ChunkPoints(dict):
+    """The points a chunk defines; other names get one placeholder each"""
+
+    def __init__(self):
+        super().__init__()
+        self.placeholders: Dict[str, Point] = {}
+
+    def get(self, name: str, default: Optional[Point] = None) -> Point:
+        point = dict.get(self, name)
+        if point is None:
+            point = self.placeholders.get(name)
+            if point is None:
+                point = self.placeholders[name] = Point(0, 0, name)
+        return point
+
+
+def _parse_chunk(parser_class: type, lines: List[str], constants: Dict[str, float]) -> ParsedChunk:
+    """Process pool task: parse one chunk with a fresh parser and compile it"""
+    parser = parser_class()
+    parser.points = points = _ChunkPoints()
+    parser.constants.update(constants)
+    with _gc_paused():
+        for _ in parser._parse_lines(lines, parser._dispatch()):
+            pass
+    data, index = encode_compiled(parser.shapes, points)
+    defined = [(name, index[id(point)]) for name, point in points.items()]
+    used = [(name, index[id(point)]) for name, point in points.placeholders.items() if id(point) in index]
+    return data, defined, used
+
+
+def _opens_block(chunk: List[str]) -> bool:
+    """Whether ``chunk`` ends inside a POINTS ... END block"""
+    for line in reversed(chunk):
+        stripped = line.lstrip()
+        if stripped.startswith(('POINTS', 'END')):
+            statement = tokenize(stripped)
+            if statement.keyword == 'END':
+                return False
+            if statement.keyword == 'POINTS':
+                return statement.args[:1] != ['FROM']
+    return False
+
+
+def _line_chunks(source: SyntaxSource, size: int) -> Iterator[List[str]]:
+    lines = iter(source.split('\n') if isinstance(source, str) else source)
+    while True:
+        chunk = list(itertools.islice(lines, size))
+        if not chunk:
+            return
+        # A POINTS block stays in one chunk
+        if _opens_block(chunk):
+            for line in lines:
+                chunk.append(line)
+                if line.split()[:1] == ['END']:
+                    break
+        yield chunk
+
+
+def parse_chunks(parser: 'GeometrySyntaxParser', source: SyntaxSource, workers: int, chunk_lines: int) -> None:
+    """Parse ``source`` into ``parser`` with ``workers`` processes (see the module docstring)"""
+    parser._reset()
+    dispatch = parser._dispatch()
+    # LET constants as of the start of the next chunk, tracked while chunking
+    tracker = type(parser)()
+    let = {'LET': tracker._parse_let}
+    # Keep a bounded window of chunks in flight so huge files stream lazily
+    pending: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for lines in _line_chunks(source, chunk_lines):
+            # The arguments are pickled later, so the worker gets a copy
+            future = pool.submit(_parse_chunk, type(parser), lines, dict(tracker.constants))
+            for _ in tracker._parse_lines([line for line in lines if line.lstrip().startswith('LET')], let):
+                pass
+            pending.append((future, lines, dict(tracker.constants)))
+            if len(pending) >= workers * 2:
+                _merge(parser, dispatch, *pending.popleft())
+        while pending:
+            _merge(parser, dispatch, *pending.popleft())
+
+
+def _merge(parser: 'GeometrySyntaxParser', dispatch, future: Future, lines: List[str],
+           constants: Dict[str, float]) -> None:
+    """Add one chunk's shapes, points and constants to ``parser``, in file order"""
+    try:
+        data, defined, used = future.result()
+    except Exception:
+        # Parsing serially raises the same error at the same line
+        data = None
+    if data is not None:
+        points = parser.points
+        bound = [(index, points.get(name)) for name, index in used]
+        if all(point is not None for _, point in bound):
+            chunk = CompiledScene(data, parser.store)
+            chunk._points.update(bound)
+            for shape in chunk.shapes:
+                parser._add_shape(shape)
+            for name, index in defined:
+                points[name] = chunk.point(index)
+            chunk.close()
+            parser.constants.update(constants)
+            return
+    for _ in parser._parse_lines(lines, dispatch):
+        pass
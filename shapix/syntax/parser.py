@@ -2,257 +2,497 @@
 Geometry syntax parser for shapix
 """
 
-import re
-from typing import List, Dict, Any, Optional
+import contextlib
+import functools
+import gc
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
 from ..core.base import Point, GeometricShape
+from ..core.scene import Scene
+from ..core.store import PointStore
 from ..shapes.triangle import Triangle
 from ..shapes.circle import Circle
 from ..shapes.line import Line
 from ..shapes.angle import Angle
 from ..shapes.point import PointShape
+from .expressions import check_name, evaluate
+from .pointfile import PointTable, read_points
+
+
+class Statement(NamedTuple):
+    """One tokenized line of geometry syntax
+
+    ``args`` holds the bare positional tokens after the keyword, ``label``
+    the first standalone quoted string (without quotes) and ``props`` the
+    ``key=value`` pairs in the order they appear.
+    """
+    keyword: str
+    args: List[str]
+    label: Optional[str]
+    props: Dict[str, str]
+
+
+# NamedTuple's generated __new__ adds a Python-level call per line
+_new_statement = functools.partial(tuple.__new__, Statement)
+
+
+def tokenize(line: str) -> Optional[Statement]:
+    """Split one line into a Statement in a single pass
+
+    Tokens are separated by whitespace; double quotes delimit strings that
+    may contain spaces, and a quoted string directly after ``key=`` is that
+    property's value. Returns None for blank lines and ``#`` comments.
+    """
+    line = line.strip()
+    if not line or line[0] == '#':
+        return None
+
+    args: List[str] = []
+    props: Dict[str, str] = {}
+    if '"' not in line:
+        # Common case: nothing is quoted, so whitespace splitting is exact
+        tokens = line.split()
+        for token in tokens[1:]:
+            if '=' in token:
+                key, _, value = token.partition('=')
+                props[key] = value
+            else:
+                args.append(token)
+        return _new_statement((tokens[0], args, None, props))
+
+    # Even pieces are unquoted text, odd pieces quoted strings; an
+    # unterminated quote is kept as literal text
+    pieces = line.split('"')
+    if len(pieces) % 2 == 0:
+        pieces[-2:] = [pieces[-2] + '"' + pieces[-1]]
+    keyword = None
+    label = None
+    pending_key = None
+    for position, piece in enumerate(pieces):
+        if position % 2:
+            if pending_key is not None:
+                props[pending_key] = piece
+                pending_key = None
+            elif label is None:
+                label = piece
+            continue
+        tokens = piece.split()
+        if keyword is None and tokens:
+            keyword = tokens.pop(0)
+        if tokens and position + 1 < len(pieces) and tokens[-1][-1] == '=' and not piece[-1].isspace():
+            pending_key = tokens.pop()[:-1]
+        for token in tokens:
+            if '=' in token:
+                key, _, value = token.partition('=')
+                props[key] = value
+            else:
+                args.append(token)
+    return _new_statement((keyword or '', args, label, props))
+
+
+# Geometry syntax as one string, or as lines from any iterable such as an open file
+SyntaxSource = Union[str, Iterable[str]]
+
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Suspend cyclic garbage collection, restoring its previous state on exit
+
+    Parsing allocates many long-lived objects and little garbage; cyclic
+    collections triggered along the way would only rescan them.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _to_bool(value: str) -> bool:
+    return value.lower() in ('true', '1', 'yes', 'on')
+
+
+# Property name -> (attribute, converter); shape-specific tables extend the common one
+PropertyTable = Dict[str, Tuple[str, Callable[[str], object]]]
+
+_COMMON_PROPERTIES: PropertyTable = {
+    'color': ('color', str),
+    'fill_color': ('fill_color', str),
+    'line_width': ('line_width', int),
+    'font_size': ('font_size', int),
+    'text_color': ('text_color', str),
+    'visible': ('visible', _to_bool),
+    'layer': ('layer', int),
+}
+
+_POINT_PROPERTIES: PropertyTable = {
+    'show_label': ('show_label', _to_bool),
+    'label_position': ('label_position', str),
+}
+
+_CIRCLE_PROPERTIES: PropertyTable = dict(_COMMON_PROPERTIES, **{
+    'show_center': ('show_center', _to_bool),
+    'show_radius_line': ('show_radius_line', _to_bool),
+})
+
+_LINE_PROPERTIES: PropertyTable = dict(_COMMON_PROPERTIES, **{
+    'show_endpoints': ('show_endpoints', _to_bool),
+    'show_length': ('show_length', _to_bool),
+})
+
+_TRIANGLE_PROPERTIES: PropertyTable = dict(_COMMON_PROPERTIES, **{
+    'show_vertices': ('show_vertices', _to_bool),
+    'show_angles': ('show_angles', _to_bool),
+})
+
+_ANGLE_PROPERTIES: PropertyTable = dict(_COMMON_PROPERTIES, **{
+    'arc': ('show_arc', _to_bool),
+    'show_measure': ('show_measure', _to_bool),
+    'arc_radius': ('arc_radius', float),
+})
 
 
 class GeometrySyntaxParser:
-    """Parses text-based geometry syntax into shape objects"""
+    """Parses text-based geometry syntax into shape objects
+    
+    Points are allocated from ``store``, or from the shared default
+    ``PointStore`` when none is given. Each parse also builds a ``Scene``
+    (``parse_scene`` returns it) for lookups by name, type and layer.
+    
+    Each line is tokenized once (see ``tokenize``) and dispatched on its
+    keyword through ``handlers``; subclasses can add keywords by extending
+    that mapping.
+    """
+    
+    #: Statement keyword -> name of the method that handles it
+    handlers: Dict[str, str] = {
+        'POINT': '_parse_point',
+        'TRIANGLE': '_parse_triangle',
+        'CIRCLE': '_parse_circle',
+        'LINE': '_parse_line_shape',
+        'ANGLE': '_parse_angle',
+        'POINTS': '_parse_points',
+        'LET': '_parse_let',
+    }
     
-    def __init__(self):
+    def __init__(self, store: Optional[PointStore] = None):
+        self.store = store
         self.shapes: List[GeometricShape] = []
         self.points: Dict[str, Point] = {}
-        self.named_shapes: Dict[str, GeometricShape] = {}
+        self.constants: Dict[str, float] = {}
+        self.scene = Scene()
+        # Lines still to be read, for statements that span several lines
+        self._source: Optional[Iterator[str]] = None
     
-    def parse(self, syntax: str) -> List[GeometricShape]:
-        """Parse geometry syntax and return list of shapes"""
-        self.shapes.clear()
-        self.points.clear()
-        self.named_shapes.clear()
+    @property
+    def named_shapes(self) -> Dict[str, int]:
+        """Names of the parsed shapes, mapped to their handles"""
+        return self.scene.names
+    
+    def parse(self, syntax: SyntaxSource) -> List[GeometricShape]:
+        """Parse geometry syntax and return list of shapes
         
-        lines = [line.strip() for line in syntax.split('\n') if line.strip()]
+        ``syntax`` is a string or any iterable of lines, such as an open file.
+        """
+        with _gc_paused():
+            for _ in self.parse_iter(syntax):
+                pass
+        return self.shapes
+    
+    def parse_iter(self, source: SyntaxSource) -> Iterator[GeometricShape]:
+        """Parse lazily, yielding each shape as soon as its line is read
         
-        for line in lines:
-            if line.startswith('#') or not line:
-                continue
-            self._parse_line(line)
+        ``source`` is a string or any iterable of lines; an open file is read
+        one line at a time, so the text is never held in memory as a whole.
+        Points are resolved against the points defined so far, and the shapes
+        are still collected in ``shapes`` and ``scene``.
+        """
+        self._reset()
+        if isinstance(source, str):
+            source = source.split('\n')
+        yield from self._parse_lines(source, self._dispatch())
+    
+    def _parse_lines(self, lines: Iterable[str],
+                     dispatch: Dict[str, Callable[[Statement], None]]) -> Iterator[GeometricShape]:
+        """Parse lines on top of the current state, yielding the new shapes"""
+        shapes = self.shapes
+        self._source = lines = iter(lines)
+        try:
+            for line in lines:
+                statement = tokenize(line)
+                if statement is not None:
+                    handler = dispatch.get(statement.keyword)
+                    if handler is not None:
+                        count = len(shapes)
+                        handler(statement)
+                        yield from shapes[count:]
+        finally:
+            self._source = None
+    
+    def parse_parallel(self, syntax: SyntaxSource, workers: Optional[int] = None,
+                       chunk_lines: int = 20000) -> List[GeometricShape]:
+        """Parse geometry syntax with the work spread over worker processes
         
+        The text is split into chunks of ``chunk_lines`` lines that worker
+        processes (default: one per CPU) parse independently. The chunks are
+        then merged in order, resolving names defined in earlier chunks, so
+        ``shapes``, ``points`` and ``scene`` end up as after ``parse``. The
+        final shapes are still built in this process, which bounds the
+        speedup. With ``workers=1`` this is ``parse``.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            return self.parse(syntax)
+        from .parallel import parse_chunks
+        with _gc_paused():
+            parse_chunks(self, syntax, workers, chunk_lines)
         return self.shapes
     
-    def _parse_line(self, line: str) -> None:
-        """Parse a single line of syntax"""
-        if line.startswith('POINT'):
-            self._parse_point(line)
-        elif line.startswith('TRIANGLE'):
-            self._parse_triangle(line)
-        elif line.startswith('CIRCLE'):
-            self._parse_circle(line)
-        elif line.startswith('LINE'):
-            self._parse_line_shape(line)
-        elif line.startswith('ANGLE'):
-            self._parse_angle(line)
+    def _reset(self) -> None:
+        """Forget the previous parse"""
+        self.shapes.clear()
+        self.points.clear()
+        self.constants.clear()
+        self.scene = Scene()
+    
+    def _dispatch(self) -> Dict[str, Callable[[Statement], None]]:
+        """Bound handler for each keyword in ``handlers``"""
+        return {keyword: getattr(self, name) for keyword, name in self.handlers.items()}
     
-    def _parse_point(self, line: str) -> None:
+    def parse_scene(self, syntax: SyntaxSource) -> Scene:
+        """Parse geometry syntax (a string or an iterable of lines) into a new Scene"""
+        self.parse(syntax)
+        return self.scene
+    
+    def _parse_point(self, statement: Statement) -> None:
         """Parse point definition: POINT A 10 20 "Label" show_label=true label_position=top_right"""
-        parts = self._split_line(line)
-        if len(parts) >= 4:
-            name = parts[1]
-            x, y = float(parts[2]), float(parts[3])
-            
-            # Extract label (quoted string or name)
-            label = self._extract_quoted_string(line) or name
-            
-            # Create point
-            point = Point(x, y, label)
-            
-            # Parse properties
-            props = self._parse_properties(line)
-            if 'show_label' in props:
-                point.show_label = self._parse_bool(props['show_label'])
-            if 'label_position' in props:
-                point.label_position = props['label_position']
+        args = statement.args
+        if len(args) >= 3:
+            name = args[0]
+            point = Point(self._number(args[1]), self._number(args[2]), statement.label or name,
+                          store=self.store)
+            self._apply_properties(point, statement.props, _POINT_PROPERTIES)
             
             # Store point for reference
             self.points[name] = point
             
             # Create point shape for rendering
             point_shape = PointShape(point, f"point_{name}")
-            self._apply_common_properties(point_shape, props)
-            self.shapes.append(point_shape)
+            self._apply_properties(point_shape, statement.props, _COMMON_PROPERTIES)
+            self._add_shape(point_shape)
     
-    def _parse_circle(self, line: str) -> None:
+    def _parse_circle(self, statement: Statement) -> None:
         """Parse circle definition: CIRCLE O 50 color=blue"""
-        parts = self._split_line(line)
-        if len(parts) >= 3:
-            center_name = parts[1]
-            radius = float(parts[2])
+        args = statement.args
+        if len(args) >= 2:
+            center_name = args[0]
+            radius = self._number(args[1])
             
             # Get or create center point
-            if center_name in self.points:
-                center = self.points[center_name]
-            else:
-                center = Point(0, 0, center_name)
-                self.points[center_name] = center
+            center = self.points.get(center_name)
+            if center is None:
+                center = self.points[center_name] = Point(0, 0, center_name, store=self.store)
             
-            # Create circle
             circle = Circle(center, radius, f"circle_{center_name}")
-            
-            # Parse properties
-            props = self._parse_properties(line)
-            self._apply_common_properties(circle, props)
-            
-            if 'show_center' in props:
-                circle.show_center = self._parse_bool(props['show_center'])
-            if 'show_radius_line' in props:
-                circle.show_radius_line = self._parse_bool(props['show_radius_line'])
-            
-            self.shapes.append(circle)
+            self._apply_properties(circle, statement.props, _CIRCLE_PROPERTIES)
+            self._add_shape(circle)
     
-    def _parse_line_shape(self, line: str) -> None:
+    def _parse_line_shape(self, statement: Statement) -> None:
         """Parse line definition: LINE A B color=red"""
-        parts = self._split_line(line)
-        if len(parts) >= 3:
-            start_name = parts[1]
-            end_name = parts[2]
+        args = statement.args
+        if len(args) >= 2:
+            start_name, end_name = args[0], args[1]
             
-            # Get points
-            start_point = self.points.get(start_name, Point(0, 0, start_name))
-            end_point = self.points.get(end_name, Point(100, 0, end_name))
+            # Get points; missing ones get a default position but are not registered
+            start_point = self.points.get(start_name)
+            if start_point is None:
+                start_point = Point(0, 0, start_name, store=self.store)
+            end_point = self.points.get(end_name)
+            if end_point is None:
+                end_point = Point(100, 0, end_name, store=self.store)
             
-            # Create line
             line_shape = Line(start_point, end_point, f"line_{start_name}_{end_name}")
-            
-            # Parse properties
-            props = self._parse_properties(line)
-            self._apply_common_properties(line_shape, props)
-            
-            if 'show_endpoints' in props:
-                line_shape.show_endpoints = self._parse_bool(props['show_endpoints'])
-            if 'show_length' in props:
-                line_shape.show_length = self._parse_bool(props['show_length'])
-            
-            self.shapes.append(line_shape)
+            self._apply_properties(line_shape, statement.props, _LINE_PROPERTIES)
+            self._add_shape(line_shape)
     
-    def _parse_triangle(self, line: str) -> None:
+    def _parse_triangle(self, statement: Statement) -> None:
         """Parse triangle definition: TRIANGLE A B C color=green"""
-        parts = self._split_line(line)
-        if len(parts) >= 4:
-            vertex_names = [parts[1], parts[2], parts[3]]
+        args = statement.args
+        if len(args) >= 3:
+            vertex_names = args[:3]
             
-            # Get or create vertices
+            # Get or create vertices, placing missing ones at default positions
             vertices = []
-            for name in vertex_names:
-                if name in self.points:
-                    vertices.append(self.points[name])
-                else:
-                    # Create default positioned vertices
-                    if len(vertices) == 0:
-                        vertices.append(Point(-50, 50, name))
-                    elif len(vertices) == 1:
-                        vertices.append(Point(50, 50, name))
-                    else:
-                        vertices.append(Point(0, -50, name))
-                    self.points[name] = vertices[-1]
+            for name, (x, y) in zip(vertex_names, ((-50, 50), (50, 50), (0, -50))):
+                vertex = self.points.get(name)
+                if vertex is None:
+                    vertex = self.points[name] = Point(x, y, name, store=self.store)
+                vertices.append(vertex)
             
-            # Create triangle
             triangle = Triangle(vertices[0], vertices[1], vertices[2], f"triangle_{'_'.join(vertex_names)}")
-            
-            # Parse properties
-            props = self._parse_properties(line)
-            self._apply_common_properties(triangle, props)
-            
-            if 'show_vertices' in props:
-                triangle.show_vertices = self._parse_bool(props['show_vertices'])
-            if 'show_angles' in props:
-                triangle.show_angles = self._parse_bool(props['show_angles'])
-            
-            self.shapes.append(triangle)
+            self._apply_properties(triangle, statement.props, _TRIANGLE_PROPERTIES)
+            self._add_shape(triangle)
     
-    def _parse_angle(self, line: str) -> None:
+    def _parse_angle(self, statement: Statement) -> None:
         """Parse angle definition: ANGLE A O B color=red arc=true show_measure=true"""
-        parts = self._split_line(line)
-        if len(parts) >= 4:
-            point1_name = parts[1]
-            vertex_name = parts[2]
-            point2_name = parts[3]
+        args = statement.args
+        if len(args) >= 3:
+            point1_name, vertex_name, point2_name = args[:3]
             
-            # Get or create points
-            point1 = self.points.get(point1_name, Point(-50, 0, point1_name))
-            vertex = self.points.get(vertex_name, Point(0, 0, vertex_name))
-            point2 = self.points.get(point2_name, Point(50, 50, point2_name))
+            # Get points; missing ones get a default position but are not registered
+            point1 = self.points.get(point1_name)
+            if point1 is None:
+                point1 = Point(-50, 0, point1_name, store=self.store)
+            vertex = self.points.get(vertex_name)
+            if vertex is None:
+                vertex = Point(0, 0, vertex_name, store=self.store)
+            point2 = self.points.get(point2_name)
+            if point2 is None:
+                point2 = Point(50, 50, point2_name, store=self.store)
             
-            # Create angle
             angle = Angle(point1, vertex, point2, f"angle_{point1_name}_{vertex_name}_{point2_name}")
-            
-            # Parse properties
-            props = self._parse_properties(line)
-            self._apply_common_properties(angle, props)
-            
-            if 'arc' in props:
-                angle.show_arc = self._parse_bool(props['arc'])
-            if 'show_measure' in props:
-                angle.show_measure = self._parse_bool(props['show_measure'])
-            if 'arc_radius' in props:
-                angle.arc_radius = float(props['arc_radius'])
-            
-            self.shapes.append(angle)
+            self._apply_properties(angle, statement.props, _ANGLE_PROPERTIES)
+            self._add_shape(angle)
     
-    def _split_line(self, line: str) -> List[str]:
-        """Split line into parts, handling quoted strings"""
-        # Remove quoted strings temporarily
-        quoted_pattern = r'"[^"]*"'
-        quotes = re.findall(quoted_pattern, line)
-        temp_line = re.sub(quoted_pattern, '___QUOTE___', line)
+    def _parse_points(self, statement: Statement) -> None:
+        """Parse many points at once: POINTS FROM "points.csv" prefix=P, or a block
+        
+        A block lists one point per line as ``name x y ["label"]``, or just
+        ``x y`` for a generated name, and ends with a line reading ``END``:
         
-        # Split by whitespace
-        parts = temp_line.split()
+            POINTS show_label=false
+            A 0 0 "Apex"
+            B 10 0
+            END
         
-        # Restore quoted strings
-        quote_index = 0
-        for i, part in enumerate(parts):
-            if part == '___QUOTE___' and quote_index < len(quotes):
-                parts[i] = quotes[quote_index]
-                quote_index += 1
+        Generated names are ``prefix`` (default ``P``) followed by the row
+        number, counted from 0. Relative file names are resolved against the
+        working directory. Properties apply to every point.
+        """
+        args = statement.args
+        prefix = statement.props.get('prefix', 'P')
+        if args and args[0] == 'FROM':
+            path = statement.label or (args[1] if len(args) > 1 else None)
+            if path is None:
+                raise ValueError("POINTS FROM needs a file name")
+            table = read_points(path)
+        else:
+            table = self._read_points_block(prefix)
         
-        return parts
+        count = len(table.x)
+        names = table.names or [f"{prefix}{row}" for row in range(count)]
+        labels = names if table.labels is None else [
+            name if label is None else label for name, label in zip(names, table.labels)]
+        props = statement.props
+        show_label = _to_bool(props['show_label']) if 'show_label' in props else True
+        points = Point.create_many(table.x, table.y, labels, show_label,
+                                   props.get('label_position', 'top_right'), store=self.store)
+        
+        # Convert the shape properties once for all the point shapes
+        attributes = []
+        for key, value in props.items():
+            entry = _COMMON_PROPERTIES.get(key)
+            if entry is not None:
+                attribute, convert = entry
+                attributes.append((attribute, convert(value)))
+        registry = self.points
+        add_shape = self._add_shape
+        for name, point in zip(names, points):
+            registry[name] = point
+            point_shape = PointShape(point, f"point_{name}")
+            for attribute, value in attributes:
+                setattr(point_shape, attribute, value)
+            add_shape(point_shape)
     
-    def _extract_quoted_string(self, line: str) -> Optional[str]:
-        """Extract the first quoted string from line"""
-        match = re.search(r'"([^"]*)"', line)
-        return match.group(1) if match else None
+    def _read_points_block(self, prefix: str) -> PointTable:
+        """Read the rows of a POINTS block up to its END line"""
+        lines = self._source
+        if lines is None:
+            raise ValueError("POINTS blocks can only be parsed together with the lines that follow them")
+        names: List[str] = []
+        xs: List[str] = []
+        ys: List[str] = []
+        labels: List[Optional[str]] = []
+        for line in lines:
+            if '"' in line:
+                row = tokenize(line)
+                if row is None:
+                    continue
+                tokens = [row.keyword] + row.args
+                label = row.label
+            else:
+                tokens = line.split()
+                label = None
+                if not tokens or tokens[0][0] == '#':
+                    continue
+            if tokens[0] == 'END':
+                break
+            if len(tokens) == 2:
+                tokens.insert(0, f"{prefix}{len(names)}")
+            elif len(tokens) != 3:
+                raise ValueError(f"Expected 'name x y' in POINTS block, got {line.strip()!r}")
+            names.append(tokens[0])
+            xs.append(tokens[1])
+            ys.append(tokens[2])
+            labels.append(label)
+        else:
+            raise ValueError("POINTS block is missing END")
+        return PointTable(self._numbers(xs), self._numbers(ys), names, labels)
+    
+    def _parse_let(self, statement: Statement) -> None:
+        """Parse constant definitions: LET r = 100, or LET r=100 h=r*sqrt(3)/2"""
+        args, props = statement.args, statement.props
+        if len(args) >= 2 and props == {'': ''}:
+            # A lone '=' token; the expression may contain spaces too
+            definitions = [(args[0], ''.join(args[1:]))]
+        elif not args and props and all(key and value for key, value in props.items()):
+            definitions = list(props.items())
+        else:
+            raise ValueError("Expected 'LET name = expression' or 'LET name=expression ...'")
+        for name, expression in definitions:
+            check_name(name)
+            self.constants[name] = self._number(expression)
+    
+    def _number(self, token: str) -> float:
+        """The value of a number or expression token (see ``expressions``)"""
+        try:
+            return float(token)
+        except ValueError:
+            return evaluate(token, self.constants)
+    
+    def _numbers(self, tokens: List[str]) -> np.ndarray:
+        """``_number`` for many tokens; plain numbers are converted in one NumPy call"""
+        try:
+            return np.array(tokens, dtype=np.float64)
+        except ValueError:
+            return np.array([self._number(token) for token in tokens], dtype=np.float64)
     
     def _parse_properties(self, line: str) -> Dict[str, str]:
         """Parse key=value properties from line"""
-        props = {}
-        
-        # Find all key=value pairs
-        pattern = r'(\w+)=([^\s]+)'
-        matches = re.findall(pattern, line)
-        
-        for key, value in matches:
-            # Remove quotes if present
-            if value.startswith('"') and value.endswith('"'):
-                value = value[1:-1]
-            props[key] = value
-        
-        return props
+        statement = tokenize(line)
+        return statement.props if statement is not None else {}
     
     def _parse_bool(self, value: str) -> bool:
         """Parse boolean value from string"""
-        return value.lower() in ('true', '1', 'yes', 'on')
+        return _to_bool(value)
+    
+    def _apply_properties(self, target, props: Dict[str, str], table: PropertyTable) -> None:
+        """Set the attributes named in ``table`` from matching properties; others are ignored"""
+        for key, value in props.items():
+            entry = table.get(key)
+            if entry is not None:
+                attribute, convert = entry
+                setattr(target, attribute, convert(value))
     
-    def _apply_common_properties(self, shape: GeometricShape, props: Dict[str, str]) -> None:
-        """Apply common properties to a shape"""
-        if 'color' in props:
-            shape.color = props['color']
-        if 'fill_color' in props:
-            shape.fill_color = props['fill_color']
-        if 'line_width' in props:
-            shape.line_width = int(props['line_width'])
-        if 'font_size' in props:
-            shape.font_size = int(props['font_size'])
-        if 'text_color' in props:
-            shape.text_color = props['text_color']
-        if 'visible' in props:
-            shape.visible = self._parse_bool(props['visible'])
-        if 'layer' in props:
-            shape.layer = int(props['layer'])
+    def _add_shape(self, shape: GeometricShape) -> None:
+        """Append a parsed shape and add it to the scene"""
+        self.shapes.append(shape)
+        self.scene.add(shape)
     
     def get_point(self, name: str) -> Optional[Point]:
         """Get a point by name"""
@@ -260,4 +500,4 @@ class GeometrySyntaxParser:
     
     def get_shape(self, name: str) -> Optional[GeometricShape]:
         """Get a shape by name"""
-        return self.named_shapes.get(name)
\ No newline at end of file
+        return self.scene.get(name)
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Point tables for the bulk ``POINTS`` syntax
+
+``POINTS FROM "file"`` loads coordinates from a CSV or ``.npy`` file
+through ``read_points``:
+
+- CSV: an optional header row names the columns ``x``, ``y`` and
+  optionally ``name`` and ``label``. Without a header the columns are
+  ``x,y``, ``name,x,y`` or ``name,x,y,label``. Lines starting with ``#``
+  are skipped.
+- ``.npy``: an (N, 2) numeric array of x and y, or a structured array with
+  ``x`` and ``y`` fields and optional ``name`` and ``label`` fields.
+
+Files with only coordinates are read by NumPy in one call; text columns
+go through the ``csv`` module so that quoted labels may contain commas.
+"""
+
+import csv
+import itertools
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+
+class PointTable(NamedTuple):
+    """Coordinates of many points, with optional names and labels
+
+    A missing (None) ``names`` list means the names are generated; a
+    missing label means the point is labelled with its name.
+    """
+    x: np.ndarray
+    y: np.ndarray
+    names: Optional[List[str]] = None
+    labels: Optional[List[Optional[str]]] = None
+
+
+_COLUMNS = ('name', 'x', 'y', 'label')
+
+# Column order of headerless CSV files, by column count
+_DEFAULT_COLUMNS = {
+    2: ('x', 'y'),
+    3: ('name', 'x', 'y'),
+    4: ('name', 'x', 'y', 'label'),
+}
+
+
+def read_points(path: str) -> PointTable:
+    """Read a point table from a CSV or ``.npy`` file (see the module docstring)
+
+    Raises ValueError when the file's layout is not one of the above.
+    """
+    if path.lower().endswith('.npy'):
+        return _read_npy(path)
+    return _read_csv(path)
+
+
+def _read_npy(path: str) -> PointTable:
+    array = np.load(path, allow_pickle=False)
+    fields = array.dtype.names
+    if fields is not None:
+        if 'x' not in fields or 'y' not in fields:
+            raise ValueError(f"{path}: a structured point array needs x and y fields")
+        array = array.ravel()
+        names = array['name'].astype(str).tolist() if 'name' in fields else None
+        labels = array['label'].astype(str).tolist() if 'label' in fields else None
+        return PointTable(array['x'].astype(np.float64), array['y'].astype(np.float64), names, labels)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"{path}: expected an (N, 2) array of coordinates, got shape {array.shape}")
+    array = array.astype(np.float64)
+    return PointTable(array[:, 0], array[:, 1])
+
+
+def _data_lines(stream) -> Iterator[str]:
+    """The lines of ``stream`` that are neither blank nor comments"""
+    return (line for line in stream if line.strip() and not line.startswith('#'))
+
+
+def _read_csv(path: str) -> PointTable:
+    with open(path, newline='', encoding='utf-8') as stream:
+        first = next(csv.reader(_data_lines(stream)), None)
+    if first is None:
+        return PointTable(np.empty(0), np.empty(0))
+
+    header = [field.strip().lower() for field in first]
+    if 'x' in header and 'y' in header:
+        unknown = [field for field in header if field not in _COLUMNS]
+        if unknown:
+            raise ValueError(f"{path}: unknown point columns {', '.join(unknown)}")
+        skip = 1
+    else:
+        header = _DEFAULT_COLUMNS.get(len(first))
+        if header is None:
+            raise ValueError(f"{path}: expected 2 to 4 columns, found {len(first)}")
+        skip = 0
+    header = list(header)
+    x_column, y_column = header.index('x'), header.index('y')
+
+    with open(path, newline='', encoding='utf-8') as stream:
+        lines = itertools.islice(_data_lines(stream), skip, None)
+        if 'name' not in header and 'label' not in header:
+            # Coordinates only: one NumPy read
+            coords = np.loadtxt(lines, delimiter=',', usecols=(x_column, y_column), ndmin=2,
+                                dtype=np.float64)
+            return PointTable(coords[:, 0], coords[:, 1])
+        rows = list(csv.reader(lines))
+
+    if any(len(row) != len(header) for row in rows):
+        raise ValueError(f"{path}: every row needs {len(header)} columns")
+    columns = list(zip(*rows)) if rows else [()] * len(header)
+    x = np.array(columns[x_column], dtype=np.float64)
+    y = np.array(columns[y_column], dtype=np.float64)
+    names = [name.strip() for name in columns[header.index('name')]] if 'name' in header else None
+    # An empty label field means the point is labelled with its name
+    labels = [label or None for label in columns[header.index('label')]] if 'label' in header else None
+    return PointTable(x, y, names, labels)
@@ -0,0 +1,174 @@
+"""
+Parameterized diagram templates for shapix
+
+A template is geometry syntax with ``{name}`` placeholders in place of
+point coordinates and circle radii::
+
+    POINT A 0 0
+    POINT B {bx} 0
+    POINT C {cx} {cy}
+    TRIANGLE A B C fill_color=lightblue
+
+``compile_template`` parses the text once, with a distinct marker value
+standing in for each placeholder, and decodes the result from the
+compiled scene format (see ``compiled``) into point and shape rows,
+noting the slots each placeholder landed in. A variant only writes its
+values into copies of the coordinate and radius columns and builds the
+shapes from the rows; the text is never formatted or tokenized again.
+"""
+
+import json
+import re
+from typing import Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core.base import GeometricShape, Point
+from ..core.scene import Scene
+from ..core.store import PointStore
+from .compiled import NO_POINT, NO_STRING, SHAPE_TYPES, CompiledScene, build_shape, encode_compiled
+from .parser import GeometrySyntaxParser, SyntaxSource, _gc_paused
+
+PLACEHOLDER = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+# Parameter values: a mapping from names, or a sequence in ``parameters`` order
+Values = Union[Mapping[str, float], Sequence[float]]
+
+
+def _marker(position: int) -> float:
+    """The value that stands in for parameter ``position`` while compiling
+
+    Huge numbers that no hand-written diagram uses; they survive the round
+    trip through their repr exactly and pass the radius clamp of ``Circle``.
+    """
+    return 2.0 ** 1000 * (position + 1)
+
+
+class DiagramTemplate:
+    """Geometry syntax with placeholders, parsed once and instantiated many times
+
+    ``parameters`` lists the placeholder names in order of first use.
+    ``shapes``, ``scene`` and ``render`` take the values of one variant,
+    ``batch`` the values of many; each variant gets new points (in
+    ``store``, or the default store if None) and new shapes, the same as
+    parsing the text with the values filled in.
+    """
+
+    def __init__(self, syntax: SyntaxSource, store: Optional[PointStore] = None):
+        if not isinstance(syntax, str):
+            syntax = ''.join(syntax)
+        self.store = store
+        self.parameters: Tuple[str, ...] = tuple(dict.fromkeys(PLACEHOLDER.findall(syntax)))
+        positions = {name: position for position, name in enumerate(self.parameters)}
+        text = PLACEHOLDER.sub(lambda match: repr(_marker(positions[match.group(1)])), syntax)
+
+        parser = GeometrySyntaxParser()
+        parser.parse(text)
+        data, _ = encode_compiled(parser.shapes, parser.points)
+        with CompiledScene(data) as prototype:
+            prototype._load_strings()
+            string = prototype.string
+            self._x = prototype._x.copy()
+            self._y = prototype._y.copy()
+            self._radius = prototype._records['scalar'].copy()
+            # (label, show_label, label_position) per point
+            self._point_rows = [(string(label), bool(show), string(position)) for label, show, position in
+                                zip(prototype._label.tolist(), prototype._show_label.tolist(),
+                                    prototype._position.tolist())]
+            # (class, point indices, name, decoded style) per shape
+            self._shape_rows = [
+                (SHAPE_TYPES[kind], [ref for ref in refs if ref != NO_POINT], string(name),
+                 None if style == NO_STRING else json.loads(string(style)))
+                for kind, name, style, refs, _ in prototype._records.tolist()
+            ]
+
+        # (slots, parameter positions) to fill in each column
+        self._fills = []
+        found = np.zeros(len(self.parameters), dtype=np.intp)
+        markers = np.array([_marker(position) for position in range(len(self.parameters))])
+        for column in (self._x, self._y, self._radius):
+            slots = np.flatnonzero(np.isin(column, markers))
+            params = np.searchsorted(markers, column[slots])
+            np.add.at(found, params, 1)
+            self._fills.append((slots, params))
+        for name in self.parameters:
+            if found[positions[name]] != len(re.findall(r'\{' + name + r'\}', syntax)):
+                raise ValueError(f"Placeholder {{{name}}} must only stand for a point coordinate "
+                                 f"or a circle radius")
+
+    def __len__(self) -> int:
+        """Number of shapes in each variant"""
+        return len(self._radius)
+
+    def _vector(self, values: Values) -> np.ndarray:
+        if isinstance(values, Mapping):
+            missing = [name for name in self.parameters if name not in values]
+            if missing:
+                raise ValueError(f"Missing template parameters: {', '.join(missing)}")
+            values = [values[name] for name in self.parameters]
+        vector = np.asarray(values, dtype=np.float64)
+        if vector.shape != (len(self.parameters),):
+            raise ValueError(f"Expected {len(self.parameters)} parameter values, got shape {vector.shape}")
+        return vector
+
+    def _clamped(self, columns: List[np.ndarray]) -> List[np.ndarray]:
+        # Circle keeps its radius at 1 or more
+        slots = self._fills[2][0]
+        if len(slots):
+            radius = columns[2]
+            radius[..., slots] = np.maximum(radius[..., slots], 1)
+        return columns
+
+    def _build(self, x: np.ndarray, y: np.ndarray, radius: np.ndarray) -> List[GeometricShape]:
+        """Shapes of the prototype with the given columns in place of its own"""
+        store = self.store
+        with _gc_paused():
+            points = [Point(px, py, label, show, position, store=store) for px, py, (label, show, position)
+                      in zip(x.tolist(), y.tolist(), self._point_rows)]
+            return [build_shape(cls, [points[ref] for ref in refs], name, scalar, style)
+                    for (cls, refs, name, style), scalar in zip(self._shape_rows, radius.tolist())]
+
+    def shapes(self, values: Values) -> List[GeometricShape]:
+        """The shapes of one variant"""
+        vector = self._vector(values)
+        columns = []
+        for base, (slots, params) in zip((self._x, self._y, self._radius), self._fills):
+            column = base.copy()
+            column[slots] = vector[params]
+            columns.append(column)
+        return self._build(*self._clamped(columns))
+
+    def scene(self, values: Values) -> Scene:
+        """The shapes of one variant in a new Scene"""
+        shapes = self.shapes(values)
+        with _gc_paused():
+            return Scene(shapes)
+
+    def batch(self, values: Union[np.ndarray, Iterable[Values]]) -> Iterator[List[GeometricShape]]:
+        """The shapes of many variants, one list per row of ``values``
+
+        ``values`` is an (N, len(parameters)) array or an iterable of
+        mappings or sequences; the columns of all variants are filled in
+        with one NumPy operation each.
+        """
+        if not isinstance(values, np.ndarray):
+            values = [self._vector(row) for row in values]
+        matrix = np.asarray(values, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != len(self.parameters):
+            raise ValueError(f"Expected rows of {len(self.parameters)} parameter values, got shape {matrix.shape}")
+        columns = []
+        for base, (slots, params) in zip((self._x, self._y, self._radius), self._fills):
+            column = np.repeat(base[np.newaxis], len(matrix), axis=0)
+            column[:, slots] = matrix[:, params]
+            columns.append(column)
+        for x, y, radius in zip(*self._clamped(columns)):
+            yield self._build(x, y, radius)
+
+    def render(self, values: Values, filename: str, exporter, auto_scale: bool = True) -> None:
+        """Render one variant to ``filename`` with an exporter (PNG or SVG)"""
+        exporter.render(exporter.layout_shapes(self.scene(values), auto_scale), filename)
+
+
+def compile_template(syntax: SyntaxSource, store: Optional[PointStore] = None) -> DiagramTemplate:
+    """Parse geometry syntax with ``{name}`` placeholders once (see ``DiagramTemplate``)"""
+    return DiagramTemplate(syntax, store)
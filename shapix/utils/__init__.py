@@ -5,6 +5,15 @@ Utility functions for shapix
 import math
 from typing import Tuple
 from ..core import Point
+from .batch import (
+    angles_between_points,
+    as_coords,
+    distances,
+    midpoints,
+    pairwise_distances,
+    point_to_segment_distances,
+    rotate_points,
+)
 
 
 def distance(p1: Point, p2: Point) -> float:
@@ -95,5 +104,14 @@ __all__ = [
     'rotate_point',
     'point_to_line_distance',
     'degrees_to_radians',
-    'radians_to_degrees'
+    'radians_to_degrees',
+    
+    # Vectorized batch variants
+    'as_coords',
+    'distances',
+    'pairwise_distances',
+    'angles_between_points',
+    'midpoints',
+    'rotate_points',
+    'point_to_segment_distances',
 ]
\ No newline at end of file
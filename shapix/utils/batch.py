@@ -0,0 +1,115 @@
+"""
+Vectorized NumPy variants of the geometry utilities
+
+Every function takes coordinates as (N, 2) arrays (anything ``as_coords``
+accepts) and returns NumPy arrays, so millions of points are processed
+without a Python-level loop. Arguments broadcast: a single (2,) point can
+be paired with an (N, 2) array. Results match the scalar functions in
+``shapix.utils``.
+"""
+
+from typing import Any, Iterable, Union
+
+import numpy as np
+
+from ..core import Point
+
+ArrayLike = Union[np.ndarray, Iterable[Any]]
+
+
+def as_coords(points: ArrayLike) -> np.ndarray:
+    """Convert points to a float64 array of shape (N, 2) or (2,)
+
+    Accepts NumPy arrays, nested sequences of numbers, a single ``Point`` or
+    a sequence of ``Point`` objects. Float64 arrays are returned as-is.
+    """
+    if isinstance(points, Point):
+        return np.array((points.x, points.y), dtype=np.float64)
+    if not isinstance(points, np.ndarray):
+        points = list(points)
+        if points and isinstance(points[0], Point):
+            return np.array([(p.x, p.y) for p in points], dtype=np.float64)
+    coords = np.asarray(points, dtype=np.float64)
+    if coords.shape[-1:] != (2,):
+        raise ValueError(f"Expected coordinates with a trailing dimension of 2, got {coords.shape}")
+    return coords
+
+
+def _norms(vectors: np.ndarray) -> np.ndarray:
+    """Length of each row vector; einsum avoids strided column temporaries"""
+    return np.sqrt(np.einsum('...i,...i->...', vectors, vectors))
+
+
+def distances(a: ArrayLike, b: ArrayLike) -> np.ndarray:
+    """Distance between paired points: ``|a[i] - b[i]|``"""
+    return _norms(as_coords(a) - as_coords(b))
+
+
+def pairwise_distances(a: ArrayLike, b: ArrayLike = None) -> np.ndarray:
+    """Distance matrix of shape (N, M) between every point of ``a`` and ``b``
+
+    ``b`` defaults to ``a``. Memory grows with N * M, so chunk large inputs.
+    """
+    a = as_coords(a).reshape(-1, 2)
+    b = a if b is None else as_coords(b).reshape(-1, 2)
+    return np.hypot(a[:, 0, None] - b[None, :, 0], a[:, 1, None] - b[None, :, 1])
+
+
+def angles_between_points(p1: ArrayLike, vertex: ArrayLike, p2: ArrayLike) -> np.ndarray:
+    """Angle in degrees at each vertex between p1 and p2 (0 when degenerate)"""
+    p1, vertex, p2 = as_coords(p1), as_coords(vertex), as_coords(p2)
+    v1x, v1y = p1[..., 0] - vertex[..., 0], p1[..., 1] - vertex[..., 1]
+    v2x, v2y = p2[..., 0] - vertex[..., 0], p2[..., 1] - vertex[..., 1]
+    # atan2 of |cross| and dot is exact near 0 and 180 degrees, unlike acos
+    angles = np.degrees(np.arctan2(np.abs(v1x * v2y - v1y * v2x), v1x * v2x + v1y * v2y))
+    degenerate = ((v1x == 0) & (v1y == 0)) | ((v2x == 0) & (v2y == 0))
+    if degenerate.any():
+        angles = np.where(degenerate, 0.0, angles)
+    return angles
+
+
+def midpoints(a: ArrayLike, b: ArrayLike) -> np.ndarray:
+    """Midpoint of each pair of points"""
+    return (as_coords(a) + as_coords(b)) * 0.5
+
+
+def rotate_points(points: ArrayLike, center: ArrayLike, angle_degrees: ArrayLike) -> np.ndarray:
+    """Rotate points counter-clockwise about ``center``
+
+    ``angle_degrees`` may be a scalar or one angle per point.
+    """
+    points, center = as_coords(points), as_coords(center)
+    angle = np.radians(np.asarray(angle_degrees, dtype=np.float64))
+    cos_a, sin_a = np.cos(angle), np.sin(angle)
+
+    px = points[..., 0] - center[..., 0]
+    py = points[..., 1] - center[..., 1]
+    out = np.empty(np.broadcast_shapes(px.shape, cos_a.shape) + (2,), dtype=np.float64)
+    out[..., 0] = px * cos_a - py * sin_a + center[..., 0]
+    out[..., 1] = px * sin_a + py * cos_a + center[..., 1]
+    return out
+
+
+def point_to_segment_distances(points: ArrayLike, starts: ArrayLike, ends: ArrayLike) -> np.ndarray:
+    """Distance from each point to the segment from ``starts`` to ``ends``"""
+    starts = as_coords(starts)
+    along = as_coords(ends) - starts
+    offset = as_coords(points) - starts
+
+    len_sq = np.einsum('...i,...i->...', along, along)
+    dot = np.einsum('...i,...i->...', along, offset)
+    # Degenerate segments (len_sq == 0) measure to their start point
+    param = np.divide(dot, len_sq, out=np.zeros(np.broadcast(dot, len_sq).shape), where=len_sq != 0)
+    np.clip(param, 0.0, 1.0, out=param)
+    return _norms(offset - param[..., None] * along)
+
+
+__all__ = [
+    'as_coords',
+    'distances',
+    'pairwise_distances',
+    'angles_between_points',
+    'midpoints',
+    'rotate_points',
+    'point_to_segment_distances',
+]
@@ -73,6 +73,34 @@ class TestEndToEndWorkflows:
             else:
                 raise
     
+    def test_raster_backend_matches_reference_image(self, temp_dir):
+        """Test raster backend output is pixel-comparable to the Tk reference render"""
+        np = pytest.importorskip("numpy")
+        Image = pytest.importorskip("PIL.Image")
+        
+        geometry = '''
+        POINT A 0 100 "A" show_label=true label_position=top
+        POINT B -87 -50 "B" show_label=true label_position=bottom_left
+        POINT C 87 -50 "C" show_label=true label_position=bottom_right
+        
+        TRIANGLE A B C color=blue show_vertices=true
+        '''
+        reference_file = os.path.join(
+            os.path.dirname(__file__), "..", "..", "examples", "basic", "simple_triangle.png"
+        )
+        if not os.path.exists(reference_file):
+            pytest.skip("Reference image not available")
+        
+        output_file = os.path.join(temp_dir, "simple_triangle.png")
+        export_geometry_syntax(geometry, output_file, 600, 600, backend='raster')
+        
+        rendered = np.asarray(Image.open(output_file).convert("L"), dtype=float)
+        reference = np.asarray(Image.open(reference_file).convert("L"), dtype=float)[:600, :600]
+        difference = np.abs(rendered - reference)
+        
+        assert difference.mean() < 4
+        assert (difference > 64).mean() < 0.02
+    
     def test_programmatic_api_workflow(self):
         """Test complete workflow using programmatic API"""
         # Create geometry programmatically
@@ -1,11 +1,12 @@
 """
-Unit tests for core classes (Point, GeometricShape)
+Unit tests for core classes (Point, PointStore, GeometricShape, Scene, SpatialIndex)
 """
 
 import pytest
 import math
-from shapix.core import Point, GeometricShape
-from shapix.shapes import PointShape
+import random
+from shapix.core import Point, PointStore, GeometricShape, Scene, SpatialIndex
+from shapix.shapes import PointShape, Line, Circle
 
 
 class TestPoint:
@@ -92,6 +93,202 @@ class TestPoint:
         point_set = {point1, point2, point3}
         assert len(point_set) == 2  # point1 and point2 should be same
 
+    
+    def test_point_repr(self):
+        """Test repr keeps the dataclass format"""
+        assert repr(Point(1, 2, "A")) == (
+            "Point(x=1.0, y=2.0, label='A', show_label=True, label_position='top_right')")
+
+
+class TestPointStore:
+    """Tests for the structure-of-arrays point store"""
+    
+    def test_points_are_views_into_store(self):
+        """Test point attributes read and write the store's arrays"""
+        store = PointStore()
+        point = Point(1, 2, "A", show_label=False, label_position="bottom", store=store)
+        
+        assert point.store is store
+        assert (store.x[point.index], store.y[point.index]) == (1.0, 2.0)
+        assert store.labels[store.label_ids[point.index]] == "A"
+        
+        point.x = 5
+        point.label = "B"
+        point.label_position = "top"
+        assert store.x[point.index] == 5.0
+        assert (point.label, point.show_label, point.label_position) == ("B", False, "top")
+    
+    def test_labels_are_interned(self):
+        """Test repeated labels and positions are stored once"""
+        store = PointStore()
+        points = [Point(i, i, "same", store=store) for i in range(100)]
+        
+        assert len(store) == 100
+        assert store.labels == ["same"]
+        assert store.positions == ["top_right"]
+    
+    def test_unused_labels_are_freed(self):
+        """Test labels are dropped with their last point and their ids reused"""
+        store = PointStore()
+        keep = Point(0, 0, "keep", store=store)
+        points = [Point(i, i, f"P{i}", store=store) for i in range(100)]
+        points[0].label = "renamed"
+        del points
+        
+        assert len(store) == 1
+        assert [label for label in store.labels if label is not None] == ["keep"]
+        points = [Point(i, i, f"Q{i}", store=store) for i in range(100)]
+        assert len(store.labels) == 102
+        assert points[5].label == "Q5" and keep.label == "keep"
+    
+    def test_release_while_locked_is_deferred(self):
+        """Test a point collected during another store call is freed afterwards"""
+        store = PointStore()
+        point = Point(0, 0, "gone", store=store)
+        index = point.index
+        with store._lock:
+            del point
+            assert store.labels == ["gone"]
+        
+        assert len(store) == 0
+        replacement = Point(1, 1, store=store)
+        assert replacement.index == index
+        assert store.labels == [None, ""]
+    
+    def test_threads_share_a_store(self):
+        """Test concurrent allocation never hands out a slot twice"""
+        import threading
+        
+        store = PointStore()
+        created = []
+        
+        def create(start):
+            created.append([Point(i, -i, f"T{i}", store=store) for i in range(start, start + 2000)])
+        
+        threads = [threading.Thread(target=create, args=(n * 2000,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        points = [point for batch in created for point in batch]
+        
+        assert len({point.index for point in points}) == len(store) == 16000
+        assert all(point.y == -point.x and point.label == f"T{int(point.x)}" for point in points)
+    
+    def test_slots_are_recycled(self):
+        """Test collected points return their slot to the store"""
+        store = PointStore()
+        keep = Point(0, 0, store=store)
+        temporary = Point(1, 1, store=store)
+        index = temporary.index
+        del temporary
+        
+        assert len(store) == 1
+        assert Point(2, 2, store=store).index == index
+        assert store.capacity == 2
+    
+    def test_bulk_operations(self):
+        """Test bulk edits on the arrays are visible through points"""
+        store = PointStore()
+        points = [Point(i, 0, store=store) for i in range(5)]
+        
+        store.translate(10, 1, [p.index for p in points[:2]])
+        assert (points[0].x, points[0].y, points[2].x) == (10, 1, 2)
+        
+        coords = store.coords([p.index for p in points])
+        assert coords.shape == (5, 2)
+        store.set_coords(coords * 2, [p.index for p in points])
+        assert points[4].x == 8
+    
+    def test_create_many(self):
+        """Test points created in bulk behave like points created one by one"""
+        store = PointStore()
+        first = Point(-1, -1, store=store)
+        points = Point.create_many([1, 2, 3], [4, 5, 6], ["A", "B", "A"], show_label=False,
+                                   label_position="bottom", store=store)
+        
+        assert [p.index for p in points] == [1, 2, 3]
+        assert (points[1].x, points[1].y, points[1].label) == (2, 5, "B")
+        assert (points[2].show_label, points[2].label_position) == (False, "bottom")
+        assert store.labels == ["", "A", "B"]
+        points[0].move(1, 0)
+        assert store.x[1] == 2
+        with pytest.raises(ValueError):
+            store.allocate_many([1, 2], [3], ["A", "B"])
+    
+    def test_copies_get_their_own_slot(self):
+        """Test copy, copy.copy and pickle never share a slot"""
+        import copy
+        import pickle
+        
+        point = Point(1, 2, "A")
+        for duplicate in (point.copy(), copy.copy(point), copy.deepcopy(point),
+                          pickle.loads(pickle.dumps(point))):
+            assert duplicate == point
+            assert duplicate.index != point.index
+            duplicate.x = 99
+            assert point.x == 1
+    
+    def test_parser_allocates_from_shared_store(self):
+        """Test the parser can put every point in one store"""
+        from shapix.syntax import GeometrySyntaxParser
+        
+        store = PointStore()
+        parser = GeometrySyntaxParser(store=store)
+        parser.parse("POINT A 0 0\nPOINT B 3 4\nLINE A B")
+        
+        assert all(point.store is store for point in parser.points.values())
+        store.translate(1, 1)
+        assert parser.get_point("B").x == 4
+
+    
+    def test_dependents(self):
+        """Test the store records which shapes reference each point"""
+        store = PointStore()
+        a, b, c = (Point(i, i, store=store) for i in range(3))
+        line = Line(a, b)
+        circle = Circle(a, 5)
+        
+        assert store.dependents(a.index) == [line, circle]
+        assert store.dependents(c.index) == []
+        
+        # Reassigning a shape's point moves the dependency
+        line.end = c
+        assert store.dependents(b.index) == []
+        assert store.dependents(c.index) == [line]
+        
+        # Collected shapes drop out
+        del circle
+        assert store.dependents(a.index) == [line]
+    
+    def test_moves_mark_only_dependents_dirty(self):
+        """Test moving a point marks exactly its dependent shapes dirty"""
+        store = PointStore()
+        a, b, c = (Point(i * 10, 0, store=store) for i in range(3))
+        first, second, other = Line(a, b), Circle(a, 5), Line(b, c)
+        scene = Scene([first, second, other])
+        assert scene.take_dirty() == []
+        
+        a.move(1, 1)
+        assert scene.take_dirty() == [first, second]
+        a.x = 50
+        assert scene.dirty == [first, second]
+        
+        # Bulk edits notify each affected shape once
+        scene.take_dirty()
+        store.translate(1, 0, [b.index, c.index])
+        assert scene.take_dirty() == [first, other]
+    
+    def test_spatial_index_follows_point_edits(self):
+        """Test indexes see shapes move when a shared point is assigned"""
+        center = Point(0, 0)
+        circle = Circle(center, 5)
+        index = SpatialIndex([circle])
+        
+        center.x = 1000
+        assert index.query_point(1000, 0) == [circle]
+        assert index.query_point(0, 0) == []
+
 
 class TestGeometricShape:
     """Tests for GeometricShape base class"""
@@ -155,4 +352,184 @@ class TestGeometricShape:
         assert "test_point_shape" in str_repr
         
         # repr should be same as str
-        assert repr(sample_point_shape) == str(sample_point_shape)
\ No newline at end of file
+        assert repr(sample_point_shape) == str(sample_point_shape)
+    
+    def test_flags_store_only_overrides(self, sample_point_shape):
+        """Test display flags read class defaults until overridden"""
+        assert sample_point_shape._overrides is None
+        sample_point_shape.color = "red"
+        assert sample_point_shape._overrides == {"color": "red"}
+        
+        # Setting a flag back to its default drops the override
+        sample_point_shape.color = "black"
+        assert sample_point_shape._overrides == {}
+        
+        # Subclasses can change a default
+        assert Line().show_endpoints is True
+        assert sample_point_shape.show_endpoints is False
+    
+    def test_shapes_are_slotted(self, sample_point_shape):
+        """Test shapes reject unknown attributes and keep extras as properties"""
+        with pytest.raises(AttributeError):
+            sample_point_shape.unknown_attribute = 1
+        sample_point_shape.set_property("unknown_attribute", 1)
+        assert sample_point_shape.get_properties()["unknown_attribute"] == 1
+    
+    def test_lazy_id_and_name(self):
+        """Test ids are generated on first use and default names use the handle"""
+        circle = Circle()
+        assert circle._id is None
+        assert circle.name == f"Circle_{circle.handle}"
+        assert circle._id is None
+        assert circle.id == circle.id
+        assert Circle().id != circle.id
+    
+    def test_handles(self):
+        """Test handles are increasing and copies get their own"""
+        import copy
+        import pickle
+        
+        first, second = Circle(), Circle()
+        assert second.handle > first.handle
+        for duplicate in (copy.copy(first), copy.deepcopy(first), pickle.loads(pickle.dumps(first))):
+            assert duplicate.handle not in (first.handle, second.handle)
+            assert duplicate._spatial_indexes == ()
+
+
+class TestSpatialIndex:
+    """Tests for SpatialIndex class"""
+    
+    def _grid_points(self, count=100, spacing=10):
+        return [PointShape(Point((i % 10) * spacing, (i // 10) * spacing), f"P{i}") for i in range(count)]
+    
+    def test_bulk_load(self):
+        """Test bulk loading indexes every shape"""
+        shapes = self._grid_points()
+        index = SpatialIndex(shapes)
+        
+        assert len(index) == 100
+        assert all(shape in index for shape in shapes)
+        assert index.cell_size > 0
+    
+    def test_query_rect(self):
+        """Test rectangle queries match a linear scan, in insertion order"""
+        shapes = self._grid_points()
+        index = SpatialIndex(shapes)
+        
+        result = index.query_rect(12, 12, 38, 28)
+        expected = [s for s in shapes if s.get_bounds()[0] <= 38 and s.get_bounds()[2] >= 12
+                    and s.get_bounds()[1] <= 28 and s.get_bounds()[3] >= 12]
+        assert result == expected
+        assert len(result) == 12  # x in 10..40, y in 10..30 (bounds are +-4)
+    
+    def test_query_point(self):
+        """Test point queries use contains_point with the selection tolerance"""
+        line = Line(Point(0, 0), Point(100, 0))
+        circle = Circle(Point(50, 50), 10)
+        index = SpatialIndex([line, circle])
+        
+        assert index.query_point(50, 3) == [line]
+        assert index.query_point(52, 48) == [circle]
+        assert index.query_point(50, 30) == []
+    
+    def test_nearest(self):
+        """Test nearest matches brute force on random data"""
+        rng = random.Random(7)
+        shapes = [PointShape(Point(rng.uniform(-500, 500), rng.uniform(-500, 500))) for _ in range(300)]
+        index = SpatialIndex(shapes)
+        
+        for _ in range(50):
+            x, y = rng.uniform(-700, 700), rng.uniform(-700, 700)
+            expected = min(shapes, key=lambda s: math.hypot(s.point.x - x, s.point.y - y))
+            assert index.nearest(x, y) is expected
+        assert SpatialIndex().nearest(0, 0) is None
+    
+    def test_large_shapes(self):
+        """Test shapes spanning many cells are still found"""
+        circle = Circle(Point(0, 0), 10000)
+        points = self._grid_points()
+        index = SpatialIndex(points + [circle], cell_size=10)
+        
+        assert circle in index.query_rect(5000, 5000, 5001, 5001)
+        assert index.nearest(5000, 5000) is circle
+    
+    def test_move_updates_index(self):
+        """Test GeometricShape.move re-bins the shape"""
+        shapes = self._grid_points()
+        index = SpatialIndex(shapes)
+        mover = shapes[0]
+        
+        mover.move(1000, 1000)
+        
+        assert mover not in index.query_rect(-5, -5, 5, 5)
+        assert index.query_rect(995, 995, 1005, 1005) == [mover]
+        assert index.nearest(990, 990) is mover
+    
+    def test_insert_and_remove(self):
+        """Test incremental insertion and removal"""
+        index = SpatialIndex(self._grid_points(), cell_size=10)
+        extra = PointShape(Point(500, 500))
+        
+        index.insert(extra)
+        assert index.query_rect(499, 499, 501, 501) == [extra]
+        
+        index.remove(extra)
+        assert extra not in index
+        assert index.query_rect(499, 499, 501, 501) == []
+        extra.move(1, 1)  # no longer notifies the index
+
+
+class TestScene:
+    """Tests for the Scene container"""
+    
+    def test_lookup_by_name_handle_and_type(self):
+        """Test the name, handle and type indexes"""
+        point, line, circle = PointShape(name="p"), Line(name="l"), Circle(name="c")
+        scene = Scene([point, line, circle])
+        
+        assert len(scene) == 3
+        assert list(scene) == [point, line, circle]
+        assert scene.get("l") is line
+        assert scene.get("missing") is None
+        assert scene.by_handle(circle.handle) is circle
+        assert scene.of_type(Circle) == [circle]
+        assert scene.of_type(GeometricShape) == [point, line, circle]
+    
+    def test_layer_order_matches_stable_sort(self):
+        """Test by_layer gives the order sorted() by layer would"""
+        shapes = [PointShape(name=f"p{i}") for i in range(20)]
+        for i, shape in enumerate(shapes):
+            shape.layer = (i * 7) % 5 - 2
+        scene = Scene(shapes)
+        
+        assert list(scene.by_layer()) == sorted(shapes, key=lambda s: s.layer)
+        assert scene.layers == [-2, -1, 0, 1, 2]
+    
+    def test_indexes_follow_shape_changes(self):
+        """Test renaming and re-layering a shape updates the scene"""
+        first, second = PointShape(name="a"), PointShape(name="b")
+        scene = Scene([first, second])
+        
+        first.layer = 1
+        assert list(scene.by_layer()) == [second, first]
+        
+        first.name = "renamed"
+        assert scene.get("a") is None
+        assert scene.get("renamed") is first
+        
+        scene.remove(first)
+        assert first not in scene
+        assert scene.layers == [0]
+        first.layer = 5  # No longer tracked
+        assert scene.layers == [0]
+    
+    def test_spatial_index_stays_in_sync(self):
+        """Test the scene's spatial index sees added and removed shapes"""
+        scene = Scene([PointShape(Point(0, 0))])
+        index = scene.spatial_index
+        
+        far = PointShape(Point(1000, 1000))
+        scene.add(far)
+        assert index.query_point(1000, 1000) == [far]
+        scene.remove(far)
+        assert index.query_point(1000, 1000) == []
@@ -0,0 +1,310 @@
+"""
+Unit tests for rendering backends
+"""
+
+import pytest
+import io
+import numpy as np
+import xml.etree.ElementTree as ET
+from shapix.rendering import DisplayList, RasterCanvas, SVGCanvas, ShapeRenderer
+from shapix.rendering.raster import parse_color, encode_png
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+
+class TestRasterCanvas:
+    """Tests for the headless NumPy raster canvas"""
+
+    def test_canvas_creation(self):
+        """Test canvas starts filled with the background color"""
+        canvas = RasterCanvas(40, 30, bg='white')
+        assert canvas.buffer.shape == (30, 40, 4)
+        assert canvas.buffer.dtype == np.uint8
+        assert (canvas.buffer == 255).all()
+
+    def test_parse_color(self):
+        """Test Tk color names and hex specs"""
+        assert parse_color("red") == (255, 0, 0, 255)
+        assert parse_color("green") == (0, 128, 0, 255)
+        assert parse_color("#00f") == (0, 0, 255, 255)
+        assert parse_color("#102030") == (16, 32, 48, 255)
+        assert parse_color("") is None
+        assert parse_color(None) is None
+
+    def test_create_line(self):
+        """Test horizontal line covers its row only"""
+        canvas = RasterCanvas(50, 50)
+        canvas.create_line(5, 20, 45, 20, fill="blue", width=1)
+
+        assert tuple(canvas.buffer[20, 25]) == (0, 0, 255, 255)
+        assert tuple(canvas.buffer[25, 25]) == (255, 255, 255, 255)
+        # Butt caps: nothing past the end points
+        assert tuple(canvas.buffer[20, 48]) == (255, 255, 255, 255)
+
+    def test_create_oval_fill_and_outline(self):
+        """Test filled oval with outline"""
+        canvas = RasterCanvas(60, 60)
+        canvas.create_oval(10, 10, 50, 50, fill="yellow", outline="black", width=2)
+
+        assert tuple(canvas.buffer[30, 30]) == (255, 255, 0, 255)
+        assert tuple(canvas.buffer[30, 10][:3]) == (0, 0, 0)
+        assert tuple(canvas.buffer[2, 2]) == (255, 255, 255, 255)
+
+    def test_create_polygon(self):
+        """Test polygon fill uses even-odd interior"""
+        canvas = RasterCanvas(60, 60)
+        canvas.create_polygon([10, 50, 50, 50, 30, 10], fill="red", outline="")
+
+        assert tuple(canvas.buffer[40, 30]) == (255, 0, 0, 255)
+        assert tuple(canvas.buffer[15, 12]) == (255, 255, 255, 255)
+
+    def test_create_arc_respects_extent(self):
+        """Test arc only covers its angular range"""
+        canvas = RasterCanvas(60, 60)
+        canvas.create_arc([10, 10, 50, 50], start=0, extent=90, outline="black",
+                          width=2, style="arc")
+
+        # 45 degrees is inside the arc, 225 degrees is not
+        assert canvas.buffer[16, 44, 0] < 128
+        assert tuple(canvas.buffer[44, 16]) == (255, 255, 255, 255)
+
+    def test_create_text(self):
+        """Test text is drawn around its anchor"""
+        canvas = RasterCanvas(80, 40)
+        canvas.create_text(40, 20, text="A", fill="black", font=("Arial", 16, "bold"))
+
+        assert canvas.buffer[10:30, 30:50, 0].min() < 64
+        assert (canvas.buffer[:, :20] == 255).all()
+
+    def test_delete_clears_canvas(self):
+        """Test delete resets the buffer to the background"""
+        canvas = RasterCanvas(20, 20)
+        canvas.create_rectangle(0, 0, 19, 19, fill="black")
+        canvas.delete("all")
+        assert (canvas.buffer == 255).all()
+
+    def test_png_encoding(self):
+        """Test encoded PNG decodes back to the same pixels"""
+        from PIL import Image
+
+        canvas = RasterCanvas(32, 16)
+        canvas.create_line(0, 8, 31, 8, fill="red", width=3)
+        data = canvas.to_png_bytes()
+
+        assert data.startswith(b"\x89PNG\r\n\x1a\n")
+        decoded = np.asarray(Image.open(io.BytesIO(data)).convert("RGBA"))
+        assert (decoded == canvas.buffer).all()
+
+    def test_png_encoding_keeps_alpha(self):
+        """Test translucent buffers are written as RGBA"""
+        from PIL import Image
+
+        rgba = np.zeros((4, 4, 4), dtype=np.uint8)
+        rgba[1, 1] = (10, 20, 30, 128)
+        image = Image.open(io.BytesIO(encode_png(rgba)))
+        assert image.mode == "RGBA"
+        assert image.getpixel((1, 1)) == (10, 20, 30, 128)
+
+    def test_shape_renderer_on_raster_canvas(self, sample_triangle):
+        """Test ShapeRenderer draws onto a raster canvas"""
+        canvas = RasterCanvas(200, 200)
+        renderer = ShapeRenderer(canvas, lambda x, y: (int(100 + x * 10), int(100 - y * 10)))
+        sample_triangle.fill_color = "lightblue"
+
+        renderer.draw_triangle(sample_triangle)
+
+        # Interior of the triangle is filled
+        assert tuple(canvas.buffer[80, 150][:3]) == (173, 216, 230)
+
+
+class TestSVGCanvas:
+    """Tests for the streaming SVG canvas"""
+
+    def _render(self, draw):
+        stream = io.StringIO()
+        canvas = SVGCanvas(stream, 200, 100)
+        draw(canvas)
+        canvas.close()
+        return ET.fromstring(stream.getvalue())
+
+    def test_document_header(self):
+        """Test the root element carries the canvas size"""
+        root = self._render(lambda canvas: None)
+        assert root.tag == f"{SVG_NS}svg"
+        assert root.get("width") == "200"
+        assert root.get("viewBox") == "0 0 200 100"
+
+    def test_basic_elements(self):
+        """Test each canvas call becomes one SVG element"""
+        def draw(canvas):
+            canvas.create_oval(10, 10, 30, 30, fill="red", outline="black")
+            canvas.create_line(0, 0, 50, 50, fill="blue", width=2, dash=(3, 3))
+            canvas.create_polygon([0, 0, 10, 0, 5, 8], fill="", outline="green", width=2)
+            canvas.create_text(20, 20, text="A<B", fill="black", font=("Arial", 12, "bold"))
+
+        root = self._render(draw)
+        circle, line, polygon, text = list(root)
+
+        assert circle.tag == f"{SVG_NS}circle"
+        assert (circle.get("cx"), circle.get("r"), circle.get("fill")) == ("20", "10", "red")
+        assert line.get("stroke-dasharray") == "3,3"
+        assert polygon.get("fill") == "none"
+        assert polygon.get("points") == "0,0 10,0 5,8"
+        assert text.text == "A<B"
+        assert text.get("font-weight") == "bold"
+
+    def test_colors_are_escaped(self):
+        """Test color names cannot break the markup"""
+        root = self._render(lambda canvas: canvas.create_oval(
+            0, 0, 20, 20, fill='red&<x>"', outline="a<b"))
+
+        assert root[0].get("fill") == 'red&<x>"'
+        assert root[0].get("stroke") == "a<b"
+
+    def test_exported_colors_are_escaped(self, temp_dir):
+        """Test a diagram with markup in its colors exports well-formed SVG"""
+        import os
+        from shapix.syntax import export_geometry_svg
+
+        path = os.path.join(temp_dir, "colors.svg")
+        export_geometry_svg("POINT A 0 0\nPOINT B 10 0\nPOINT C 5 8\n"
+                            "TRIANGLE A B C fill_color=red&<x> color=<b>", path, 200, 150)
+
+        fills = [element.get("fill") for element in ET.parse(path).getroot()]
+        assert "red&<x>" in fills
+
+    def test_arc_path(self):
+        """Test arcs become unfilled path elements"""
+        root = self._render(lambda canvas: canvas.create_arc(
+            [0, 0, 40, 40], start=0, extent=90, outline="red", width=2, style="arc"))
+        path = root[0]
+
+        assert path.tag == f"{SVG_NS}path"
+        assert path.get("fill") == "none"
+        assert path.get("d") == "M40 20 A20 20 0 0 0 20 0"
+
+
+class TestDisplayList:
+    """Tests for the display list intermediate representation"""
+
+    def _record(self):
+        display_list = DisplayList()
+        display_list.create_rectangle(0, 0, 60, 60, fill="white", outline="white")
+        display_list.create_oval(10, 10, 50, 50, fill="yellow", outline="black", width=2)
+        display_list.create_line(5, 20, 45, 20, fill="blue", width=1, dash=(3, 3))
+        display_list.create_polygon([10, 50, 50, 50, 30, 10], fill="red", outline="black", width=1)
+        display_list.create_arc([10, 10, 50, 50], start=0, extent=90, outline="black",
+                                width=2, style="arc")
+        display_list.create_text(30, 30, text="A", fill="black", font=("Arial", 12, "bold"))
+        return display_list
+
+    def test_recording_is_flat_and_interned(self):
+        """Test operations land in typed arrays with shared styles"""
+        display_list = self._record()
+        display_list.create_line(0, 0, 1, 1, fill="blue", width=1, dash=(3, 3))
+
+        assert len(display_list) == 7
+        assert display_list.coords.typecode == "d"
+        assert len(display_list.coords) == 4 + 4 + 4 + 6 + 6 + 2 + 4
+        assert len(display_list.style_table) == 6
+        assert display_list.texts == ["A"]
+
+    def test_iteration(self):
+        """Test operations read back as canvas calls"""
+        name, coords, options = list(self._record())[4]
+
+        assert name == "create_arc"
+        assert coords == (10, 10, 50, 50)
+        assert options == {"start": 0, "extent": 90, "outline": "black", "width": 2, "style": "arc"}
+
+    def test_replay_matches_direct_drawing(self):
+        """Test replaying onto a canvas gives the same pixels as drawing on it"""
+        direct = RasterCanvas(60, 60)
+        self._record().replay(direct)
+        replayed = RasterCanvas(60, 60)
+        DisplayList.from_bytes(self._record().to_bytes()).replay(replayed)
+
+        assert (direct.buffer[30, 14] == (255, 255, 0, 255)).all()
+        assert (direct.buffer == replayed.buffer).all()
+
+    def test_serialization_round_trip(self):
+        """Test to_bytes/from_bytes and pickle preserve every operation"""
+        import pickle
+
+        display_list = self._record()
+        restored = DisplayList.from_bytes(display_list.to_bytes())
+
+        assert restored == display_list
+        assert pickle.loads(pickle.dumps(display_list)) == display_list
+        assert list(restored)[5][2]["font"] == ("Arial", 12, "bold")
+
+    def test_from_bytes_rejects_garbage(self):
+        """Test unrelated data is refused"""
+        with pytest.raises(ValueError):
+            DisplayList.from_bytes(b"not a display list")
+
+    def test_delete_clears_recording(self):
+        """Test delete('all') drops everything recorded so far"""
+        display_list = self._record()
+        display_list.delete("all")
+        assert len(display_list) == 0
+        assert list(display_list) == []
+
+    def test_one_layout_feeds_png_and_svg(self, temp_dir):
+        """Test a single layout pass is rendered by both exporters"""
+        import os
+        from shapix.syntax import GeometryPNGExporter, GeometrySVGExporter
+
+        svg_exporter = GeometrySVGExporter(200, 150)
+        display_list = svg_exporter.layout('POINT A 0 0 "A" show_label=true\nPOINT B 10 10\nLINE A B')
+        svg_exporter.render(display_list, os.path.join(temp_dir, "out.svg"))
+        with GeometryPNGExporter(200, 150, backend='raster') as png_exporter:
+            png_exporter.render(display_list, os.path.join(temp_dir, "out.png"))
+
+        root = ET.parse(os.path.join(temp_dir, "out.svg")).getroot()
+        assert len(root) == len(display_list)
+        assert os.path.getsize(os.path.join(temp_dir, "out.png")) > 0
+
+
+class TestTclScript:
+    """Tests for batched Tcl script generation"""
+
+    def _run(self, display_list):
+        """Evaluate the script against a stub widget command, no display needed"""
+        from shapix.rendering.tcl import build_tcl_script
+
+        tkinter = pytest.importorskip("tkinter")
+        try:
+            interp = tkinter.Tcl()
+        except tkinter.TclError:
+            pytest.skip("Tcl interpreter not available")
+        interp.eval("proc .c {args} {lappend ::calls $args}")
+        interp.eval(build_tcl_script(display_list, ".c"))
+        return [interp.splitlist(call) for call in interp.splitlist(interp.getvar("calls"))]
+
+    def test_one_command_per_item(self):
+        """Test every display list operation becomes one canvas command"""
+        display_list = DisplayList()
+        display_list.create_oval(0, 0, 5.5, 5, fill="", outline="black")
+        display_list.create_line(0, 0, 5, 5, fill="blue", width=2, dash=(3, 3))
+        display_list.create_arc([0, 0, 10, 10], start=0, extent=-45.5, outline="red", style="arc")
+
+        oval, line, arc = self._run(display_list)
+
+        assert oval[:2] == ("create", "oval")
+        assert [float(value) for value in oval[2:6]] == [0, 0, 5.5, 5]
+        assert oval[6:] == ("-fill", "", "-outline", "black")
+        assert line[-2:] == ("-dash", "3 3")
+        assert arc[6:10] == ("-start", "0.0", "-extent", "-45.5")
+
+    def test_text_is_quoted(self):
+        """Test Tcl special characters in labels and fonts survive the script"""
+        label = 'a {b} [c] $d "e" \\ f\nnew'
+        display_list = DisplayList()
+        display_list.create_text(1, 2, text=label, font=("Times New Roman", 12, "bold"))
+
+        (call,) = self._run(display_list)
+
+        assert call[5] == label
+        assert pytest.importorskip("tkinter").Tcl().splitlist(call[7]) == (
+            "Times New Roman", "12", "bold")
@@ -326,4 +326,58 @@ class TestAngle:
         
         # Bounds should include all three points plus arc radius
         assert bounds[0] <= -5 - sample_angle.arc_radius
-        assert bounds[2] >= 5 + sample_angle.arc_radius
\ No newline at end of file
+        assert bounds[2] >= 5 + sample_angle.arc_radius
+
+class TestMeasures:
+    """Tests for cached derived measures"""
+    
+    def test_triangle_measures_match_direct_computation(self, sample_triangle):
+        """Test the one-pass measures agree with the per-vertex formulas"""
+        measures = sample_triangle.get_measures()
+        a, b, c = sample_triangle.get_points()
+        
+        assert measures.sides == (b.distance_to(c), a.distance_to(c), a.distance_to(b))
+        assert measures.angles == (sample_triangle._calculate_angle(b, a, c),
+                                   sample_triangle._calculate_angle(a, b, c),
+                                   sample_triangle._calculate_angle(a, c, b))
+        assert abs(sum(measures.angles) - 180) < 1e-9
+    
+    def test_measures_are_cached_until_points_change(self, sample_triangle):
+        """Test measures are reused, and recomputed only after an actual change"""
+        measures = sample_triangle.get_measures()
+        assert sample_triangle.get_measures() is measures
+        
+        # Writing the same coordinate or moving by zero is not a change
+        sample_triangle.vertex_a.x = sample_triangle.vertex_a.x
+        sample_triangle.vertex_a.move(0, 0)
+        assert sample_triangle.get_measures() is measures
+        
+        area = sample_triangle.get_area()
+        sample_triangle.vertex_c.move(0, 10)
+        assert sample_triangle.get_measures() is not measures
+        assert sample_triangle.get_area() != area
+    
+    def test_shared_points_invalidate_every_shape(self):
+        """Test moving a shared point refreshes all shapes built on it"""
+        a, b, c = Point(0, 0), Point(4, 0), Point(0, 3)
+        triangle, line, angle = Triangle(a, b, c), Line(a, b), Angle(b, a, c)
+        assert (triangle.get_perimeter(), line.get_length(), angle.get_measure()) == (12, 4, 90)
+        
+        b.x = 8
+        assert line.get_length() == 8
+        assert triangle.get_side_length('c') == 8
+        assert angle.get_bounds()[2] == 8 + angle.arc_radius
+    
+    def test_non_point_geometry_invalidates(self, sample_circle):
+        """Test radius, point size and arc radius changes refresh measures"""
+        area = sample_circle.get_area()
+        sample_circle.radius = sample_circle.radius * 2
+        assert sample_circle.get_area() == pytest.approx(area * 4)
+        
+        point_shape = PointShape(Point(0, 0))
+        point_shape.point_size = 10
+        assert point_shape.get_bounds() == (-10, -10, 10, 10)
+        
+        angle = Angle()
+        angle.arc_radius = 5
+        assert angle.get_bounds()[0] == -55
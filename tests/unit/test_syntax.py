@@ -3,11 +3,38 @@ Unit tests for syntax parsing and export
 """
 
 import pytest
+import io
 import os
-from shapix.syntax import GeometrySyntaxParser, GeometryPNGExporter, export_geometry_syntax
+from shapix.syntax import (
+    CompiledScene,
+    DiagramTemplate,
+    GeometrySyntaxParser,
+    GeometryPNGExporter,
+    IncrementalParser,
+    GeometrySVGExporter,
+    export_geometry_syntax,
+    export_geometry_svg,
+    export_many,
+    ExportJob,
+    RenderCache,
+    Statement,
+    compile_syntax,
+    compile_template,
+    load_compiled,
+    render_to_array,
+    render_to_bytes,
+    tokenize,
+    write_compiled,
+)
 from shapix.shapes import PointShape, Line, Circle, Triangle, Angle
 
 
+def parse_fresh(syntax):
+    parser = GeometrySyntaxParser()
+    parser.parse(syntax)
+    return parser
+
+
 class TestGeometrySyntaxParser:
     """Tests for GeometrySyntaxParser class"""
     
@@ -33,6 +60,30 @@ class TestGeometrySyntaxParser:
         assert shapes[0].point.show_label == True
         assert shapes[0].point.label_position == "top"
     
+    def test_get_shape_by_name(self):
+        """Test parsed shapes are registered by name and handle"""
+        parser = GeometrySyntaxParser()
+        shapes = parser.parse("POINT A 0 0\nPOINT B 10 0\nLINE A B")
+        
+        line = parser.get_shape("line_A_B")
+        assert line is shapes[2]
+        assert parser.named_shapes["line_A_B"] == line.handle
+        assert parser.scene.by_handle(line.handle) is line
+        assert parser.get_shape("missing") is None
+    
+    def test_parse_scene(self):
+        """Test the parser builds a scene ordered by layer"""
+        parser = GeometrySyntaxParser()
+        scene = parser.parse_scene("POINT A 0 0 layer=2\nPOINT B 10 0\nLINE A B layer=1")
+        
+        assert len(scene) == 3
+        assert [shape.name for shape in scene.by_layer()] == ["point_B", "line_A_B", "point_A"]
+        assert scene.of_type(Line) == [scene.get("line_A_B")]
+        
+        # Each parse builds a new scene
+        parser.parse("POINT C 0 0")
+        assert len(scene) == 3
+    
     def test_parse_line(self):
         """Test parsing line definitions"""
         parser = GeometrySyntaxParser()
@@ -160,6 +211,67 @@ class TestGeometrySyntaxParser:
         for value in false_values:
             assert parser._parse_bool(value) == False
     
+    def test_tokenize(self):
+        """Test splitting lines into keyword, arguments, label and properties"""
+        statement = tokenize('  POINT A 10 20 "Test Point" show_label=true key="two words"')
+        assert statement == Statement('POINT', ['A', '10', '20'], 'Test Point', {'show_label': 'true', 'key': 'two words'})
+    
+        statement = tokenize('LINE A B color=red')
+        assert statement == Statement('LINE', ['A', 'B'], None, {'color': 'red'})
+    
+        # An unterminated quote is kept as text
+        assert tokenize('POINT A "open').args == ['A', '"open']
+    
+        assert tokenize('') is None
+        assert tokenize('   # comment "quoted"') is None
+    
+    def test_custom_keyword_handler(self):
+        """Test that subclasses can dispatch extra keywords"""
+        class LabelledParser(GeometrySyntaxParser):
+            handlers = dict(GeometrySyntaxParser.handlers, MARK='_parse_mark')
+    
+            def _parse_mark(self, statement):
+                self.marks.append(statement.label)
+    
+        parser = LabelledParser()
+        parser.marks = []
+        shapes = parser.parse('POINT A 0 0\nMARK "first"\nUNKNOWN 1 2')
+    
+        assert len(shapes) == 1
+        assert parser.marks == ['first']
+    
+    def test_parse_iter_is_lazy(self):
+        """Test shapes are yielded as their lines are read"""
+        read = []
+        
+        def lines():
+            for line in ['POINT A 0 0\n', '# comment\n', 'POINT B 10 0\n', 'LINE A B\n']:
+                read.append(line)
+                yield line
+        
+        parser = GeometrySyntaxParser()
+        shapes = parser.parse_iter(lines())
+        
+        assert next(shapes).name == "point_A"
+        assert len(read) == 1
+        assert next(shapes).name == "point_B"
+        line = next(shapes)
+        assert line.start is parser.get_point("A")
+        assert list(shapes) == []
+        assert parser.shapes == list(parser.scene)
+    
+    def test_parse_file_object(self, temp_dir, sample_geometry_syntax):
+        """Test parsing an open file matches parsing its text"""
+        path = os.path.join(temp_dir, "scene.geo")
+        with open(path, 'w') as f:
+            f.write(sample_geometry_syntax)
+        
+        with open(path) as f:
+            from_file = GeometrySyntaxParser().parse(f)
+        from_text = GeometrySyntaxParser().parse(sample_geometry_syntax)
+        
+        assert [shape.name for shape in from_file] == [shape.name for shape in from_text]
+    
     def test_complex_syntax_parsing(self, sample_geometry_syntax):
         """Test parsing complex geometry syntax"""
         parser = GeometrySyntaxParser()
@@ -174,6 +286,115 @@ class TestGeometrySyntaxParser:
         assert 'Line' in shape_types
         assert 'Angle' in shape_types
     
+    def test_points_block(self):
+        """Test a POINTS block defines named and generated points in one statement"""
+        parser = GeometrySyntaxParser()
+        shapes = parser.parse('''
+        POINTS show_label=false color=red prefix=V
+        A 0 0 "Apex"
+        # comment
+        10 5
+        B 3.5 -4
+        END
+        TRIANGLE A V1 B
+        ''')
+        
+        assert [s.name for s in shapes] == ["point_A", "point_V1", "point_B", "triangle_A_V1_B"]
+        assert shapes[0].color == "red" and shapes[0].point.label == "Apex"
+        assert (parser.get_point("V1").x, parser.get_point("B").y) == (10, -4)
+        assert parser.get_point("B").label == "B" and not parser.get_point("B").show_label
+        assert shapes[3].vertex_b is parser.get_point("V1")
+    
+    def test_points_block_errors(self):
+        """Test malformed POINTS blocks raise"""
+        with pytest.raises(ValueError):
+            GeometrySyntaxParser().parse('POINTS\nA 0 0')
+        with pytest.raises(ValueError):
+            GeometrySyntaxParser().parse('POINTS\nA 0\nEND')
+        with pytest.raises(ValueError):
+            GeometrySyntaxParser().parse('POINTS\nA zero 0\nEND')
+    
+    def test_points_from_files(self, temp_dir):
+        """Test POINTS FROM loads CSV and .npy point files"""
+        import numpy as np
+        
+        with open(os.path.join(temp_dir, 'plain.csv'), 'w') as f:
+            f.write('# generated\nx,y\n1,2\n3,4\n')
+        with open(os.path.join(temp_dir, 'named.csv'), 'w') as f:
+            f.write('Q,1,2,"a, b"\nR,3,4,\n')
+        np.save(os.path.join(temp_dir, 'grid.npy'), np.arange(6.0).reshape(3, 2))
+        records = np.array([(5.0, 6.0, 'S')], dtype=[('x', 'f8'), ('y', 'f8'), ('name', 'U4')])
+        np.save(os.path.join(temp_dir, 'records.npy'), records)
+        
+        parser = GeometrySyntaxParser()
+        parser.parse('\n'.join([
+            f'POINTS FROM "{temp_dir}/plain.csv" prefix=K',
+            f'POINTS FROM "{temp_dir}/named.csv" show_label=false',
+            f'POINTS FROM {temp_dir}/grid.npy',
+            f'POINTS FROM "{temp_dir}/records.npy"',
+            'LINE K1 R',
+        ]))
+        
+        assert list(parser.points) == ["K0", "K1", "Q", "R", "P0", "P1", "P2", "S"]
+        assert (parser.get_point("K1").x, parser.get_point("P2").y) == (3, 5)
+        assert (parser.get_point("Q").label, parser.get_point("R").label) == ("a, b", "R")
+        assert parser.get_point("S").label == "S"
+        assert parser.get_shape("line_K1_R").end is parser.get_point("R")
+        
+        with open(os.path.join(temp_dir, 'bad.csv'), 'w') as f:
+            f.write('1,2,3,4,5\n')
+        with pytest.raises(ValueError):
+            GeometrySyntaxParser().parse(f'POINTS FROM "{temp_dir}/bad.csv"')
+    
+    def test_constants_and_expressions(self):
+        """Test LET constants and expressions in coordinates and radii"""
+        import math
+        
+        parser = GeometrySyntaxParser()
+        parser.parse('''
+        LET r = 100 / 2
+        LET h=r*sqrt(3)/2 w=-r
+        POINT B r*cos(150deg) r*sin(150deg)
+        POINT C h w**2
+        CIRCLE B r/4+pi
+        LET r = r*2
+        POINTS
+        D r 0.5
+        -r/2 max(1,2)
+        END
+        ''')
+        
+        assert parser.constants == {"r": 100, "h": 25 * math.sqrt(3), "w": -50}
+        assert parser.get_point("B").x == pytest.approx(50 * math.cos(math.radians(150)))
+        assert (parser.get_point("C").x, parser.get_point("C").y) == (25 * math.sqrt(3), 2500)
+        assert parser.get_shape("circle_B").radius == 12.5 + math.pi
+        assert (parser.get_point("D").x, parser.get_point("P1").x, parser.get_point("P1").y) == (100, -50, 2)
+    
+    def test_expressions_share_compiled_templates(self):
+        """Test expressions differing only in numbers compile to the same function"""
+        import math
+        from shapix.syntax.expressions import compile_expression
+        
+        first, numbers = compile_expression("r*cos(30deg)+1.5")
+        second, _ = compile_expression("r*cos(45deg)+2e3")
+        assert first is second
+        assert numbers[1] == 1.5 and numbers[0] == pytest.approx(math.pi / 6)
+    
+    @pytest.mark.parametrize("syntax", [
+        'POINT A q 0',
+        'POINT A 1/0 0',
+        'POINT A __import__(1) 0',
+        'POINT A (1).real 0',
+        'POINT A cos 0',
+        'LET cos = 1',
+        'LET r =1',
+        'LET 2r = 1',
+    ])
+    def test_invalid_expressions(self, syntax):
+        """Test unknown names, bad arithmetic and non-arithmetic syntax are rejected"""
+        with pytest.raises(ValueError):
+            GeometrySyntaxParser().parse(syntax)
+    
     def test_get_point_by_name(self):
         """Test retrieving points by name"""
         parser = GeometrySyntaxParser()
@@ -190,6 +411,317 @@ class TestGeometrySyntaxParser:
         assert parser.get_point('Z') is None
 
 
+class TestIncrementalParser:
+    """Tests for re-parsing only the edited lines"""
+    
+    SYNTAX = 'POINT A 0 0\nPOINT B 10 0\nLINE A B color=red\nCIRCLE B 5\n# end'
+    
+    def _summary(self, parser):
+        return [(shape.name, [(p.x, p.y) for p in shape.get_points()], shape.color) for shape in parser.shapes]
+    
+    def test_edits_match_full_parse(self):
+        """Test the shapes after a series of edits equal a fresh parse of the text"""
+        parser = IncrementalParser()
+        parser.parse(self.SYNTAX)
+        
+        parser.edit((2, 15), (2, 18), "blue")            # LINE A B color=blue
+        parser.replace_lines(1, 1, ["POINT C 5 5", "TRIANGLE A B C"])
+        parser.replace_lines(5, 6, [])                  # drop the circle
+        parser.edit((0, 8), (0, 9), "3")                 # POINT A 3 0
+        parser.edit((0, 11), (0, 11), "\nPOINT D 1 1")  # new line after it
+        
+        assert parser.text == 'POINT A 3 0\nPOINT D 1 1\nPOINT C 5 5\nTRIANGLE A B C\nPOINT B 10 0\nLINE A B color=blue\n# end'
+        assert self._summary(parser) == self._summary(parse_fresh(parser.text))
+        assert parser.get_point("B").x == 10
+    
+    def test_redefined_point_keeps_identity(self):
+        """Test moving a point updates dependent shapes in place"""
+        parser = IncrementalParser()
+        parser.parse(self.SYNTAX)
+        line = parser.get_shape("line_A_B")
+        point = parser.get_point("B")
+        parser.scene.take_dirty()
+        
+        delta = parser.replace_lines(1, 2, ['POINT B 20 0 "Bee"'])
+        
+        assert parser.get_point("B") is point
+        assert (point.x, point.label) == (20, "Bee")
+        assert line.end is point and line.get_length() == 20
+        assert not delta.added and not delta.removed
+        assert {shape.name for shape in delta.changed} == {"point_B", "line_A_B", "circle_B"}
+        assert line in parser.scene.take_dirty()
+    
+    def test_renamed_point_rebinds_references(self):
+        """Test lines that referred to a renamed point resolve again"""
+        parser = IncrementalParser()
+        parser.parse(self.SYNTAX)
+        
+        delta = parser.replace_lines(0, 1, ["POINT Z 0 0"])
+        line = parser.get_shape("line_A_B")
+        
+        # A is no longer defined: LINE falls back to a default point
+        assert (line.start.x, line.start.y) == (0, 0)
+        assert line.start is not parser.get_point("Z")
+        assert parser.get_point("A") is None
+        assert line in delta.changed
+        
+        parser.replace_lines(0, 1, ["POINT A 1 1"])
+        assert line.start is parser.get_point("A")
+    
+    def test_lines_with_errors(self):
+        """Test a line that fails to parse produces no shapes until fixed"""
+        parser = IncrementalParser()
+        parser.parse(self.SYNTAX)
+        
+        delta = parser.replace_lines(3, 4, ["CIRCLE B 5x"])
+        assert [shape.name for shape in delta.removed] == ["circle_B"]
+        assert [number for number, _ in parser.errors] == [3]
+        
+        delta = parser.replace_lines(3, 4, ["CIRCLE B 6"])
+        assert delta.added[0].radius == 6
+        assert parser.errors == []
+        
+        parser.replace_lines(0, 0, ["POINTS FROM \"points.csv\"", "LET r = 1"])
+        assert [number for number, _ in parser.errors] == [0, 1]
+    
+    def test_edit_outside_document(self):
+        """Test edits must address existing lines"""
+        parser = IncrementalParser()
+        parser.parse("POINT A 0 0")
+        
+        with pytest.raises(ValueError):
+            parser.edit((1, 0), (1, 0), "x")
+
+
+class TestCompiledScene:
+    """Tests for compiled, memory-mapped scene files"""
+    
+    SYNTAX = '''
+    POINT A 0 0 "Apex" label_position=bottom
+    POINT B 10.25 -3 show_label=false
+    POINT C 4 8 "C"
+    LINE A B color=red line_width=3
+    CIRCLE A 2.5 color=blue fill_color=lightblue show_radius_line=true
+    TRIANGLE A B C fill_color=yellow layer=2
+    ANGLE B A C arc_radius=12.5
+    LINE A D
+    '''
+    
+    def _describe(self, shape):
+        points = [(p.x, p.y, p.label, p.show_label, p.label_position) for p in shape.get_points()]
+        return (type(shape), shape.name, shape._overrides, shape._extra, getattr(shape, 'radius', None), points)
+    
+    def test_round_trip_matches_parser(self, temp_dir):
+        """Test loading a compiled file gives the shapes and points the parser made"""
+        path = os.path.join(temp_dir, 'scene.geoc')
+        compile_syntax(self.SYNTAX, path)
+        parser = parse_fresh(self.SYNTAX)
+        
+        with load_compiled(path) as compiled:
+            assert (len(compiled), compiled.point_count) == (8, 4)
+            shapes = compiled.shapes
+            points = compiled.points
+        
+        assert [self._describe(s) for s in shapes] == [self._describe(s) for s in parser.shapes]
+        assert sorted(points) == sorted(parser.points) == ["A", "B", "C"]
+        # Shared points stay shared: moving A moves the line, circle and triangle
+        points["A"].move(1, 0)
+        assert (shapes[3].start.x, shapes[4].center.x, shapes[5].vertex_a.x) == (1, 1, 1)
+    
+    def test_shapes_are_built_on_demand(self, temp_dir):
+        """Test single shapes and points are built without building the rest"""
+        path = os.path.join(temp_dir, 'scene.geoc')
+        compile_syntax(io.StringIO(self.SYNTAX), path)
+        
+        with CompiledScene(path) as compiled:
+            triangle = compiled.get_shape("triangle_A_B_C")
+            assert isinstance(triangle, Triangle) and triangle.layer == 2
+            assert compiled[-3] is triangle
+            assert len(compiled._shapes) == 1
+            assert compiled.get_point("C") is triangle.vertex_c
+            assert compiled.get_shape("missing") is None
+            assert compiled.scene.get("triangle_A_B_C") is triangle
+    
+    def test_custom_properties_and_unknown_shapes(self, temp_dir):
+        """Test custom properties survive and unsupported values are rejected"""
+        path = os.path.join(temp_dir, 'scene.geoc')
+        line = Line(name="edge")
+        line.set_property("weight", 2.5)
+        write_compiled([line], path)
+        
+        with load_compiled(path) as compiled:
+            assert compiled[0].get_property("weight") == 2.5
+        
+        line.set_property("tag", object())
+        with pytest.raises(ValueError):
+            write_compiled([line], path)
+    
+    def test_rejects_other_files(self, temp_dir):
+        """Test files that are not compiled scenes fail to open"""
+        path = os.path.join(temp_dir, 'scene.geo')
+        with open(path, 'w') as f:
+            f.write(self.SYNTAX)
+        
+        with pytest.raises(ValueError):
+            load_compiled(path)
+
+    def test_open_from_bytes(self, temp_dir):
+        """Test a compiled scene can be read from bytes as well as from a file"""
+        path = os.path.join(temp_dir, 'scene.geoc')
+        compile_syntax(self.SYNTAX, path)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        with CompiledScene(data) as compiled:
+            assert [self._describe(s) for s in compiled.shapes] == \
+                [self._describe(s) for s in parse_fresh(self.SYNTAX).shapes]
+
+
+class TestParseParallel:
+    """Tests for chunked parallel parsing"""
+
+    SYNTAX = '\n'.join([
+        'POINT A 0 0 "Apex"',
+        'POINT B 10 0',
+        'LINE A B color=red',
+        'TRIANGLE A B C fill_color=yellow',
+        'CIRCLE C 4 color=blue',
+        'POINT A 1 1',
+        'LINE A C',
+        'LINE A Z',
+        'ANGLE B A C arc_radius=12',
+        'CIRCLE D 2',
+        'POINT D 3 3',
+        'TRIANGLE D B E',
+        'LINE E D',
+    ])
+
+    def _describe(self, parser):
+        shapes = [(type(s), s.name, s._overrides, getattr(s, 'radius', None),
+                   [(p.x, p.y, p.label) for p in s.get_points()]) for s in parser.shapes]
+        # Which shapes share which points, by position among the named points
+        names = {id(point): name for name, point in parser.points.items()}
+        shared = [[names.get(id(p)) for p in s.get_points()] for s in parser.shapes]
+        return shapes, shared, list(parser.points)
+
+    @pytest.mark.parametrize("chunk_lines", [1, 2, 3, 5, 100])
+    def test_matches_serial_parse(self, chunk_lines):
+        """Test every chunking gives the shapes, points and sharing of parse"""
+        parser = GeometrySyntaxParser()
+        shapes = parser.parse_parallel(self.SYNTAX, workers=2, chunk_lines=chunk_lines)
+
+        assert shapes is parser.shapes
+        assert self._describe(parser) == self._describe(parse_fresh(self.SYNTAX))
+        assert list(parser.scene) == parser.shapes
+        assert parser.get_shape("triangle_A_B_C").vertex_a is not parser.get_point("A")
+        parser.get_point("C").move(1, 0)
+        assert parser.get_shape("circle_C").center.x == parser.get_point("C").x
+
+    def test_constants_reach_every_chunk(self):
+        """Test LET constants defined in earlier chunks are visible to later ones"""
+        syntax = '\n'.join(['LET r = 100', 'POINT A r*cos(30deg) r/2', 'LET r = r*2', 'POINT B r 0',
+                            'CIRCLE A r/8', 'LET s = r+1', 'LINE A B', 'POINT C s 0'])
+        parser = GeometrySyntaxParser()
+        parser.parse_parallel(syntax, workers=2, chunk_lines=2)
+        
+        assert self._describe(parser) == self._describe(parse_fresh(syntax))
+        assert parser.constants == {"r": 200, "s": 201}
+    
+    def test_points_blocks_are_not_split(self):
+        """Test a POINTS block crossing a chunk boundary parses as a whole"""
+        syntax = 'POINT A 0 0\nPOINTS\nB 1 1\nC 2 2\n3 3\nEND\nTRIANGLE A B P2\nLINE C A'
+        parser = GeometrySyntaxParser()
+        parser.parse_parallel(syntax, workers=2, chunk_lines=2)
+        
+        assert self._describe(parser) == self._describe(parse_fresh(syntax))
+    
+    def test_file_object_and_errors(self, temp_dir):
+        """Test lines can come from a file and parse errors still surface"""
+        path = os.path.join(temp_dir, "scene.geo")
+        with open(path, 'w') as f:
+            f.write(self.SYNTAX)
+
+        with open(path) as f:
+            parser = GeometrySyntaxParser()
+            parser.parse_parallel(f, workers=2, chunk_lines=4)
+        assert self._describe(parser) == self._describe(parse_fresh(self.SYNTAX))
+
+        with pytest.raises(ValueError):
+            GeometrySyntaxParser().parse_parallel('POINT A 0 0\nPOINT B x 0', workers=2, chunk_lines=1)
+
+
+class TestDiagramTemplate:
+    """Tests for templates compiled once and instantiated per variant"""
+    
+    TEMPLATE = '''
+    POINT A 0 0 "Apex" label_position=bottom
+    POINT B {bx} 0 show_label=false
+    POINT C {cx} {cy}
+    TRIANGLE A B C fill_color=yellow
+    CIRCLE C {r} color=blue
+    LINE A C line_width=3
+    ANGLE B A C arc_radius=12
+    '''
+    
+    def _describe(self, shapes):
+        return [(type(s), s.name, s._overrides, getattr(s, 'radius', None),
+                 [(p.x, p.y, p.label, p.show_label, p.label_position) for p in s.get_points()])
+                for s in shapes]
+    
+    @pytest.mark.parametrize("values", [
+        {"bx": 10, "cx": 3.5, "cy": -7, "r": 2},
+        {"bx": -1e-3, "cx": 0, "cy": 1e9, "r": 0.25},
+    ])
+    def test_variant_matches_parse(self, values):
+        """Test a variant has the shapes of the text with the values filled in"""
+        template = compile_template(self.TEMPLATE)
+        expected = parse_fresh(self.TEMPLATE.format(**values)).shapes
+        
+        assert isinstance(template, DiagramTemplate)
+        assert template.parameters == ("bx", "cx", "cy", "r")
+        assert len(template) == len(expected)
+        assert self._describe(template.shapes(values)) == self._describe(expected)
+        assert self._describe(template.shapes(list(values.values()))) == self._describe(expected)
+    
+    def test_variants_are_independent(self):
+        """Test every variant gets its own points, shared within the variant"""
+        template = compile_template(self.TEMPLATE)
+        rows = [[10, 1, 2, 3], [20, 4, 5, 6], [30, 7, 8, 9]]
+        
+        batch = list(template.batch(rows))
+        assert [self._describe(shapes) for shapes in batch] == \
+            [self._describe(template.shapes(row)) for row in rows]
+        first, second = batch[0], batch[1]
+        assert first[3].vertex_c is first[4].center
+        first[2].point.move(1, 0)
+        assert (first[3].vertex_c.x, second[3].vertex_c.x) == (2, 4)
+        assert template.scene(rows[2]).get("circle_C").radius == 9
+    
+    def test_invalid_templates_and_values(self):
+        """Test placeholders outside coordinates and wrong values are rejected"""
+        with pytest.raises(ValueError):
+            compile_template('POINT A {x} 0 label_position={x}')
+        with pytest.raises(ValueError):
+            compile_template('POINT A 0 0\nLINE A B line_width={w}')
+        
+        template = compile_template('POINT A {x} {y}')
+        with pytest.raises(ValueError):
+            template.shapes({"x": 1})
+        with pytest.raises(ValueError):
+            template.shapes([1, 2, 3])
+        with pytest.raises(ValueError):
+            list(template.batch([[1, 2, 3], [4, 5, 6]]))
+    
+    def test_render(self, temp_dir):
+        """Test a variant renders through an exporter"""
+        template = compile_template(self.TEMPLATE)
+        path = os.path.join(temp_dir, 'variant.svg')
+        
+        template.render([10, 3, 4, 2], path, GeometrySVGExporter(200, 150))
+        with open(path) as f:
+            assert '<svg' in f.read()
+
+
 class TestGeometryPNGExporter:
     """Tests for GeometryPNGExporter class"""
     
@@ -234,6 +766,87 @@ class TestGeometryPNGExporter:
             else:
                 raise
     
+    def test_raster_backend_export(self, temp_dir, sample_geometry_syntax):
+        """Test headless raster export writes a PNG without a display"""
+        from PIL import Image
+        
+        output_file = os.path.join(temp_dir, "raster_output.png")
+        export_geometry_syntax(sample_geometry_syntax, output_file, 400, 300, backend='raster')
+        
+        with Image.open(output_file) as image:
+            assert image.size == (400, 300)
+    
+    def test_raster_backend_world_to_canvas(self):
+        """Test raster exporter uses the same coordinate mapping"""
+        exporter = GeometryPNGExporter(800, 600, backend='raster')
+        assert exporter.root is None
+        assert exporter.world_to_canvas(100, 100) == (500, 200)
+    
+    def test_exporter_session_reuse(self, temp_dir):
+        """Test one exporter can export several diagrams with independent views"""
+        from PIL import Image
+        
+        small = 'POINT A 0 0\nPOINT B 10 10'
+        large = 'POINT A -500 -500\nPOINT B 500 500'
+        
+        with GeometryPNGExporter(400, 300, backend='raster') as exporter:
+            exporter.export(small, os.path.join(temp_dir, "small.png"))
+            small_scale = exporter.scale
+            exporter.export(large, os.path.join(temp_dir, "large.png"))
+            large_scale = exporter.scale
+            exporter.export(small, os.path.join(temp_dir, "small_again.png"))
+            assert exporter.scale == small_scale
+            
+            # Auto-scale off starts from the default view, not the previous one
+            exporter.export(small, os.path.join(temp_dir, "unscaled.png"), auto_scale=False)
+            assert exporter.scale == 1.0
+            assert (exporter.origin_x, exporter.origin_y) == (200, 150)
+        
+        assert small_scale == 2.0
+        assert large_scale < 1.0
+        with open(os.path.join(temp_dir, "small.png"), 'rb') as a, \
+                open(os.path.join(temp_dir, "small_again.png"), 'rb') as b:
+            assert a.read() == b.read()
+        assert Image.open(os.path.join(temp_dir, "large.png")).size == (400, 300)
+    
+    def test_unknown_backend(self):
+        """Test unknown backends are rejected"""
+        with pytest.raises(ValueError):
+            GeometryPNGExporter(800, 600, backend='opengl')
+    
+    def test_tk_backend_is_lazy(self, sample_geometry_syntax):
+        """Test the tk backend only starts tkinter when its canvas is used"""
+        exporter = GeometryPNGExporter(400, 300, backend='tk')
+        png = exporter.png_bytes(sample_geometry_syntax)
+        
+        assert exporter.root is None
+        assert png == GeometryPNGExporter(400, 300).png_bytes(sample_geometry_syntax)
+    
+    def test_tk_canvas_matches_raster(self, sample_geometry_syntax):
+        """Test the tk canvas gets the diagram and the PNG matches the raster backend"""
+        tkinter = pytest.importorskip("tkinter")
+        exporter = GeometryPNGExporter(400, 300, backend='tk')
+        try:
+            canvas = exporter.canvas
+        except tkinter.TclError:
+            pytest.skip("Skipping tk canvas test - no display available")
+        
+        with exporter:
+            png = exporter.png_bytes(sample_geometry_syntax)
+            assert len(canvas.find_all()) > 1
+        
+        assert exporter.root is None
+        assert png == GeometryPNGExporter(400, 300, backend='raster').png_bytes(sample_geometry_syntax)
+    
+    def test_offscreen_shapes_are_culled(self):
+        """Test shapes outside the canvas are skipped without auto-scaling"""
+        exporter = GeometrySVGExporter(200, 200)
+        on_screen = exporter.layout('POINT A 0 0', auto_scale=False)
+        with_far_points = exporter.layout('POINT A 0 0\nPOINT B 5000 0\nPOINT C 0 -5000',
+                                          auto_scale=False)
+        
+        assert list(with_far_points) == list(on_screen)
+    
     def test_auto_scaling(self):
         """Test auto-scaling functionality"""
         exporter = GeometryPNGExporter(800, 600)
@@ -254,6 +867,257 @@ class TestGeometryPNGExporter:
         assert exporter.scale <= 2.0  # Max scale constraint
 
 
+class TestGeometrySVGExporter:
+    """Tests for GeometrySVGExporter class"""
+    
+    def test_export_to_svg(self, temp_dir, sample_geometry_syntax):
+        """Test SVG export writes a well-formed document"""
+        import xml.etree.ElementTree as ET
+        
+        output_file = os.path.join(temp_dir, "test_output.svg")
+        export_geometry_svg(sample_geometry_syntax, output_file, 400, 300)
+        
+        root = ET.parse(output_file).getroot()
+        tags = {element.tag.split('}')[1] for element in root}
+        assert root.get("width") == "400"
+        assert {'rect', 'circle', 'polygon', 'line', 'path', 'text'} <= tags
+    
+    def test_svg_uses_auto_scale(self):
+        """Test SVG exporter shares the PNG auto-scale math"""
+        import io
+        
+        exporter = GeometrySVGExporter(800, 600)
+        exporter.write_svg('POINT A -100 -100\nPOINT B 100 100', io.StringIO())
+        
+        assert exporter.scale == pytest.approx(2.0)
+        assert exporter.world_to_canvas(0, 0) == (400, 300)
+    
+    def test_svg_export_does_not_import_tkinter(self, temp_dir):
+        """Test the SVG path never imports tkinter"""
+        import subprocess
+        import sys
+        
+        output_file = os.path.join(temp_dir, "no_tk.svg")
+        code = (
+            "import sys, shapix; "
+            f"shapix.export_geometry_svg('POINT A 0 0 \"A\"', {output_file!r}); "
+            "assert 'tkinter' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+        assert os.path.exists(output_file)
+
+
+class TestInMemoryExport:
+    """Tests for rendering without touching the filesystem"""
+    
+    SYNTAX = 'POINT A 0 0\nPOINT B 10 10\nLINE A B color=blue'
+    
+    def test_render_to_bytes_png(self, temp_dir):
+        """Test PNG bytes match what export writes to disk"""
+        data = render_to_bytes(self.SYNTAX, width=160, height=120)
+        
+        output_file = os.path.join(temp_dir, "same.png")
+        export_geometry_syntax(self.SYNTAX, output_file, 160, 120, backend='raster')
+        with open(output_file, 'rb') as f:
+            assert data == f.read()
+    
+    def test_render_to_bytes_svg(self):
+        """Test SVG bytes are a complete document"""
+        data = render_to_bytes(self.SYNTAX, fmt='svg', width=160, height=120)
+        assert data.startswith(b'<svg') and data.rstrip().endswith(b'</svg>')
+    
+    def test_render_file_object(self):
+        """Test exporters accept an open file in place of the syntax string"""
+        data = render_to_bytes(io.StringIO(self.SYNTAX), fmt='svg', width=160, height=120)
+        assert data == render_to_bytes(self.SYNTAX, fmt='svg', width=160, height=120)
+    
+    def test_render_to_bytes_unknown_format(self):
+        """Test unsupported formats are rejected"""
+        with pytest.raises(ValueError):
+            render_to_bytes(self.SYNTAX, fmt='gif')
+    
+    def test_render_to_array(self):
+        """Test the array is the raster buffer, not a copy"""
+        import numpy as np
+        
+        array = render_to_array(self.SYNTAX, width=160, height=120)
+        
+        assert array.shape == (120, 160, 4)
+        assert array.dtype == np.uint8
+        assert (array[..., 2] > array[..., 0]).any()  # blue line
+    
+    def test_exporter_array_is_shared_buffer(self):
+        """Test a session exposes its raster buffer without copying"""
+        exporter = GeometryPNGExporter(160, 120, backend='raster')
+        array = exporter.array(self.SYNTAX)
+        assert array is exporter.canvas.buffer
+
+
+class _KillsWorker(str):
+    """Syntax that ends the process unpickling it, like a worker crashing"""
+    
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+class TestExportMany:
+    """Tests for the parallel batch export API"""
+    
+    def _jobs(self, temp_dir, count):
+        return [ExportJob(f'POINT A 0 0\nPOINT B {i + 1} 1\nLINE A B',
+                          os.path.join(temp_dir, f"batch_{i}.png"), 120, 80)
+                for i in range(count)]
+    
+    def test_serial_export(self, temp_dir):
+        """Test workers=1 exports every job in order in-process"""
+        results = list(export_many(self._jobs(temp_dir, 3), workers=1, backend='raster'))
+        
+        assert [result.index for result in results] == [0, 1, 2]
+        assert all(result.ok for result in results)
+        assert all(os.path.exists(result.filename) for result in results)
+    
+    def test_parallel_export_with_failure(self, temp_dir):
+        """Test a failing job is reported without stopping the batch"""
+        jobs = self._jobs(temp_dir, 4)
+        jobs.append(('POINT A 0 0', os.path.join(temp_dir, "missing", "bad.png")))
+        jobs.append({'syntax': 'POINT A 0 0', 'filename': os.path.join(temp_dir, "batch.svg")})
+        
+        results = sorted(export_many(jobs, workers=2, backend='raster'))
+        
+        assert [result.index for result in results] == list(range(6))
+        assert [result.ok for result in results] == [True] * 4 + [False, True]
+        assert "bad.png" in results[4].error
+        assert os.path.exists(os.path.join(temp_dir, "batch.svg"))
+    
+    def test_nested_serial_exports(self, temp_dir):
+        """Test in-process batches keep their exporters to themselves"""
+        outer = export_many(self._jobs(temp_dir, 2), workers=1, backend='raster')
+        first = next(outer)
+        inner = list(export_many([('POINT A 0 0', os.path.join(temp_dir, "inner.png"))],
+                                 workers=1, backend='raster'))
+        
+        assert [first.ok, inner[0].ok, next(outer).ok] == [True, True, True]
+    
+    def test_dead_worker_is_reported(self, temp_dir):
+        """Test a worker process dying fails its jobs instead of the batch"""
+        jobs = self._jobs(temp_dir, 3)
+        jobs.insert(1, ExportJob(_KillsWorker('POINT A 0 0'), os.path.join(temp_dir, "dies.png")))
+        
+        results = sorted(export_many(jobs, workers=2, backend='raster'))
+        
+        assert [result.index for result in results] == [0, 1, 2, 3]
+        assert "BrokenProcessPool" in results[1].error
+    
+    def test_unknown_backend(self):
+        """Test the backend is validated before any work starts"""
+        with pytest.raises(ValueError):
+            list(export_many([], backend='postscript'))
+
+
+class TestRenderCache:
+    """Tests for the content-addressed render cache"""
+    
+    def _write(self, path, size):
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        return path
+    
+    def test_key_ignores_comments_and_blank_lines(self):
+        """Test the key hashes the syntax the parser actually sees"""
+        key = RenderCache.make_key('POINT A 0 0\nPOINT B 1 1', 400, 300, True)
+        
+        assert key == RenderCache.make_key('# c\n\n  POINT A 0 0  \n\nPOINT B 1 1\n', 400, 300, True)
+        assert key != RenderCache.make_key('POINT A 0 0\nPOINT B 1 1', 400, 301, True)
+        assert key != RenderCache.make_key('POINT A 0 0\nPOINT B 1 1', 400, 300, False)
+        assert key != RenderCache.make_key('POINT A 0 0\nPOINT B 1 2', 400, 300, True)
+    
+    def test_key_covers_point_files(self, temp_dir):
+        """Test editing a file loaded with POINTS FROM changes the key"""
+        path = os.path.join(temp_dir, 'points.csv')
+        syntax = f'POINTS FROM "{path}"'
+        with open(path, 'w') as f:
+            f.write('0,0\n1,1\n')
+        key = RenderCache.make_key(syntax, 400, 300, True)
+        
+        assert key == RenderCache.make_key(syntax, 400, 300, True)
+        with open(path, 'w') as f:
+            f.write('0,0\n1,2\n')
+        assert key != RenderCache.make_key(syntax, 400, 300, True)
+    
+    def test_exporter_caches_file_objects(self, temp_dir):
+        """Test a file is keyed like its text and rewound before parsing"""
+        cache = RenderCache(os.path.join(temp_dir, 'cache'))
+        syntax = 'POINT A 0 0\nPOINT B 5 5\nLINE A B'
+        
+        with GeometryPNGExporter(120, 80, backend='raster', cache=cache) as exporter:
+            exporter.export(io.StringIO(syntax), os.path.join(temp_dir, 'first.png'))
+            exporter.export(syntax, os.path.join(temp_dir, 'second.png'))
+        
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert os.path.getsize(os.path.join(temp_dir, 'first.png')) > 0
+    
+    def test_fetch_and_counters(self, temp_dir):
+        """Test a stored entry is copied out and counted as a hit"""
+        cache = RenderCache(os.path.join(temp_dir, 'cache'))
+        source = self._write(os.path.join(temp_dir, 'a.png'), 10)
+        target = os.path.join(temp_dir, 'b.png')
+        
+        assert not cache.fetch('k', target)
+        cache.store('k', source)
+        assert cache.fetch('k', target)
+        
+        with open(target, 'rb') as f:
+            assert f.read() == b'x' * 10
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1, 'bytes': 10}
+    
+    def test_lru_eviction(self, temp_dir):
+        """Test the least recently used entry goes first once over the cap"""
+        cache = RenderCache(os.path.join(temp_dir, 'cache'), max_bytes=25)
+        source = self._write(os.path.join(temp_dir, 'a.png'), 10)
+        
+        cache.store('a', source)
+        cache.store('b', source)
+        cache.fetch('a', os.path.join(temp_dir, 'out.png'))
+        cache.store('c', source)
+        
+        assert 'a' in cache and 'c' in cache and 'b' not in cache
+        assert cache.size == 20
+        assert cache.evictions == 1
+    
+    def test_index_survives_restart(self, temp_dir):
+        """Test a new cache object picks up existing entries"""
+        directory = os.path.join(temp_dir, 'cache')
+        RenderCache(directory).store('k', self._write(os.path.join(temp_dir, 'a.png'), 10))
+        
+        cache = RenderCache(directory)
+        assert len(cache) == 1
+        assert cache.fetch('k', os.path.join(temp_dir, 'b.png'))
+    
+    def test_hardlink_hits(self, temp_dir):
+        """Test hardlink mode links the cached file to the destination"""
+        cache = RenderCache(os.path.join(temp_dir, 'cache'), hardlink=True)
+        cache.store('k', self._write(os.path.join(temp_dir, 'a.png'), 10))
+        target = self._write(os.path.join(temp_dir, 'b.png'), 3)
+        
+        assert cache.fetch('k', target)
+        assert os.path.samefile(target, cache._path('k'))
+    
+    def test_exporter_hit_skips_rendering(self, temp_dir, monkeypatch):
+        """Test a cache hit never runs the parser"""
+        cache = RenderCache(os.path.join(temp_dir, 'cache'))
+        first = os.path.join(temp_dir, 'first.png')
+        second = os.path.join(temp_dir, 'second.png')
+        
+        with GeometryPNGExporter(120, 80, backend='raster', cache=cache) as exporter:
+            exporter.export('POINT A 0 0\nPOINT B 5 5\nLINE A B', first)
+            monkeypatch.setattr(GeometrySyntaxParser, 'parse', lambda *args: pytest.fail("parsed"))
+            exporter.export('# same diagram\nPOINT A 0 0\nPOINT B 5 5\nLINE A B\n', second)
+        
+        with open(first, 'rb') as a, open(second, 'rb') as b:
+            assert a.read() == b.read()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
 class TestSyntaxIntegration:
     """Integration tests for syntax parsing and export"""
     
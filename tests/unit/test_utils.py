@@ -0,0 +1,113 @@
+"""
+Unit tests for geometry utilities and their vectorized batch variants
+"""
+
+import pytest
+import math
+import random
+import numpy as np
+from shapix.core import Point
+from shapix.utils import (
+    distance,
+    angle_between_points,
+    midpoint,
+    rotate_point,
+    point_to_line_distance,
+    as_coords,
+    distances,
+    pairwise_distances,
+    angles_between_points,
+    midpoints,
+    rotate_points,
+    point_to_segment_distances,
+)
+
+
+@pytest.fixture
+def random_points():
+    """Three parallel lists of random points, including degenerate cases"""
+    rng = random.Random(3)
+    def make():
+        return [Point(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(200)]
+    a, b, c = make(), make(), make()
+    # Coincident points exercise the zero-length branches
+    b[0] = Point(a[0].x, a[0].y)
+    c[1] = Point(b[1].x, b[1].y)
+    return a, b, c
+
+
+class TestScalarUtils:
+    """Tests for the scalar helpers"""
+    
+    def test_distance_and_midpoint(self):
+        """Test basic point helpers"""
+        assert distance(Point(0, 0), Point(3, 4)) == 5
+        assert midpoint(Point(0, 0), Point(2, 4)) == Point(1, 2)
+    
+    def test_angle_and_rotation(self):
+        """Test right angle and quarter turn"""
+        assert angle_between_points(Point(1, 0), Point(0, 0), Point(0, 1)) == pytest.approx(90)
+        assert rotate_point(Point(1, 0), Point(0, 0), 90) == Point(0, 1)
+
+
+class TestBatchUtils:
+    """Tests for the NumPy batch kernels against the scalar helpers"""
+    
+    def test_as_coords(self):
+        """Test accepted input forms"""
+        assert as_coords([Point(1, 2), Point(3, 4)]).tolist() == [[1, 2], [3, 4]]
+        assert as_coords(Point(1, 2)).shape == (2,)
+        array = np.zeros((5, 2))
+        assert as_coords(array) is array
+        with pytest.raises(ValueError):
+            as_coords(np.zeros((5, 3)))
+    
+    def test_distances(self, random_points):
+        """Test paired distances"""
+        a, b, _ = random_points
+        expected = [distance(p, q) for p, q in zip(a, b)]
+        assert np.allclose(distances(a, b), expected)
+    
+    def test_pairwise_distances(self, random_points):
+        """Test the distance matrix"""
+        a, b, _ = random_points
+        matrix = pairwise_distances(a[:20], b[:30])
+        assert matrix.shape == (20, 30)
+        assert matrix[3, 7] == pytest.approx(distance(a[3], b[7]))
+        assert np.allclose(np.diag(pairwise_distances(a[:10])), 0)
+    
+    def test_angles(self, random_points):
+        """Test angles at vertices, including degenerate vectors"""
+        a, b, c = random_points
+        expected = [angle_between_points(p, v, q) for p, v, q in zip(a, b, c)]
+        assert np.allclose(angles_between_points(a, b, c), expected)
+    
+    def test_midpoints(self, random_points):
+        """Test paired midpoints"""
+        a, b, _ = random_points
+        expected = [(m.x, m.y) for m in map(midpoint, a, b)]
+        assert np.allclose(midpoints(a, b), expected)
+    
+    def test_rotate_points(self, random_points):
+        """Test rotation about a center by one or many angles"""
+        a, b, _ = random_points
+        expected = [(r.x, r.y) for r in (rotate_point(p, b[0], 33) for p in a)]
+        assert np.allclose(rotate_points(a, b[0], 33), expected)
+        
+        # One angle per point
+        angles = np.arange(len(a), dtype=float)
+        expected = [(r.x, r.y) for r in (rotate_point(p, b[0], t) for p, t in zip(a, angles))]
+        assert np.allclose(rotate_points(a, b[0], angles), expected)
+    
+    def test_point_to_segment_distances(self, random_points):
+        """Test point-to-segment distance, including zero-length segments"""
+        a, b, c = random_points
+        expected = [point_to_line_distance(p, s, e) for p, s, e in zip(a, b, c)]
+        assert np.allclose(point_to_segment_distances(a, b, c), expected)
+    
+    def test_broadcasting_single_point(self):
+        """Test a single point pairs with every point of an array"""
+        points = np.array([[3.0, 4.0], [6.0, 8.0]])
+        assert distances(points, (0, 0)).tolist() == [5, 10]
+        # One point against many segments sharing a start point
+        assert point_to_segment_distances((0, 1), (0, 0), points).shape == (2,)